@@ -1,15 +1,21 @@
 import os
 from flask import Flask
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from models.models import db
 from routes.news import news_bp
 from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.profile import profile_bp
 from routes.preferences import preferences_bp
+from services.realtime import init_socketio
+from services.semantic import start_warm_up
+from utils.compression import init_compression
+from utils.json_provider import JSONProvider
 
 def create_app():
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     CORS(
         app,
         resources={r"/api/*": {"origins": "http://localhost:3000"}},
@@ -32,6 +38,15 @@ def create_app():
     app.register_blueprint(preferences_bp)
 
     db.init_app(app)
+    init_compression(app)
+    init_socketio(app)
+    if os.getenv("SEMANTIC_SEARCH_WARMUP", "false").lower() == "true":
+        start_warm_up(app)
+    # Behind reverse proxies, take the client address (used by the auth rate limits)
+    # from that many X-Forwarded-* hops; 0 trusts none, so headers cannot be spoofed.
+    trusted_proxies = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+    if trusted_proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies, x_proto=trusted_proxies)
     return app
 
 app = create_app()
@@ -1,8 +1,15 @@
 from app import create_app
-from models.models import db
-
+from models.models import add_missing_columns, create_article_search_index, db
 app = create_app()
-
 with app.app_context():
     db.create_all()
+    # create_all skips tables that already exist, so add any columns and indexes declared since.
+    with db.engine.begin() as connection:
+        for column in add_missing_columns(connection):
+            print(f"➕ Added column {column}")
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    with db.engine.begin() as connection:
+        create_article_search_index(connection)
     print("✅ Tables created/verified")
@@ -1,8 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
 from datetime import datetime
-import bcrypt
 import hashlib
 
+from utils.passwords import hash_password, verify_password
+
 db = SQLAlchemy()
 
 
@@ -21,11 +23,25 @@ class User(db.Model):
     password_changed_at = db.Column(db.DateTime)
 
     def set_password(self, password):
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = hash_password(password)
         self.password_changed_at = datetime.utcnow()
 
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return verify_password(password, self.password_hash)
+
+
+class RefreshToken(db.Model):
+    """Opaque refresh token, stored hashed. Each use rotates it within its family;
+    presenting an already-rotated token revokes the whole family (services/tokens.py)."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    family_id = db.Column(db.String(64), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime)
+    replaced_by_id = db.Column(db.Integer, db.ForeignKey("refresh_token.id"))
 
 
 class UserProfile(db.Model):
@@ -46,23 +62,146 @@ class Article(db.Model):
     title = db.Column(db.String(500), nullable=False)
     source_url = db.Column(db.String(500), unique=True, nullable=False)
     source_domain = db.Column(db.String(255), index=True)
-    raw_content = db.Column(db.Text)
+    # Bulky text is only needed by the harvester and summarizer, so it is not
+    # loaded unless a query asks for it (undefer_group("content")).
+    raw_content = db.deferred(db.Column(db.Text), group="content")
     ai_summary = db.Column(db.Text)
     summary_style = db.Column(db.String(50), default="bullets-3")
     summary_error = db.Column(db.Text)
+    summary_attempts = db.Column(db.Integer, default=0)
+    next_summary_attempt_at = db.Column(db.DateTime)
     fetch_status= db.Column(db.String(50))
-    rss_summary= db.Column(db.Text)
+    rss_summary = db.deferred(db.Column(db.Text), group="content")
     category = db.Column(db.String(50))
     cluster_id = db.Column(db.Integer)
     content_hash = db.Column(db.String(64), unique=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     processed_at = db.Column(db.DateTime)
 
+    # Indexes follow the hot query shapes: story feeds read clustered rows newest
+    # first (optionally by category/source), the story page reads one cluster,
+    # the archive reads all rows newest first, and the summarizer reads pending rows.
+    __table_args__ = (
+        db.Index(
+            "ix_article_clustered_created",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=cluster_id.isnot(None),
+            sqlite_where=cluster_id.isnot(None),
+        ),
+        db.Index(
+            "ix_article_clustered_category_created",
+            category,
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=cluster_id.isnot(None),
+            sqlite_where=cluster_id.isnot(None),
+        ),
+        db.Index(
+            "ix_article_clustered_source_created",
+            source_domain,
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=cluster_id.isnot(None),
+            sqlite_where=cluster_id.isnot(None),
+        ),
+        db.Index("ix_article_cluster_created", cluster_id, created_at),
+        db.Index("ix_article_created", created_at.desc(), id.desc()),
+        db.Index("ix_article_category_created", category, created_at.desc(), id.desc()),
+        db.Index(
+            "ix_article_pending_summary",
+            created_at.desc(),
+            postgresql_where=ai_summary.is_(None),
+            sqlite_where=ai_summary.is_(None),
+        ),
+    )
+
     def set_content_hash(self):
         payload = f"{self.title}|{self.source_url}|{self.raw_content or ''}"
         self.content_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+# Full-text search over titles and summaries (services/search.py). Postgres
+# indexes this expression with GIN; queries must use the identical expression.
+ARTICLE_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B'))"
+)
+# SQLite keeps an external-content FTS5 table in sync through triggers.
+ARTICLE_SEARCH_TABLE = "article_search"
+_SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ARTICLE_SEARCH_TABLE} "
+    "USING fts5(title, ai_summary, content='article', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS article_search_insert AFTER INSERT ON article BEGIN
+        INSERT INTO {ARTICLE_SEARCH_TABLE}(rowid, title, ai_summary) VALUES (new.id, new.title, new.ai_summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS article_search_delete AFTER DELETE ON article BEGIN
+        INSERT INTO {ARTICLE_SEARCH_TABLE}({ARTICLE_SEARCH_TABLE}, rowid, title, ai_summary)
+        VALUES ('delete', old.id, old.title, old.ai_summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS article_search_update AFTER UPDATE OF title, ai_summary ON article BEGIN
+        INSERT INTO {ARTICLE_SEARCH_TABLE}({ARTICLE_SEARCH_TABLE}, rowid, title, ai_summary)
+        VALUES ('delete', old.id, old.title, old.ai_summary);
+        INSERT INTO {ARTICLE_SEARCH_TABLE}(rowid, title, ai_summary) VALUES (new.id, new.title, new.ai_summary);
+    END""",
+)
+
+
+def create_article_search_index(connection) -> None:
+    """Create the search index if missing; safe to run on every deploy (init_db.py)."""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_article_search ON article USING gin ({ARTICLE_SEARCH_VECTOR})"
+        ))
+    elif dialect == "sqlite":
+        for statement in _SQLITE_SEARCH_DDL:
+            connection.execute(text(statement))
+        # Index rows that existed before the triggers (or after the table was recreated).
+        connection.execute(text(f"INSERT INTO {ARTICLE_SEARCH_TABLE}({ARTICLE_SEARCH_TABLE}) VALUES ('rebuild')"))
+
+
+def add_missing_columns(connection) -> list:
+    """Add model columns missing from existing tables; safe to run on every deploy (init_db.py).
+
+    Columns are added nullable and without a default, so readers must treat NULL
+    as the Python-side default. Returns the ``table.column`` names added.
+    """
+    existing_tables = set(inspect(connection).get_table_names())
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspect(connection).get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+@event.listens_for(Article.__table__, "after_create")
+def _create_search_index_with_table(target, connection, **kw):
+    create_article_search_index(connection)
+
+
+class ArticleEmbedding(db.Model):
+    """Sentence embedding of an article's title and summary, kept from clustering.
+
+    ``vector`` holds L2-normalized float32 values (services/embeddings.py).
+    """
+
+    article_id = db.Column(db.Integer, db.ForeignKey("article.id"), primary_key=True)
+    model = db.Column(db.String(100), nullable=False)
+    vector = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
 class UserPreferences(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), unique=True, nullable=False)
@@ -80,7 +219,10 @@ class SavedArticle(db.Model):
     article_id = db.Column(db.Integer, db.ForeignKey("article.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "article_id", name="uniq_user_saved"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "article_id", name="uniq_user_saved"),
+        db.Index("ix_saved_article_user_created", user_id, created_at.desc(), id.desc()),
+    )
 
 
 class ReadArticle(db.Model):
@@ -89,4 +231,86 @@ class ReadArticle(db.Model):
     article_id = db.Column(db.Integer, db.ForeignKey("article.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "article_id", name="uniq_user_read"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "article_id", name="uniq_user_read"),
+        db.Index("ix_read_article_user_created", user_id, created_at.desc(), id.desc()),
+    )
+
+
+class ChangeLog(db.Model):
+    """Append-only record of feed-visible changes, read by /api/news/changes.
+
+    Story and article entries are global (user_id is NULL); saved/read entries
+    belong to one user. Rows are written in the same transaction as the change.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(20), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_change_log_user_id", user_id, id),
+        db.Index("ix_change_log_created", created_at),
+    )
+
+
+class ArticleEngagement(db.Model):
+    """Read/save totals per article, folded in from the change log by the trending job."""
+
+    article_id = db.Column(db.Integer, db.ForeignKey("article.id"), primary_key=True)
+    read_count = db.Column(db.Integer, default=0, nullable=False)
+    save_count = db.Column(db.Integer, default=0, nullable=False)
+
+
+class StoryScore(db.Model):
+    """Precomputed trending ranking, replaced by each trending run (services/trending.py)."""
+
+    cluster_id = db.Column(db.Integer, primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    category = db.Column(db.String(50))
+    source_count = db.Column(db.Integer, nullable=False)
+    article_count = db.Column(db.Integer, nullable=False)
+    recent_count = db.Column(db.Integer, nullable=False)
+    read_count = db.Column(db.Integer, nullable=False)
+    save_count = db.Column(db.Integer, nullable=False)
+    latest_at = db.Column(db.DateTime, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_story_score_score", score.desc(), cluster_id.desc()),
+        db.Index("ix_story_score_category_score", category, score.desc(), cluster_id.desc()),
+    )
+
+
+class JobCursor(db.Model):
+    """How far a background job has consumed an append-only table (e.g. change_log ids)."""
+
+    name = db.Column(db.String(50), primary_key=True)
+    position = db.Column(db.Integer, default=0, nullable=False)
+
+
+class EmailOutbox(db.Model):
+    """Emails waiting for delivery; rows are added in the sender's transaction.
+
+    ``next_attempt_at`` doubles as the lease while a worker is sending, so a
+    row left in "sending" by a crashed worker is picked up again once it passes.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(200), unique=True, nullable=False)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default="pending", nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("ix_email_outbox_status_next_attempt", status, next_attempt_at),
+    )
@@ -0,0 +1,20 @@
+"""WSGI entry point for the Socket.IO service.
+
+Run with ``gunicorn -k eventlet -w 1 realtime_app:app``. The REST API runs on
+threaded workers instead (see the Dockerfile); this process only holds
+WebSocket connections, so it patches psycopg2 to yield to the event loop
+rather than block every connection on a database read.
+"""
+
+import os
+
+import eventlet
+
+eventlet.monkey_patch()
+
+from psycogreen.eventlet import patch_psycopg  # noqa: E402
+
+patch_psycopg()
+os.environ.setdefault("SOCKETIO_ASYNC_MODE", "eventlet")
+
+from app import app  # noqa: E402,F401
@@ -1,10 +1,12 @@
 import datetime
+import os
 from urllib.parse import urlencode
 
-import jwt
 from flask import Blueprint, request, jsonify, current_app, g
 from models.models import db, User, UserProfile
-from services.email_service import send_email
+from services.email_service import enqueue_email
+from services.tokens import InvalidRefreshToken, issue_tokens, revoke_refresh_token, revoke_user_refresh_tokens, \
+    rotate_refresh_token
 from utils.auth import (
     generate_token,
     hash_token,
@@ -13,10 +15,36 @@ from utils.auth import (
     token_expiry,
 )
 from utils.decorators import token_required
+from utils.passwords import PasswordHashingBusy, hash_password, needs_rehash
+from utils.rate_limit import hit
 
 auth_bp = Blueprint('auth', __name__)
 
 MIN_PASSWORD_LENGTH = 8
+# (limit, window seconds). Checked before any bcrypt work, so floods cost a Redis call each.
+IP_RATE_LIMIT = (int(os.getenv("AUTH_RATE_LIMIT_PER_IP", "30")), 300)
+EMAIL_RATE_LIMIT = (int(os.getenv("AUTH_RATE_LIMIT_PER_EMAIL", "10")), 900)
+
+
+def rate_limited(scope: str, email: str = None):
+    """Return a 429 response if the client IP or target email is over its limit, else None."""
+    checks = [("ip", request.remote_addr or "unknown", IP_RATE_LIMIT)]
+    if email:
+        checks.append(("email", email, EMAIL_RATE_LIMIT))
+    for kind, subject, (limit, window) in checks:
+        retry_after = hit(f"{scope}:{kind}", subject, limit, window)
+        if retry_after:
+            response = jsonify({"message": "Too many attempts. Try again later."})
+            response.headers["Retry-After"] = str(retry_after)
+            return response, 429
+    return None
+
+
+@auth_bp.errorhandler(PasswordHashingBusy)
+def password_hashing_busy(exc):
+    response = jsonify({"message": "Server is busy. Try again shortly."})
+    response.headers["Retry-After"] = "1"
+    return response, 503
 
 
 def validate_password(password: str):
@@ -55,6 +83,10 @@ def register():
     if error:
         return jsonify({"message": error}), 400
 
+    limited = rate_limited("register")
+    if limited:
+        return limited
+
     # Check if user already exists
     if User.query.filter_by(email=email).first():
         return jsonify({"message": "User already exists"}), 400
@@ -68,14 +100,14 @@ def register():
     new_user.confirm_token_expires_at = token_expiry(hours=24)
 
     db.session.add(new_user)
-    db.session.commit()
+    db.session.flush()
 
     profile = UserProfile(user_id=new_user.id)
     db.session.add(profile)
-    db.session.commit()
 
+    # Queued in the same transaction; the outbox job sends it.
     confirmation_link = build_confirmation_link(email, confirm_token)
-    send_email(
+    enqueue_email(
         to_email=email,
         subject="Confirm your account",
         body=(
@@ -83,6 +115,7 @@ def register():
             f"{confirmation_link}"
         ),
     )
+    db.session.commit()
 
     return jsonify({"message": "User created successfully. Check email to confirm."}), 201
 
@@ -122,7 +155,6 @@ def confirm_email():
 def login():
     data = get_json_payload()
     email = normalize_email(data.get('email'))
-    user = User.query.filter_by(email=email).first()
     password = data.get('password')
 
     email_error = validate_email(email)
@@ -131,23 +163,53 @@ def login():
     if not password:
         return jsonify({"message": "Password is required."}), 400
 
+    limited = rate_limited("login", email)
+    if limited:
+        return limited
+    user = User.query.filter_by(email=email).first()
+
     # Verify password
     if user and user.check_password(password):
         if not user.is_email_confirmed:
             return jsonify({"message": "Email not confirmed"}), 403
         if not user.is_active:
             return jsonify({"message": "User inactive"}), 403
-        # Create a token that expires in 24 hours
-        token = jwt.encode({
-            'user_id': user.id,
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-        }, current_app.config['SECRET_KEY'], algorithm="HS256")
-
-        return jsonify({'token': token})
+        if needs_rehash(user.password_hash):
+            # Upgrade hashes made with a different BCRYPT_ROUNDS; not a password change.
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        # "token" is the legacy 24-hour token; new clients use access_token + refresh_token.
+        tokens = issue_tokens(user)
+        db.session.commit()
+        return jsonify(tokens)
 
     return jsonify({"message": "Invalid credentials"}), 401
 
 
+@auth_bp.route('/api/auth/refresh', methods=['POST'])
+def refresh():
+    data = get_json_payload()
+    limited = rate_limited("refresh")
+    if limited:
+        return limited
+    try:
+        tokens = rotate_refresh_token(data.get('refresh_token'))
+    except InvalidRefreshToken as exc:
+        return jsonify({"message": str(exc)}), 401
+    db.session.commit()
+    return jsonify(tokens)
+
+
+@auth_bp.route('/api/auth/logout', methods=['POST'])
+def logout():
+    """Revoke a refresh token's session; ``"all": true`` signs the user out everywhere."""
+    data = get_json_payload()
+    if not revoke_refresh_token(data.get('refresh_token'), everywhere=bool(data.get('all'))):
+        return jsonify({"message": "Refresh token is invalid."}), 401
+    db.session.commit()
+    return jsonify({"message": "Logged out"}), 200
+
+
 @auth_bp.route('/api/auth/resend-confirmation', methods=['POST'])
 def resend_confirmation():
     data = get_json_payload()
@@ -166,10 +228,9 @@ def resend_confirmation():
     confirm_token = generate_token()
     user.confirm_token_hash = hash_token(confirm_token)
     user.confirm_token_expires_at = token_expiry(hours=24)
-    db.session.commit()
 
     confirmation_link = build_confirmation_link(email, confirm_token)
-    send_email(
+    enqueue_email(
         to_email=email,
         subject="Confirm your account",
         body=(
@@ -177,6 +238,7 @@ def resend_confirmation():
             f"{confirmation_link}"
         ),
     )
+    db.session.commit()
     return jsonify({"message": "Confirmation email resent"}), 200
 
 
@@ -189,6 +251,10 @@ def forgot_password():
     if email_error:
         return jsonify({"message": email_error}), 400
 
+    limited = rate_limited("forgot_password", email)
+    if limited:
+        return limited
+
     user = User.query.filter_by(email=email).first()
     if not user:
         return jsonify({"message": "If that account exists, a reset email has been sent."}), 200
@@ -196,13 +262,12 @@ def forgot_password():
     reset_token = generate_token()
     user.reset_token_hash = hash_token(reset_token)
     user.reset_token_expires_at = token_expiry(hours=2)
-    db.session.commit()
-
-    send_email(
+    enqueue_email(
         to_email=email,
         subject="Reset your password",
         body=f"Use this token to reset your password: {reset_token}",
     )
+    db.session.commit()
     return jsonify({"message": "If that account exists, a reset email has been sent."}), 200
 
 
@@ -223,6 +288,10 @@ def reset_password():
     if error:
         return jsonify({"message": error}), 400
 
+    limited = rate_limited("reset_password", email)
+    if limited:
+        return limited
+
     user = User.query.filter_by(email=email).first()
     if not user or not user.reset_token_hash:
         return jsonify({"message": "Invalid reset request"}), 400
@@ -236,6 +305,7 @@ def reset_password():
     user.set_password(new_password)
     user.reset_token_hash = None
     user.reset_token_expires_at = None
+    revoke_user_refresh_tokens(user.id)
     db.session.commit()
     return jsonify({"message": "Password reset successful"}), 200
 
@@ -254,10 +324,19 @@ def change_password():
     if error:
         return jsonify({"message": error}), 400
 
-    user = g.current_user
+    limited = rate_limited("change_password", g.current_user.email)
+    if limited:
+        return limited
+
+    user = db.session.get(User, g.current_user.id)
     if not user.check_password(current_password):
         return jsonify({"message": "Current password is incorrect"}), 400
 
     user.set_password(new_password)
+    # Sign out every other session; this one continues with the tokens returned below.
+    revoke_user_refresh_tokens(user.id)
+    db.session.commit()
+    # Issued after the commit bumps the token generation, so they are not born stale.
+    tokens = issue_tokens(user)
     db.session.commit()
-    return jsonify({"message": "Password changed successfully"}), 200
+    return jsonify({"message": "Password changed successfully", **tokens}), 200
@@ -1,7 +1,8 @@
 from datetime import datetime
-from flask import Blueprint, jsonify, request, g
+from flask import Blueprint, current_app, jsonify, request, g
 from pydantic import ValidationError
-from models.models import Article, SavedArticle, ReadArticle, UserPreferences, db
+from sqlalchemy.orm import load_only
+from models.models import Article, SavedArticle, ReadArticle, StoryScore, UserPreferences, db
 from schemas.comment import CommentRequest
 from schemas.analysis import AnalysisRequest
 from schemas.joke import JokeRequest
@@ -12,11 +13,163 @@ from services.analysis_generator import generate_analysis, AnalysisGenError
 from services.joke_generator import generate_joke, JokeGenError
 from services.viral_generator import generate_viral_post, ViralPostError
 from services.summary_generator import generate_summary, SummaryGenError
+from services.personalized_feed import materialized_page
+from services.read_events import discard_buffered_reads, enqueue_read_events, enqueue_unread_event, \
+    write_behind_enabled
+from services.read_state import filter_read_stories, mark_read, mark_unread, read_article_ids
+from services.semantic import related_cluster_ids, semantic_article_hits, warming_up
+from services.search import SEARCH_SORTS, SORT_RECENT, SORT_RELEVANCE, search_articles, search_terms
+from services.response_cache import cache_key, current_generation, get_or_compute, preference_version
+from services import change_log
+from services.story_feed import build_stories, load_stories, paginate_stories, story_columns
+from services.user_articles import existing_article_ids, insert_entries, parse_article_ids
 from utils.decorators import token_required
+from utils.http_cache import etag_matches, make_etag, not_modified, with_validators
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page, page_cursors, parse_direction
 
 # Define the Blueprint
 news_bp = Blueprint('news', __name__)
 
+ARCHIVE_CURSOR_KIND = "article"
+SEARCH_CURSOR_KINDS = {SORT_RELEVANCE: "search", SORT_RECENT: "search_recent"}
+SEARCH_MAX_LIMIT = 50
+RELATED_MAX_LIMIT = 20
+TRENDING_CURSOR_KIND = "trending"
+TRENDING_MAX_LIMIT = 50
+SAVED_CURSOR_KIND = "saved"
+READ_CURSOR_KIND = "read"
+CHANGES_CURSOR_KIND = "changes"
+CHANGES_MAX_LIMIT = 500
+# Feeds change with every pipeline run, so clients revalidate each time (cheap
+# 304s); a story's sources change more slowly.
+FEED_CACHE_CONTROL = "private, no-cache"
+STORY_CACHE_CONTROL = "private, max-age=60"
+USER_ARTICLES_MAX_LIMIT = 200
+USER_ARTICLE_IDS_MAX_LIMIT = 1000
+ARCHIVE_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.ai_summary,
+    Article.category,
+    Article.source_domain,
+    Article.source_url,
+    Article.created_at,
+    Article.cluster_id,
+)
+
+
+def _feed_criteria(category, source, since):
+    criteria = [Article.cluster_id.isnot(None)]
+    if category:
+        criteria.append(Article.category == category)
+    if source:
+        criteria.append(Article.source_domain == source)
+    if since:
+        criteria.append(Article.created_at >= datetime.fromisoformat(since))
+    return criteria
+
+
+def _flag(name):
+    return request.args.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _without_read_stories(payload):
+    payload["stories"] = filter_read_stories(g.current_user.id, payload["stories"])
+    payload["count"] = len(payload["stories"])
+    return payload
+
+
+def _article_payload(a):
+    return {
+        "title": a.title,
+        "summary": a.ai_summary,
+        "category": a.category,
+        "source": a.source_domain,
+        "url": a.source_url,
+        "timestamp": a.created_at,
+        "cluster_id": a.cluster_id,
+        "article_id": a.id,
+    }
+
+
+def _json_body(body):
+    return current_app.response_class(body, mimetype="application/json")
+
+
+def _validated_json(body, etag, cache_control):
+    """Return ``body`` with validators; without a version-derived ETag, hash the body."""
+    etag = etag or make_etag(body)
+    if etag_matches(etag):
+        return not_modified(etag, cache_control)
+    return with_validators(_json_body(body), etag, cache_control)
+
+
+def _story_feed_page(criteria, limit):
+    """Page stories by offset when one is given (legacy clients), otherwise by cursor."""
+    if "offset" in request.args:
+        offset = int(request.args.get("offset", 0))
+        articles = Article.query.options(story_columns()).filter(*criteria) \
+            .order_by(Article.created_at.desc(), Article.id.desc()).offset(offset).limit(limit).all()
+        stories = build_stories(articles)
+        return {"stories": stories, "count": len(stories), "offset": offset, "limit": limit}
+
+    page = paginate_stories(criteria, limit, request.args.get("cursor"), request.args.get("direction"))
+    return {
+        "stories": page["stories"],
+        "count": len(page["stories"]),
+        "limit": limit,
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
+    }
+
+
+def _user_article_listing(entry_model, cursor_kind, timestamp_key):
+    """List a user's saved/read entries newest first with one joined query per page.
+
+    ``ids_only=true`` returns just article ids (for read/saved badges) from the
+    entry table alone, with a larger page size.
+    """
+    ids_only = _flag("ids_only")
+    max_limit = USER_ARTICLE_IDS_MAX_LIMIT if ids_only else USER_ARTICLES_MAX_LIMIT
+    limit = min(int(request.args.get("limit", 100)), max_limit)
+    try:
+        position = decode_cursor(request.args.get("cursor"), cursor_kind)
+        direction = parse_direction(request.args.get("direction"))
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+    if position is None:
+        direction = "next"
+
+    entry_columns = (
+        entry_model.id.label("entry_id"),
+        entry_model.created_at.label("entry_created_at"),
+        entry_model.article_id,
+    )
+    if ids_only:
+        query = db.session.query(*entry_columns)
+    else:
+        query = db.session.query(*entry_columns, *ARCHIVE_COLUMNS) \
+            .join(Article, Article.id == entry_model.article_id)
+    query = query.filter(entry_model.user_id == g.current_user.id)
+
+    rows, has_more = keyset_page(query, entry_model.created_at, entry_model.id, limit, position, direction)
+    next_cursor, prev_cursor = page_cursors(
+        cursor_kind,
+        (rows[0].entry_created_at, rows[0].entry_id) if rows else None,
+        (rows[-1].entry_created_at, rows[-1].entry_id) if rows else None,
+        has_more,
+        direction,
+        had_cursor=position is not None,
+    )
+    pagination = {"count": len(rows), "limit": limit, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+    if ids_only:
+        return jsonify({"article_ids": [row.article_id for row in rows], **pagination})
+    return jsonify({
+        "articles": [{**_article_payload(row), timestamp_key: row.entry_created_at} for row in rows],
+        **pagination,
+    })
+
 
 @news_bp.route('/api/news/feed', methods=['GET'])
 @token_required
@@ -26,50 +179,79 @@ def get_clustered_feed():
     source = request.args.get("source")
     since = request.args.get("since")
     limit = min(int(request.args.get("limit", 100)), 200)
-    offset = int(request.args.get("offset", 0))
 
-    query = Article.query.filter(Article.cluster_id.isnot(None))
-    if category:
-        query = query.filter(Article.category == category)
-    if source:
-        query = query.filter(Article.source_domain == source)
-    if since:
-        try:
-            since_dt = datetime.fromisoformat(since)
-            query = query.filter(Article.created_at >= since_dt)
-        except ValueError:
-            return jsonify({"message": "Invalid 'since' format. Use ISO-8601."}), 400
-
-    # 1. Fetch the last processed articles
-    articles = query.order_by(Article.created_at.desc()).offset(offset).limit(limit).all()
-
-    # 2. Grouping logic
-    stories = {}
-    for a in articles:
-        cid = a.cluster_id
-        if cid not in stories:
-            stories[cid] = {
-                "cluster_id": cid,
-                "story_title": a.title,
-                "summary": a.ai_summary,
-                "sources": [],
-                "timestamp": a.created_at.isoformat(),  # Convert for JSON
-                "lead_article_id": a.id,
-            }
+    try:
+        criteria = _feed_criteria(category, source, since)
+    except ValueError:
+        return jsonify({"message": "Invalid 'since' format. Use ISO-8601."}), 400
+
+    params = {
+        "category": category,
+        "source": source,
+        "since": since,
+        "limit": limit,
+        "offset": request.args.get("offset"),
+        "cursor": request.args.get("cursor"),
+        "direction": (request.args.get("direction") or "").lower(),
+    }
+    # Hiding read stories makes the body per-user, so it is validated by body hash.
+    exclude_read = _flag("exclude_read")
+    generation = current_generation()
+    etag = None
+    if generation is not None and not exclude_read:
+        etag = make_etag(cache_key("feed", params, generation))
+    if etag_matches(etag):
+        return not_modified(etag, FEED_CACHE_CONTROL)
+    try:
+        body = get_or_compute("feed", params, lambda: current_app.json.dumps(_story_feed_page(criteria, limit)))
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+    if exclude_read:
+        body = current_app.json.dumps(_without_read_stories(current_app.json.loads(body)))
+    return _validated_json(body, etag, FEED_CACHE_CONTROL)
 
-        stories[cid]["sources"].append({
-            "article_id": a.id,
-            "name": a.source_domain,
-            "url": a.source_url,
-            "title": a.title,
-        })
 
-    return jsonify({
-        "stories": list(stories.values()),
+@news_bp.route("/api/news/trending", methods=["GET"])
+@token_required
+def get_trending_feed():
+    """Stories ranked by the precomputed trending score (services/trending.py), best first."""
+    limit = min(int(request.args.get("limit", 20)), TRENDING_MAX_LIMIT)
+    category = request.args.get("category")
+    try:
+        position = decode_cursor(request.args.get("cursor"), TRENDING_CURSOR_KIND, scored=True)
+        direction = parse_direction(request.args.get("direction"))
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+    if position is None:
+        direction = "next"
+
+    query = StoryScore.query
+    if category:
+        query = query.filter(StoryScore.category == category)
+    scores, has_more = keyset_page(query, StoryScore.score, StoryScore.cluster_id, limit, position, direction)
+    by_cluster = {s.cluster_id: s for s in scores}
+    stories = load_stories((Article.cluster_id.isnot(None),), [s.cluster_id for s in scores])
+    for story in stories:
+        score = by_cluster[story["cluster_id"]]
+        story["trending_score"] = score.score
+        story["source_count"] = score.source_count
+
+    next_cursor, prev_cursor = page_cursors(
+        TRENDING_CURSOR_KIND,
+        (scores[0].score, scores[0].cluster_id) if scores else None,
+        (scores[-1].score, scores[-1].cluster_id) if scores else None,
+        has_more,
+        direction,
+        had_cursor=position is not None,
+    )
+    body = current_app.json.dumps({
+        "stories": stories,
         "count": len(stories),
-        "offset": offset,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
     })
+    return _validated_json(body, None, FEED_CACHE_CONTROL)
 
 
 @news_bp.route("/api/news/personalized", methods=["GET"])
@@ -79,59 +261,72 @@ def get_personalized_feed():
     source = request.args.get("source")
     since = request.args.get("since")
     limit = min(int(request.args.get("limit", 100)), 200)
-    offset = int(request.args.get("offset", 0))
+
+    exclude_read = _flag("exclude_read")
+
+    # Preferences are versioned in Redis, so a matching ETag needs no queries.
+    generation = current_generation()
+    prefs_version = preference_version(g.current_user.id)
+    etag = None
+    if generation is not None and prefs_version is not None and not exclude_read:
+        params = {
+            "category": category,
+            "source": source,
+            "since": since,
+            "limit": limit,
+            "offset": request.args.get("offset"),
+            "cursor": request.args.get("cursor"),
+            "direction": (request.args.get("direction") or "").lower(),
+            "user_id": g.current_user.id,
+            "prefs_version": prefs_version,
+        }
+        etag = make_etag(cache_key("personalized", params, generation))
+        if etag_matches(etag):
+            return not_modified(etag, FEED_CACHE_CONTROL)
 
     preferences = UserPreferences.query.filter_by(user_id=g.current_user.id).first()
     preferred_categories = preferences.preferred_categories if preferences else []
     preferred_sources = preferences.preferred_sources if preferences else []
 
-    query = Article.query.filter(Article.cluster_id.isnot(None))
+    try:
+        criteria = _feed_criteria(category, source, since)
+    except ValueError:
+        return jsonify({"message": "Invalid 'since' format. Use ISO-8601."}), 400
     if preferred_categories:
-        query = query.filter(Article.category.in_(preferred_categories))
+        criteria.append(Article.category.in_(preferred_categories))
     if preferred_sources:
-        query = query.filter(Article.source_domain.in_(preferred_sources))
-    if category:
-        query = query.filter(Article.category == category)
-    if source:
-        query = query.filter(Article.source_domain == source)
-    if since:
-        try:
-            since_dt = datetime.fromisoformat(since)
-            query = query.filter(Article.created_at >= since_dt)
-        except ValueError:
-            return jsonify({"message": "Invalid 'since' format. Use ISO-8601."}), 400
-
-    articles = query.order_by(Article.created_at.desc()).offset(offset).limit(limit).all()
-
-    stories = {}
-    for a in articles:
-        cid = a.cluster_id
-        if cid not in stories:
-            stories[cid] = {
-                "cluster_id": cid,
-                "story_title": a.title,
-                "summary": a.ai_summary,
-                "sources": [],
-                "timestamp": a.created_at.isoformat(),
-                "lead_article_id": a.id,
-            }
-        stories[cid]["sources"].append({
-            "article_id": a.id,
-            "name": a.source_domain,
-            "url": a.source_url,
-            "title": a.title,
-        })
+        criteria.append(Article.source_domain.in_(preferred_sources))
 
-    return jsonify({
-        "stories": list(stories.values()),
-        "count": len(stories),
-        "offset": offset,
-        "limit": limit,
-        "preferences": {
-            "preferred_categories": preferred_categories,
-            "preferred_sources": preferred_sources,
-        },
-    })
+    try:
+        payload = None
+        if not (category or source or since or "offset" in request.args):
+            page = materialized_page(
+                preferred_categories,
+                preferred_sources,
+                limit,
+                request.args.get("cursor"),
+                request.args.get("direction"),
+            )
+            if page is not None:
+                payload = {
+                    "stories": page["stories"],
+                    "count": len(page["stories"]),
+                    "limit": limit,
+                    "next_cursor": page["next_cursor"],
+                    "prev_cursor": page["prev_cursor"],
+                }
+        if payload is None:
+            payload = _story_feed_page(criteria, limit)
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    if exclude_read:
+        payload = _without_read_stories(payload)
+    payload["preferences"] = {
+        "preferred_categories": preferred_categories,
+        "preferred_sources": preferred_sources,
+    }
+    return _validated_json(current_app.json.dumps(payload), etag, FEED_CACHE_CONTROL)
 
 
 @news_bp.route('/api/news/archive', methods=['GET'])
@@ -141,9 +336,8 @@ def get_news_archive():
     source = request.args.get("source")
     before = request.args.get("before")
     limit = min(int(request.args.get("limit", 100)), 200)
-    offset = int(request.args.get("offset", 0))
 
-    query = Article.query
+    query = Article.query.options(load_only(*ARCHIVE_COLUMNS))
     if category:
         query = query.filter(Article.category == category)
     if source:
@@ -155,38 +349,189 @@ def get_news_archive():
         except ValueError:
             return jsonify({"message": "Invalid 'before' format. Use ISO-8601."}), 400
 
-    articles = query.order_by(Article.created_at.desc()).offset(offset).limit(limit).all()
+    pagination = {}
+    if "offset" in request.args:
+        offset = int(request.args.get("offset", 0))
+        articles = query.order_by(Article.created_at.desc(), Article.id.desc()).offset(offset).limit(limit).all()
+        pagination["offset"] = offset
+    else:
+        try:
+            position = decode_cursor(request.args.get("cursor"), ARCHIVE_CURSOR_KIND)
+            direction = parse_direction(request.args.get("direction"))
+        except InvalidCursor as exc:
+            return jsonify({"message": str(exc)}), 400
+        if position is None:
+            direction = "next"
+        articles, has_more = keyset_page(query, Article.created_at, Article.id, limit, position, direction)
+        next_cursor, prev_cursor = page_cursors(
+            ARCHIVE_CURSOR_KIND,
+            (articles[0].created_at, articles[0].id) if articles else None,
+            (articles[-1].created_at, articles[-1].id) if articles else None,
+            has_more,
+            direction,
+            had_cursor=position is not None,
+        )
+        pagination["next_cursor"] = next_cursor
+        pagination["prev_cursor"] = prev_cursor
 
     return jsonify({
-        "articles": [
-            {
-                "title": a.title,
-                "summary": a.ai_summary,
-                "category": a.category,
-                "source": a.source_domain,
-                "url": a.source_url,
-                "timestamp": a.created_at.isoformat(),
-                "cluster_id": a.cluster_id,
-                "article_id": a.id,
-            }
-            for a in articles
-        ],
+        "articles": [_article_payload(a) for a in articles],
         "count": len(articles),
-        "offset": offset,
         "limit": limit,
+        **pagination,
+    })
+
+
+@news_bp.route("/api/news/search", methods=["GET"])
+@token_required
+def search_news():
+    """Search article titles and summaries; results carry cluster_id to open the story.
+
+    Filters: category, source, since/until (ISO-8601). ``sort`` is "relevance"
+    (default) or "recent"; page with ``cursor`` from the previous response.
+    """
+    q = request.args.get("q", "")
+    if not search_terms(q):
+        return jsonify({"message": "q must contain at least one word."}), 400
+    sort = request.args.get("sort", SORT_RELEVANCE).lower()
+    if sort not in SEARCH_SORTS:
+        return jsonify({"message": f"sort must be one of: {', '.join(SEARCH_SORTS)}."}), 400
+    limit = min(int(request.args.get("limit", 20)), SEARCH_MAX_LIMIT)
+
+    criteria = []
+    if request.args.get("category"):
+        criteria.append(Article.category == request.args["category"])
+    if request.args.get("source"):
+        criteria.append(Article.source_domain == request.args["source"])
+    try:
+        if request.args.get("since"):
+            criteria.append(Article.created_at >= datetime.fromisoformat(request.args["since"]))
+        if request.args.get("until"):
+            criteria.append(Article.created_at <= datetime.fromisoformat(request.args["until"]))
+    except ValueError:
+        return jsonify({"message": "Invalid 'since'/'until' format. Use ISO-8601."}), 400
+
+    cursor_kind = SEARCH_CURSOR_KINDS[sort]
+    try:
+        position = decode_cursor(request.args.get("cursor"), cursor_kind, scored=sort == SORT_RELEVANCE)
+        direction = parse_direction(request.args.get("direction"))
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+    if position is None:
+        direction = "next"
+
+    rows, has_more = search_articles(q, criteria, ARCHIVE_COLUMNS, limit, position, direction, sort)
+
+    def _position(row):
+        article, rank = row
+        return (article.created_at if sort == SORT_RECENT else rank), article.id
+
+    next_cursor, prev_cursor = page_cursors(
+        cursor_kind,
+        _position(rows[0]) if rows else None,
+        _position(rows[-1]) if rows else None,
+        has_more,
+        direction,
+        had_cursor=position is not None,
+    )
+    return jsonify({
+        "articles": [{**_article_payload(article), "rank": rank} for article, rank in rows],
+        "count": len(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    })
+
+
+def _semantic_search_unavailable():
+    response = jsonify({"message": "Semantic search is not available."})
+    response.headers["Retry-After"] = "30"
+    return response, 503
+
+
+@news_bp.route("/api/news/search/semantic", methods=["GET"])
+@token_required
+def semantic_search_news():
+    """Articles closest in meaning to ``q`` (embedding similarity), best first."""
+    q = request.args.get("q", "").strip()
+    if not search_terms(q):
+        return jsonify({"message": "q must contain at least one word."}), 400
+    limit = min(int(request.args.get("limit", 20)), SEARCH_MAX_LIMIT)
+    if warming_up():
+        # Loading the model here too would hold this worker thread for the whole load.
+        return _semantic_search_unavailable()
+    try:
+        hits = semantic_article_hits(q, limit)
+    except Exception:
+        # Missing package, failed model download or an index load error.
+        current_app.logger.exception("Semantic search failed.")
+        return _semantic_search_unavailable()
+
+    articles = {
+        a.id: a for a in Article.query.options(load_only(*ARCHIVE_COLUMNS))
+        .filter(Article.id.in_([article_id for article_id, _ in hits]))
+    }
+    results = [
+        {**_article_payload(articles[article_id]), "score": score}
+        for article_id, score in hits if article_id in articles
+    ]
+    return jsonify({"articles": results, "count": len(results), "limit": limit})
+
+
+@news_bp.route("/api/news/story/<int:cluster_id>/related", methods=["GET"])
+@token_required
+def get_related_stories(cluster_id):
+    limit = min(int(request.args.get("limit", 10)), RELATED_MAX_LIMIT)
+    params = {"cluster_id": cluster_id, "limit": limit}
+    generation = current_generation()
+    etag = make_etag(cache_key("story_related", params, generation)) if generation is not None else None
+    if etag_matches(etag):
+        return not_modified(etag, STORY_CACHE_CONTROL)
+    if warming_up():
+        return _semantic_search_unavailable()
+    try:
+        body = get_or_compute("story_related", params, lambda: _related_body(cluster_id, limit))
+    except Exception:
+        current_app.logger.exception("Related stories lookup failed.")
+        return _semantic_search_unavailable()
+    if body is None:
+        return jsonify({"message": "Story not found"}), 404
+    return _validated_json(body, etag, STORY_CACHE_CONTROL)
+
+
+def _related_body(cluster_id, limit):
+    related = related_cluster_ids(cluster_id, limit)
+    if related is None:
+        return None
+    scores = dict(related)
+    stories = load_stories((Article.cluster_id.isnot(None),), [cid for cid, _ in related])
+    return current_app.json.dumps({
+        "cluster_id": cluster_id,
+        "stories": [{**story, "score": scores[story["cluster_id"]]} for story in stories],
     })
 
 
 @news_bp.route('/api/news/story/<int:cluster_id>', methods=['GET'])
 @token_required
 def get_story(cluster_id):
-    articles = Article.query.filter(Article.cluster_id == cluster_id) \
-        .order_by(Article.created_at.desc()).all()
+    params = {"cluster_id": cluster_id}
+    generation = current_generation()
+    etag = make_etag(cache_key("story", params, generation)) if generation is not None else None
+    if etag_matches(etag):
+        return not_modified(etag, STORY_CACHE_CONTROL)
+    body = get_or_compute("story", params, lambda: _story_body(cluster_id))
+    if body is None:
+        return jsonify({"message": "Story not found"}), 404
+    return _validated_json(body, etag, STORY_CACHE_CONTROL)
 
+
+def _story_body(cluster_id):
+    articles = Article.query.options(story_columns()).filter(Article.cluster_id == cluster_id) \
+        .order_by(Article.created_at.desc()).all()
     if not articles:
-        return jsonify({"message": "Story not found"}), 404
+        return None
 
-    return jsonify({
+    return current_app.json.dumps({
         "cluster_id": cluster_id,
         "story_title": articles[0].title,
         "summary": articles[0].ai_summary,
@@ -209,48 +554,25 @@ def save_article():
     article_id = data.get("article_id")
     if not article_id:
         return jsonify({"message": "article_id is required."}), 400
+    return _add_user_article(SavedArticle, change_log.SAVED, article_id, "Article saved.", "Article already saved.")
 
-    article = db.session.get(Article, article_id)
-    if not article:
-        return jsonify({"message": "Article not found."}), 404
 
-    existing = SavedArticle.query.filter_by(
-        user_id=g.current_user.id,
-        article_id=article_id,
-    ).first()
-    if existing:
-        return jsonify({"message": "Article already saved."}), 200
+@news_bp.route("/api/news/save/bulk", methods=["POST"])
+@token_required
+def save_articles_bulk():
+    return _add_user_articles_bulk(SavedArticle, change_log.SAVED)
+
 
-    saved = SavedArticle(user_id=g.current_user.id, article_id=article_id)
-    db.session.add(saved)
-    db.session.commit()
-    return jsonify({"message": "Article saved."}), 201
+@news_bp.route("/api/news/save/<int:article_id>", methods=["DELETE"])
+@token_required
+def unsave_article(article_id):
+    return _remove_user_article(SavedArticle, change_log.SAVED, article_id, "Article unsaved.")
 
 
 @news_bp.route("/api/news/saved", methods=["GET"])
 @token_required
 def list_saved_articles():
-    saved_entries = (
-        SavedArticle.query.filter_by(user_id=g.current_user.id)
-        .order_by(SavedArticle.created_at.desc())
-        .all()
-    )
-    articles = []
-    for entry in saved_entries:
-        article = db.session.get(Article, entry.article_id)
-        if article:
-            articles.append({
-                "article_id": article.id,
-                "title": article.title,
-                "summary": article.ai_summary,
-                "category": article.category,
-                "source": article.source_domain,
-                "url": article.source_url,
-                "timestamp": article.created_at.isoformat(),
-                "cluster_id": article.cluster_id,
-                "saved_at": entry.created_at.isoformat(),
-            })
-    return jsonify({"articles": articles, "count": len(articles)})
+    return _user_article_listing(SavedArticle, SAVED_CURSOR_KIND, "saved_at")
 
 
 @news_bp.route("/api/news/read", methods=["POST"])
@@ -260,48 +582,162 @@ def mark_article_read():
     article_id = data.get("article_id")
     if not article_id:
         return jsonify({"message": "article_id is required."}), 400
+    return _add_user_article(
+        ReadArticle, change_log.READ, article_id, "Article marked as read.", "Article already marked as read."
+    )
+
 
-    article = db.session.get(Article, article_id)
-    if not article:
+@news_bp.route("/api/news/read/bulk", methods=["POST"])
+@token_required
+def mark_articles_read_bulk():
+    return _add_user_articles_bulk(ReadArticle, change_log.READ)
+
+
+def _add_user_article(entry_model, entity, article_id, added_message, existing_message):
+    try:
+        article_id = int(article_id)
+    except (TypeError, ValueError):
+        return jsonify({"message": "article_id must be an integer."}), 400
+    if not existing_article_ids([article_id]):
         return jsonify({"message": "Article not found."}), 404
+    if entity == change_log.READ and write_behind_enabled():
+        enqueue_read_events(g.current_user.id, [article_id])
+        return jsonify({"message": added_message}), 202
+
+    inserted = insert_entries(entry_model, entity, g.current_user.id, [article_id])
+    db.session.commit()
+    if not inserted:
+        return jsonify({"message": existing_message}), 200
+    if entity == change_log.READ:
+        mark_read(g.current_user.id, inserted)
+    return jsonify({"message": added_message}), 201
+
+
+def _add_user_articles_bulk(entry_model, entity):
+    """Add many entries in one statement.
+
+    Idempotent and partial: ids that do not exist are reported in ``missing``
+    instead of failing the batch, so clients can retry a batch safely.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        article_ids = parse_article_ids(data.get("article_ids"))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    found = existing_article_ids(article_ids)
+    valid = [aid for aid in article_ids if aid in found]
+    missing = [aid for aid in article_ids if aid not in found]
+    if entity == change_log.READ and write_behind_enabled():
+        # Stored later by the read-event flush; added/existing are not known yet.
+        enqueue_read_events(g.current_user.id, valid)
+        return jsonify({"queued": valid, "missing": missing}), 202
+
+    inserted = insert_entries(entry_model, entity, g.current_user.id, valid)
+    db.session.commit()
+    if entity == change_log.READ:
+        mark_read(g.current_user.id, inserted)
+
+    added = set(inserted)
+    return jsonify({
+        "added": inserted,
+        "existing": [aid for aid in valid if aid not in added],
+        "missing": missing,
+    })
 
-    existing = ReadArticle.query.filter_by(
-        user_id=g.current_user.id,
-        article_id=article_id,
-    ).first()
-    if existing:
-        return jsonify({"message": "Article already marked as read."}), 200
 
-    read_entry = ReadArticle(user_id=g.current_user.id, article_id=article_id)
-    db.session.add(read_entry)
+@news_bp.route("/api/news/read/<int:article_id>", methods=["DELETE"])
+@token_required
+def mark_article_unread(article_id):
+    return _remove_user_article(ReadArticle, change_log.READ, article_id, "Article marked as unread.")
+
+
+def _remove_user_article(entry_model, entity, article_id, message):
+    discarded = set()
+    if entity == change_log.READ and write_behind_enabled():
+        # Read state includes reads that are still queued.
+        if not read_article_ids(g.current_user.id, [article_id]):
+            return jsonify({"message": "Entry not found."}), 404
+        if enqueue_unread_event(g.current_user.id, article_id):
+            # Queued behind the user's earlier reads; the read-event flush applies both in order.
+            return jsonify({"message": message}), 202
+        # No stream: drop the read if it is still buffered here, then delete as usual.
+        discarded = discard_buffered_reads(g.current_user.id, [article_id])
+    deleted = entry_model.query.filter_by(user_id=g.current_user.id, article_id=article_id) \
+        .delete(synchronize_session=False)
+    if not deleted and not discarded:
+        return jsonify({"message": "Entry not found."}), 404
+    if deleted:
+        change_log.record_change(entity, article_id, change_log.REMOVED, user_id=g.current_user.id)
     db.session.commit()
-    return jsonify({"message": "Article marked as read."}), 201
+    if entity == change_log.READ:
+        mark_unread(g.current_user.id, [article_id])
+    return jsonify({"message": message}), 200
+
+
+@news_bp.route("/api/news/changes", methods=["GET"])
+@token_required
+def get_changes():
+    """Delta sync: what changed since a cursor from a previous call.
+
+    Call without ``since`` after a full load to get a starting cursor. Entries
+    are collapsed per entity, so clients apply each list once; keep calling
+    with ``next_cursor`` while ``has_more`` is true.
+    """
+    limit = min(int(request.args.get("limit", 200)), CHANGES_MAX_LIMIT)
+    try:
+        position = decode_cursor(request.args.get("since"), CHANGES_CURSOR_KIND)
+    except InvalidCursor as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    now = datetime.utcnow()
+    if position is None:
+        latest = change_log.latest_change(now)
+        return jsonify({
+            "next_cursor": encode_cursor(CHANGES_CURSOR_KIND, (now, latest.id if latest else 0)),
+            "has_more": False,
+        })
+    synced_at, after_id = position
+    if synced_at < change_log.retention_cutoff(now):
+        return jsonify({"message": "Cursor has expired; reload the feed and lists, then sync again."}), 410
+
+    entries = change_log.changes_since(g.current_user.id, after_id, limit + 1, now)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    collapsed = change_log.collapse_changes(entries)
+
+    changed_clusters = [cid for cid, action in collapsed[change_log.STORY].items() if action != change_log.REMOVED]
+    stories = load_stories((Article.cluster_id.isnot(None),), changed_clusters)
+    loaded = {story["cluster_id"] for story in stories}
+    removed_clusters = [cid for cid in collapsed[change_log.STORY] if cid not in loaded]
+
+    articles = []
+    if collapsed[change_log.ARTICLE]:
+        articles = Article.query.options(load_only(*ARCHIVE_COLUMNS)) \
+            .filter(Article.id.in_(list(collapsed[change_log.ARTICLE]))).all()
+
+    def _split(entity):
+        actions = collapsed[entity]
+        return {
+            "added": [aid for aid, action in actions.items() if action == change_log.ADDED],
+            "removed": [aid for aid, action in actions.items() if action == change_log.REMOVED],
+        }
+
+    last_id = entries[-1].id if entries else after_id
+    return jsonify({
+        "stories": {"updated": stories, "removed": removed_clusters},
+        "articles": {"updated": [_article_payload(a) for a in articles]},
+        "saved": _split(change_log.SAVED),
+        "read": _split(change_log.READ),
+        "next_cursor": encode_cursor(CHANGES_CURSOR_KIND, (now, last_id)),
+        "has_more": has_more,
+    })
 
 
 @news_bp.route("/api/news/read-articles", methods=["GET"])
 @token_required
 def list_read_articles():
-    read_entries = (
-        ReadArticle.query.filter_by(user_id=g.current_user.id)
-        .order_by(ReadArticle.created_at.desc())
-        .all()
-    )
-    articles = []
-    for entry in read_entries:
-        article = db.session.get(Article, entry.article_id)
-        if article:
-            articles.append({
-                "article_id": article.id,
-                "title": article.title,
-                "summary": article.ai_summary,
-                "category": article.category,
-                "source": article.source_domain,
-                "url": article.source_url,
-                "timestamp": article.created_at.isoformat(),
-                "cluster_id": article.cluster_id,
-                "read_at": entry.created_at.isoformat(),
-            })
-    return jsonify({"articles": articles, "count": len(articles)})
+    return _user_article_listing(ReadArticle, READ_CURSOR_KIND, "read_at")
 
 
 @news_bp.route("/api/news/generate-viral-post", methods=["POST"])
@@ -1,6 +1,7 @@
 import re
 from flask import Blueprint, jsonify, request, g
 from models.models import db, UserPreferences
+from services.response_cache import bump_preference_version
 from utils.decorators import token_required
 
 preferences_bp = Blueprint("preferences", __name__)
@@ -70,6 +71,7 @@ def update_preferences():
         preferences.digest_enabled = digest_enabled
 
     db.session.commit()
+    bump_preference_version(g.current_user.id)
     return jsonify({
         "preferred_categories": preferences.preferred_categories or [],
         "preferred_sources": preferences.preferred_sources or [],
@@ -1,11 +1,16 @@
-from models.models import db, Article
-from openai import OpenAI
-import os
-from datetime import datetime
+from models.models import db
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+from services.llm_client import DEFAULT_MODEL, LLMUnavailableError, chat_completion
+from services.response_cache import bump_generation
+from services.summary_queue import (
+    fetch_summary_batch,
+    record_summary_failure,
+    record_summary_success,
+)
+from services.token_budget import input_budget, trim_to_budget
 
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Background batches can wait longer than interactive requests before giving up.
+SUMMARY_DEADLINE_SECONDS = 90
 
 
 def process_unsummarized_news():
@@ -13,48 +18,69 @@ def process_unsummarized_news():
     Finds articles without summaries, generates them using AI,
     and updates the database.
     """
-    # 1. Fetch articles that haven't been processed yet
-    # Limit to 5-10 per run to stay within OpenAI rate limits and manage costs
-    pending_articles = Article.query.filter(Article.ai_summary == None).limit(10).all()
+    # 1. Fetch the highest-priority articles that are due for a summary
+    # Batch size is capped (SUMMARY_BATCH_SIZE) to stay within OpenAI rate limits and manage costs
+    pending_articles = fetch_summary_batch()
 
     if not pending_articles:
         print("No new articles to process.")
         return
 
     print(f"AI is processing {len(pending_articles)} new articles...")
+    summarized = 0
 
-    for article in pending_articles:
-        try:
-            # 2. Call OpenAI to summarize the raw content
-            summary_style = article.summary_style or "bullets-3"
-            system_prompt = "Summarize this news in 3 bullet points."
-            if summary_style == "short":
-                system_prompt = "Summarize this news in 2 short sentences."
-            elif summary_style == "detailed":
-                system_prompt = "Summarize this news in 5 bullet points with key details."
-
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": (article.raw_content or "")[:4000],
-                    }  # Context window safety
-                ],
-                temperature=0.3
-            )
+    # Each commit would otherwise expire the whole batch, and touching an expired
+    # row reloads it (and its deferred text) one query at a time. This job is the
+    # only writer of the summary columns, so the loaded values stay current.
+    session = db.session()
+    session.expire_on_commit = False
+    try:
+        for article in pending_articles:
+            try:
+                # 2. Call OpenAI to summarize the raw content
+                summary_style = article.summary_style or "bullets-3"
+                system_prompt = "Summarize this news in 3 bullet points."
+                if summary_style == "short":
+                    system_prompt = "Summarize this news in 2 short sentences."
+                elif summary_style == "detailed":
+                    system_prompt = "Summarize this news in 5 bullet points with key details."
+
+                content = chat_completion(
+                    [
+                        {"role": "system", "content": system_prompt},
+                        {
+                            "role": "user",
+                            "content": trim_to_budget(
+                                article.raw_content or "", input_budget(DEFAULT_MODEL)
+                            ),
+                        }
+                    ],
+                    model=DEFAULT_MODEL,
+                    deadline_seconds=SUMMARY_DEADLINE_SECONDS,
+                    temperature=0.3,
+                )
+
+            except LLMUnavailableError as e:
+                # Leave the rest of the batch untouched for the next run instead of
+                # stamping every article with the same outage error.
+                print(f" AI unavailable, stopping batch: {e}")
+                break
+
+            except Exception as e:
+                # Nothing is pending (each article commits), so there is nothing to
+                # roll back; a rollback would also expire the rest of the batch.
+                record_summary_failure(article, str(e))
+                db.session.commit()
+                print(f" AI Error on article {article.id}: {e}")
+                continue
 
             # 3. Update the database record
-            article.ai_summary = response.choices[0].message.content.strip()
-            article.summary_error = None
-            article.processed_at = datetime.utcnow()
+            record_summary_success(article, content.strip())
             db.session.commit()
+            summarized += 1
             print(f" Summarized: {article.title[:50]}...")
+    finally:
+        session.expire_on_commit = True
 
-        except Exception as e:
-            db.session.rollback()
-            article.summary_error = str(e)
-            article.processed_at = datetime.utcnow()
-            db.session.commit()
-            print(f" AI Error on article {article.id}: {e}")
+    if summarized:
+        bump_generation()
@@ -1,32 +1,19 @@
 import json
-import re
 from typing import Any, Dict, Optional
 
-from openai import OpenAI
-
-from services.ai_engine import client as ai_client
 from services.analysis_prompts import build_analysis_messages
+from services.llm_client import LLMError, chat_completion, extract_json_object
 
 
 class AnalysisGenError(Exception):
     pass
 
 
-def _get_client() -> OpenAI:
-    return ai_client or OpenAI()
-
-
 def _safe_json_loads(text: str) -> Dict[str, Any]:
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            raise AnalysisGenError("Model did not return valid JSON.")
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError as exc:
-            raise AnalysisGenError("Model did not return valid JSON.") from exc
+        return extract_json_object(text)
+    except json.JSONDecodeError as exc:
+        raise AnalysisGenError("Model did not return valid JSON.") from exc
 
 
 def _validate_payload(data: Dict[str, Any]) -> None:
@@ -55,7 +42,6 @@ def generate_analysis(
     fact_mode: bool,
     model: Optional[str] = None,
 ) -> Dict[str, Any]:
-    client = _get_client()
     messages = build_analysis_messages(
         summary=summary,
         format=format,
@@ -67,17 +53,16 @@ def generate_analysis(
         fact_mode=fact_mode,
     )
     try:
-        response = client.chat.completions.create(
-            model=model or "gpt-4o-mini",
-            messages=messages,
+        content = chat_completion(
+            messages,
+            model=model,
             temperature=0.75,
             top_p=0.95,
             response_format={"type": "json_object"},
         )
-    except Exception as exc:
+    except LLMError as exc:
         raise AnalysisGenError(f"OpenAI request failed: {exc}") from exc
 
-    content = response.choices[0].message.content or ""
     data = _safe_json_loads(content)
     if "warnings" not in data:
         data["warnings"] = []
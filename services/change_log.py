@@ -0,0 +1,102 @@
+"""Change log backing delta sync (/api/news/changes).
+
+Writers call ``record_change`` inside the transaction that makes the change, so
+an entry exists exactly when the change was committed. Readers page through
+entries after a cursor and collapse them to the latest action per entity.
+
+Ids are assigned at insert, not at commit, so a transaction can commit a lower
+id after a reader has moved past it. Writers commit within
+``CHANGE_LOG_SETTLE_SECONDS`` of recording a change, and readers stop at the
+first entry younger than that, so every lower id is committed (or rolled back)
+before a cursor passes it.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, or_
+
+from models.models import ChangeLog, db
+
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "7"))
+CHANGE_LOG_SETTLE_SECONDS = int(os.getenv("CHANGE_LOG_SETTLE_SECONDS", "30"))
+
+STORY = "story"
+ARTICLE = "article"
+SAVED = "saved"
+READ = "read"
+
+UPSERTED = "upserted"
+REMOVED = "removed"
+ADDED = "added"
+SUMMARIZED = "summarized"
+CLUSTERED = "clustered"
+
+
+def record_change(entity: str, entity_id: int, action: str, user_id: Optional[int] = None) -> None:
+    db.session.add(ChangeLog(entity=entity, entity_id=entity_id, action=action, user_id=user_id))
+
+
+def record_changes(entity: str, entity_ids: Iterable[int], action: str, user_id: Optional[int] = None) -> None:
+    """Record one change per id with a single executemany insert."""
+    now = datetime.utcnow()
+    rows = [
+        {"entity": entity, "entity_id": entity_id, "action": action, "user_id": user_id, "created_at": now}
+        for entity_id in entity_ids
+    ]
+    if rows:
+        db.session.execute(insert(ChangeLog), rows)
+
+
+def retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(days=CHANGE_LOG_RETENTION_DAYS)
+
+
+def settled_before(now: Optional[datetime] = None) -> datetime:
+    """Low-water mark: entries recorded before this have no uncommitted predecessors."""
+    return (now or datetime.utcnow()) - timedelta(seconds=CHANGE_LOG_SETTLE_SECONDS)
+
+
+def latest_change(now: Optional[datetime] = None) -> Optional[ChangeLog]:
+    """Newest settled entry; a starting cursor must not skip a still-open transaction."""
+    return (
+        ChangeLog.query.filter(ChangeLog.created_at <= settled_before(now))
+        .order_by(ChangeLog.id.desc())
+        .first()
+    )
+
+
+def changes_since(user_id: int, after_id: int, limit: int, now: Optional[datetime] = None) -> List[ChangeLog]:
+    """Return up to ``limit`` settled entries visible to ``user_id`` with id > ``after_id``, oldest first.
+
+    Stops at the first entry that has not settled yet, so the cursor never passes it.
+    """
+    entries = (
+        ChangeLog.query.filter(
+            ChangeLog.id > after_id,
+            or_(ChangeLog.user_id.is_(None), ChangeLog.user_id == user_id),
+        )
+        .order_by(ChangeLog.id.asc())
+        .limit(limit)
+        .all()
+    )
+    cutoff = settled_before(now)
+    for index, entry in enumerate(entries):
+        if entry.created_at > cutoff:
+            return entries[:index]
+    return entries
+
+
+def collapse_changes(entries: Iterable[ChangeLog]) -> Dict[str, Dict[int, str]]:
+    """Map entity -> {entity_id: last action}, so repeated changes cost one entry."""
+    collapsed: Dict[str, Dict[int, str]] = {STORY: {}, ARTICLE: {}, SAVED: {}, READ: {}}
+    for entry in entries:
+        collapsed.setdefault(entry.entity, {})[entry.entity_id] = entry.action
+    return collapsed
+
+
+def prune_change_log() -> None:
+    deleted = ChangeLog.query.filter(ChangeLog.created_at < retention_cutoff()).delete(synchronize_session=False)
+    db.session.commit()
+    print(f"Pruned {deleted} change log entries.")
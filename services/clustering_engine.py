@@ -1,12 +1,44 @@
 from models.models import db, Article
-from sentence_transformers import SentenceTransformer
+from services.change_log import ARTICLE, CLUSTERED, REMOVED, STORY, UPSERTED, record_changes
+from services.embeddings import embeddings_for
+from services.personalized_feed import rebuild_personalized_feeds
+from services.realtime import build_story_events, publish_story_events
+from services.response_cache import bump_generation
+from services.trending import compute_trending_scores
 from sklearn.cluster import AgglomerativeClustering
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from collections import Counter
 from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
 
-# Load the model once
-model = SentenceTransformer('all-MiniLM-L6-v2')
+
+def _stable_cluster_ids(articles, labels):
+    """Map each clustering label to a cluster id, keeping the ids of continuing stories.
+
+    A label takes the previous cluster id it shares the most articles with
+    (each old id goes to one label at most), so a story keeps its id while
+    articles join or leave it; labels with no predecessor get fresh ids.
+    """
+    overlap = Counter(
+        (int(label), article.cluster_id)
+        for label, article in zip(labels, articles)
+        if article.cluster_id is not None
+    )
+    assigned, reused = {}, set()
+    for (label, cluster_id), _ in sorted(overlap.items(), key=lambda item: (-item[1], item[0])):
+        if label not in assigned and cluster_id not in reused:
+            assigned[label] = cluster_id
+            reused.add(cluster_id)
+    fresh = sorted({int(label) for label in labels} - set(assigned))
+    if fresh:
+        highest = db.session.query(func.max(Article.cluster_id)).scalar() or 0
+        next_id = max(int(datetime.utcnow().timestamp()), highest + 1)
+        for label in fresh:
+            assigned[label] = next_id
+            next_id += 1
+    return assigned
 
 
 def cluster_recent_articles(window_hours=24):
@@ -15,7 +47,11 @@ def cluster_recent_articles(window_hours=24):
     """
     # 1. Fetch articles from the last 24 hours that have been summarized
     time_threshold = datetime.utcnow() - timedelta(hours=window_hours)
-    articles = Article.query.filter(
+    articles = Article.query.options(
+        load_only(
+            Article.id, Article.title, Article.ai_summary, Article.cluster_id, Article.category, Article.created_at
+        )
+    ).filter(
         Article.created_at >= time_threshold,
         Article.ai_summary != None
     ).all()
@@ -23,9 +59,8 @@ def cluster_recent_articles(window_hours=24):
     if len(articles) < 2:
         return
 
-    # 2. Prepare text for embedding (Title + Summary gives best context)
-    texts = [f"{a.title}. {a.ai_summary}" for a in articles]
-    embeddings = model.encode(texts)
+    # 2. Embed title + summary; articles embedded in earlier runs reuse their stored vectors
+    embeddings = embeddings_for(articles)
 
     # 3. Calculate similarity and cluster
     # We use a threshold of 0.85 similarity (0.15 distance)
@@ -40,11 +75,43 @@ def cluster_recent_articles(window_hours=24):
     # Predict clusters
     labels = clustering_model.fit_predict(1 - similarity_matrix)
 
-    # 4. Update the Database
-    # We use the current timestamp to make cluster IDs unique across different windows
-    base_id = int(datetime.utcnow().timestamp())
-    for i, article in enumerate(articles):
-        article.cluster_id = base_id + int(labels[i])
+    # 4. Update the Database, keeping the ids of stories that continue
+    cluster_ids = _stable_cluster_ids(articles, labels)
+    existing_clusters = {a.cluster_id for a in articles if a.cluster_id is not None}
+    moved = []
+    changed_clusters = set()
+    for label, article in zip(labels, articles):
+        new_cluster_id = cluster_ids[int(label)]
+        if article.cluster_id != new_cluster_id:
+            moved.append(article.id)
+            changed_clusters.update(cid for cid in (article.cluster_id, new_cluster_id) if cid is not None)
+            article.cluster_id = new_cluster_id
+    db.session.flush()
+
+    # Record what delta-sync clients need to refetch or drop: only stories whose membership changed.
+    current = set(cluster_ids.values())
+    vacated = changed_clusters - current
+    surviving = set()
+    if vacated:
+        # Older articles outside the window can keep a previous cluster alive.
+        surviving = {
+            cid for (cid,) in db.session.query(Article.cluster_id)
+            .filter(Article.cluster_id.in_(vacated)).distinct()
+        }
+    record_changes(ARTICLE, moved, CLUSTERED)
+    record_changes(STORY, (changed_clusters & current) | surviving, UPSERTED)
+    record_changes(STORY, vacated - surviving, REMOVED)
+    # Built from the loaded rows before the commit expires them.
+    events = build_story_events(articles, changed_clusters & current, existing_clusters)
 
     db.session.commit()
+    if not moved:
+        print(f" Stories unchanged for {len(articles)} articles.")
+        return
+    # Rebuild first so a reader who misses the cache after the bump sees the new lists.
+    rebuild_personalized_feeds()
+    bump_generation()
+    # Story membership changed; the trending run locks its cursor against the scheduled job.
+    compute_trending_scores()
+    publish_story_events(events)
     print(f" Successfully grouped {len(articles)} articles into {len(set(labels))} stories.")
\ No newline at end of file
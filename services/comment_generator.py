@@ -1,20 +1,14 @@
 import json
 from typing import Any, Dict
 
-from openai import OpenAI
-
-from services.ai_engine import client as ai_client
 from services.comment_prompts import build_messages
+from services.llm_client import LLMError, chat_completion, extract_json_object
 
 
 class CommentGenError(Exception):
     pass
 
 
-def _get_client() -> OpenAI:
-    return ai_client or OpenAI()
-
-
 def _validate_payload(data: Dict[str, Any]) -> None:
     if not isinstance(data, dict):
         raise CommentGenError("Model JSON must be an object.")
@@ -38,7 +32,6 @@ def generate_comment(
     fact_mode: str,
     model: str = "gpt-4o-mini",
 ) -> Dict[str, Any]:
-    client = _get_client()
     messages = build_messages(
         summary=summary,
         platform=platform,
@@ -49,18 +42,17 @@ def generate_comment(
     )
 
     try:
-        response = client.chat.completions.create(
+        content = chat_completion(
+            messages,
             model=model,
-            messages=messages,
             temperature=0.4,
             response_format={"type": "json_object"},
         )
-    except Exception as exc:
+    except LLMError as exc:
         raise CommentGenError(f"OpenAI request failed: {exc}") from exc
 
-    content = response.choices[0].message.content or ""
     try:
-        data = json.loads(content)
+        data = extract_json_object(content)
     except json.JSONDecodeError as exc:
         raise CommentGenError("Model did not return valid JSON.") from exc
 
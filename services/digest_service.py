@@ -1,7 +1,11 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 
-from models.models import Article, User, UserPreferences
-from services.email_service import send_email
+from sqlalchemy.orm import load_only
+
+from models.models import Article, User, UserPreferences, db
+from services.email_service import enqueue_emails
+from services.personalized_feed import preference_criteria, preference_signature
 
 
 def _current_digest_time():
@@ -9,7 +13,20 @@ def _current_digest_time():
 
 
 def _collect_story_digest(query, limit=10):
-    articles = query.order_by(Article.created_at.desc()).limit(200).all()
+    articles = (
+        query.options(
+            load_only(
+                Article.cluster_id,
+                Article.title,
+                Article.ai_summary,
+                Article.source_domain,
+                Article.created_at,
+            )
+        )
+        .order_by(Article.created_at.desc())
+        .limit(200)
+        .all()
+    )
     stories = {}
     for article in articles:
         cid = article.cluster_id
@@ -25,39 +42,59 @@ def _collect_story_digest(query, limit=10):
     return sorted_stories[:limit]
 
 
-def send_daily_digests():
-    now_time = _current_digest_time()
-    eligible_prefs = UserPreferences.query.filter_by(digest_enabled=True, digest_time=now_time).all()
-    if not eligible_prefs:
-        return
+def _render_digest(stories):
+    lines = ["Here is your daily news digest:\n"]
+    for story in stories:
+        sources = ", ".join(sorted(set(story["sources"])))
+        lines.append(f"- {story['title']}\n  {story['summary']}\n  Sources: {sources}\n")
+    return "\n".join(lines)
 
-    since = datetime.utcnow() - timedelta(hours=24)
 
-    for preferences in eligible_prefs:
-        user = User.query.get(preferences.user_id)
-        if not user:
-            continue
+def _digest_groups(now_time):
+    """Map preference signature -> (categories, sources, [emails]) for users due now.
+
+    Users and their preferences come back in a single joined query.
+    """
+    rows = (
+        UserPreferences.query.join(User, User.id == UserPreferences.user_id)
+        .filter(UserPreferences.digest_enabled.is_(True), UserPreferences.digest_time == now_time)
+        .with_entities(User.email, UserPreferences.preferred_categories, UserPreferences.preferred_sources)
+        .all()
+    )
+    groups = defaultdict(lambda: [None, None, []])
+    for email, categories, sources in rows:
+        group = groups[preference_signature(categories, sources)]
+        if group[0] is None:
+            group[0], group[1] = sorted(set(categories or [])), sorted(set(sources or []))
+        group[2].append(email)
+    return groups
 
-        query = Article.query.filter(
-            Article.cluster_id.isnot(None),
-            Article.created_at >= since,
-        )
-        if preferences.preferred_categories:
-            query = query.filter(Article.category.in_(preferences.preferred_categories))
-        if preferences.preferred_sources:
-            query = query.filter(Article.source_domain.in_(preferences.preferred_sources))
 
+def send_daily_digests():
+    """Query and render each distinct digest once, then queue it for every user who shares it.
+
+    Messages are keyed by day and recipient, so a rerun of the same slot queues nothing twice.
+    """
+    groups = _digest_groups(_current_digest_time())
+    if not groups:
+        return
+
+    now = datetime.utcnow()
+    since = now - timedelta(hours=24)
+    for categories, sources, emails in groups.values():
+        query = Article.query.filter(*preference_criteria(categories, sources), Article.created_at >= since)
         stories = _collect_story_digest(query)
         if not stories:
             continue
 
-        lines = ["Here is your daily news digest:\n"]
-        for story in stories:
-            sources = ", ".join(sorted(set(story["sources"])))
-            lines.append(f"- {story['title']}\n  {story['summary']}\n  Sources: {sources}\n")
-
-        send_email(
-            to_email=user.email,
-            subject="Your Daily News Digest",
-            body="\n".join(lines),
+        body = _render_digest(stories)
+        enqueue_emails(
+            {
+                "to_email": email,
+                "subject": "Your Daily News Digest",
+                "body": body,
+                "idempotency_key": f"digest:{now:%Y-%m-%d}:{email}",
+            }
+            for email in emails
         )
+        db.session.commit()
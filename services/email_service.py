@@ -1,6 +1,274 @@
+"""Email delivery through a transactional outbox.
+
+Callers enqueue messages with ``enqueue_email``/``enqueue_emails`` in the same
+transaction as the change that triggers them, so request threads never wait on
+the provider and a rolled-back request sends nothing. ``deliver_pending_emails``
+(a scheduler job) claims due rows in batches, sends them from a bounded pool of
+workers that each reuse one connection, and retries temporary failures with
+backoff. A message's idempotency key is stored once (enqueueing it again is a
+no-op) and sent as its Message-ID, so a retry after an ambiguous failure can be
+deduplicated by the provider.
+
+``send_email`` still delivers immediately; job alerts use it because they must
+not depend on the delivery job they may be reporting on.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import smtplib
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.models import EmailOutbox, db
+
+LOGGER = logging.getLogger(__name__)
+
+# "console" prints messages (development); "smtp" sends through SMTP_HOST.
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "console")
+EMAIL_FROM = os.getenv("EMAIL_FROM", "news@localhost")
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "200"))
+EMAIL_DELIVERY_WORKERS = int(os.getenv("EMAIL_DELIVERY_WORKERS", "4"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = 60
+EMAIL_RETRY_MAX_SECONDS = 6 * 60 * 60
+# A claimed row is retried after this long if its worker never reported back.
+EMAIL_SEND_LEASE_SECONDS = 10 * 60
+# The delivery job runs every minute; stop claiming new batches after this.
+EMAIL_DELIVERY_BUDGET_SECONDS = 45
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+OutgoingEmail = namedtuple("OutgoingEmail", ["id", "idempotency_key", "to_email", "subject", "body"])
+
+
+class _ConsoleConnection:
+    def send(self, message: EmailMessage) -> None:
+        print(f" Email to {message['To']}\nSubject: {message['Subject']}\n\n{message.get_content()}")
+
+    def close(self) -> None:
+        pass
+
+
+class _SMTPConnection:
+    def __init__(self):
+        self.smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        if SMTP_STARTTLS:
+            self.smtp.starttls()
+        if SMTP_USERNAME:
+            self.smtp.login(SMTP_USERNAME, SMTP_PASSWORD or "")
+
+    def send(self, message: EmailMessage) -> None:
+        self.smtp.send_message(message)
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+def _open_connection():
+    return _SMTPConnection() if EMAIL_BACKEND == "smtp" else _ConsoleConnection()
+
+
+def _build_message(to_email: str, subject: str, body: str, idempotency_key: Optional[str] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = EMAIL_FROM
+    message["To"] = to_email
+    message["Subject"] = subject
+    if idempotency_key:
+        digest = hashlib.sha256(idempotency_key.encode("utf-8")).hexdigest()[:32]
+        message["Message-ID"] = f"<{digest}@{EMAIL_FROM.rpartition('@')[2] or 'localhost'}>"
+    message.set_content(body)
+    return message
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """5xx SMTP replies will fail the same way again; everything else is worth a retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
 def send_email(to_email: str, subject: str, body: str) -> None:
+    """Deliver one email now, bypassing the outbox."""
+    connection = _open_connection()
+    try:
+        connection.send(_build_message(to_email, subject, body))
+    finally:
+        connection.close()
+
+
+def _insert_ignoring_duplicates():
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(EmailOutbox).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    if dialect == "sqlite":
+        return sqlite.insert(EmailOutbox).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    return None
+
+
+def enqueue_emails(messages: Iterable[Dict]) -> int:
+    """Queue ``{"to_email", "subject", "body"[, "idempotency_key"]}`` dicts; the caller commits.
+
+    Messages without a key get a random one. Keys already queued (or sent) are
+    skipped; returns how many rows were added.
     """
-    Placeholder for email delivery.
-    Replace with real provider integration (SendGrid, SES, Mailgun).
-    """
-    print(f" Email to {to_email}\nSubject: {subject}\n\n{body}")
+    rows = {}
+    for message in messages:
+        key = message.get("idempotency_key") or uuid.uuid4().hex
+        rows.setdefault(key, {
+            "idempotency_key": key,
+            "to_email": message["to_email"],
+            "subject": message["subject"],
+            "body": message["body"],
+        })
+    if not rows:
+        return 0
+    statement = _insert_ignoring_duplicates()
+    if statement is None:
+        # Other databases: skip known keys, then a plain insert.
+        known = {key for (key,) in db.session.query(EmailOutbox.idempotency_key)
+                 .filter(EmailOutbox.idempotency_key.in_(list(rows)))}
+        rows = [row for key, row in rows.items() if key not in known]
+        if rows:
+            db.session.execute(insert(EmailOutbox), rows)
+        return len(rows)
+    return len(db.session.execute(statement.returning(EmailOutbox.id), list(rows.values())).all())
+
+
+def enqueue_email(to_email: str, subject: str, body: str, idempotency_key: Optional[str] = None) -> bool:
+    """Queue one email; the caller commits. Returns False if the key was already queued."""
+    message = {"to_email": to_email, "subject": subject, "body": body, "idempotency_key": idempotency_key}
+    return enqueue_emails([message]) == 1
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = min(EMAIL_RETRY_MAX_SECONDS, EMAIL_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def _claim_batch(limit: int, now: datetime) -> List[Tuple[OutgoingEmail, int]]:
+    """Lease up to ``limit`` due messages to this worker; returns (message, attempts so far)."""
+    rows = (
+        db.session.query(
+            EmailOutbox.id,
+            EmailOutbox.idempotency_key,
+            EmailOutbox.to_email,
+            EmailOutbox.subject,
+            EmailOutbox.body,
+            EmailOutbox.attempts,
+        )
+        .filter(EmailOutbox.status.in_([PENDING, SENDING]), EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if rows:
+        EmailOutbox.query.filter(EmailOutbox.id.in_([row.id for row in rows])).update(
+            {
+                EmailOutbox.status: SENDING,
+                EmailOutbox.next_attempt_at: now + timedelta(seconds=EMAIL_SEND_LEASE_SECONDS),
+            },
+            synchronize_session=False,
+        )
+    db.session.commit()
+    return [(OutgoingEmail(*row[:5]), row.attempts) for row in rows]
+
+
+def _send_over_connection(messages: List[OutgoingEmail]) -> List[Tuple[int, Optional[Exception]]]:
+    """Send messages in order over one connection, reconnecting after transport errors."""
+    results = []
+    connection = None
+    try:
+        for message in messages:
+            try:
+                if connection is None:
+                    connection = _open_connection()
+                connection.send(_build_message(
+                    message.to_email, message.subject, message.body, message.idempotency_key
+                ))
+                results.append((message.id, None))
+            except (smtplib.SMTPException, OSError) as exc:
+                results.append((message.id, exc))
+                if not isinstance(exc, smtplib.SMTPResponseException) or exc.smtp_code == 421:
+                    if connection is not None:
+                        connection.close()
+                    connection = None
+    finally:
+        if connection is not None:
+            connection.close()
+    return results
+
+
+def _record_results(claimed: List[Tuple[OutgoingEmail, int]], results, now: datetime) -> Tuple[int, int]:
+    attempts_by_id = {message.id: attempts for message, attempts in claimed}
+    sent_ids = [message_id for message_id, error in results if error is None]
+    changes = []
+    for message_id, error in results:
+        if error is None:
+            continue
+        attempts = attempts_by_id[message_id] + 1
+        give_up = _is_permanent(error) or attempts >= EMAIL_MAX_ATTEMPTS
+        LOGGER.warning("Email %s failed (attempt %s): %s", message_id, attempts, error)
+        changes.append({
+            "id": message_id,
+            "status": FAILED if give_up else PENDING,
+            "attempts": attempts,
+            "next_attempt_at": now if give_up else now + retry_delay(attempts),
+            "last_error": str(error)[:1000],
+        })
+    if sent_ids:
+        EmailOutbox.query.filter(EmailOutbox.id.in_(sent_ids)).update(
+            {EmailOutbox.status: SENT, EmailOutbox.sent_at: now, EmailOutbox.last_error: None},
+            synchronize_session=False,
+        )
+    if changes:
+        db.session.execute(update(EmailOutbox), changes)
+    db.session.commit()
+    return len(sent_ids), len(changes)
+
+
+def deliver_pending_emails(batch_size: int = EMAIL_BATCH_SIZE, workers: int = EMAIL_DELIVERY_WORKERS) -> int:
+    """Send due outbox messages until none are left or the time budget is spent; returns sent count."""
+    started = time.monotonic()
+    total_sent = total_failed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email") as pool:
+        while time.monotonic() - started < EMAIL_DELIVERY_BUDGET_SECONDS:
+            claimed = _claim_batch(batch_size, datetime.utcnow())
+            if not claimed:
+                break
+            # One connection per worker, each taking every n-th message.
+            chunks = [[m for m, _ in claimed[i::workers]] for i in range(min(workers, len(claimed)))]
+            results = [result for chunk in pool.map(_send_over_connection, chunks) for result in chunk]
+            sent, failed = _record_results(claimed, results, datetime.utcnow())
+            total_sent += sent
+            total_failed += failed
+            if len(claimed) < batch_size:
+                break
+    if total_sent or total_failed:
+        print(f"Delivered {total_sent} emails ({total_failed} failed).")
+    return total_sent
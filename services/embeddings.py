@@ -0,0 +1,79 @@
+"""Sentence embeddings for articles, computed once and kept in ArticleEmbedding.
+
+Clustering encodes only articles without a stored embedding for the current
+model; related stories and semantic search reuse the stored vectors. The model
+is loaded on first use, so processes that never encode text never load it.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from models.models import ArticleEmbedding, db
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+
+@lru_cache
+def get_model():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def article_text(article) -> str:
+    # Title + summary gives the best context.
+    return f"{article.title}. {article.ai_summary}"
+
+
+def embed_texts(texts: Sequence[str]) -> np.ndarray:
+    """Return an (n, dim) float32 array of L2-normalized embeddings."""
+    vectors = get_model().encode(list(texts), normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.float32)
+
+
+def load_embeddings(article_ids: Iterable[int]) -> Dict[int, np.ndarray]:
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+    rows = db.session.query(ArticleEmbedding.article_id, ArticleEmbedding.vector).filter(
+        ArticleEmbedding.article_id.in_(article_ids),
+        ArticleEmbedding.model == EMBEDDING_MODEL,
+    )
+    return {article_id: from_bytes(vector) for article_id, vector in rows}
+
+
+def store_embeddings(article_ids: List[int], vectors: np.ndarray) -> None:
+    """Replace the stored embeddings of ``article_ids``; the caller commits."""
+    if not article_ids:
+        return
+    ArticleEmbedding.query.filter(ArticleEmbedding.article_id.in_(article_ids)) \
+        .delete(synchronize_session=False)
+    db.session.execute(
+        ArticleEmbedding.__table__.insert(),
+        [
+            {"article_id": article_id, "model": EMBEDDING_MODEL, "vector": to_bytes(vector)}
+            for article_id, vector in zip(article_ids, vectors)
+        ],
+    )
+
+
+def embeddings_for(articles: Sequence) -> np.ndarray:
+    """Return embeddings for ``articles`` in order, encoding and storing only missing ones."""
+    stored = load_embeddings(a.id for a in articles)
+    missing = [a for a in articles if a.id not in stored]
+    if missing:
+        vectors = embed_texts([article_text(a) for a in missing])
+        store_embeddings([a.id for a in missing], vectors)
+        stored.update(zip((a.id for a in missing), vectors))
+    return np.vstack([stored[a.id] for a in articles])
@@ -1,25 +1,14 @@
 import json
-import re
 from typing import Any, Dict, Optional
 
-from services.ai_engine import client
 from services.joke_prompts import build_joke_messages
+from services.llm_client import LLMError, chat_completion, extract_json_object
 
 
 class JokeGenError(Exception):
     pass
 
 
-def _extract_json_object(text: str) -> Dict[str, Any]:
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            raise
-        return json.loads(match.group(0))
-
-
 def _validate_payload(data: Dict[str, Any]) -> None:
     if not isinstance(data, dict):
         raise JokeGenError("Model JSON must be an object.")
@@ -55,9 +44,6 @@ def generate_joke(
     fact_mode: bool,
     model: Optional[str] = "gpt-4o-mini",
 ) -> Dict[str, Any]:
-    if client is None:
-        raise JokeGenError("OpenAI client not configured.")
-
     resolved_model = model or "gpt-4o-mini"
     messages = build_joke_messages(
         summary=summary,
@@ -69,18 +55,17 @@ def generate_joke(
     )
 
     try:
-        response = client.chat.completions.create(
+        content = chat_completion(
+            messages,
             model=resolved_model,
-            messages=messages,
             temperature=0.4,
             response_format={"type": "json_object"},
         )
-    except Exception as exc:
+    except LLMError as exc:
         raise JokeGenError(f"OpenAI request failed: {exc}") from exc
 
-    content = response.choices[0].message.content or ""
     try:
-        data = _extract_json_object(content)
+        data = extract_json_object(content)
     except json.JSONDecodeError as exc:
         raise JokeGenError("Model did not return valid JSON.") from exc
 
@@ -0,0 +1,225 @@
+"""Shared OpenAI client with a pooled transport, deadlines, retries and a circuit breaker."""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import openai
+from openai import OpenAI
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "45"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+LLM_CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMNotConfiguredError(LLMError):
+    pass
+
+
+class LLMUnavailableError(LLMError):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after consecutive provider failures and lets one trial call through after a cooldown."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_seconds:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        """Let another trial through after a call that did not reach the provider."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+breaker = CircuitBreaker(LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS)
+
+
+def _build_http_client() -> httpx.Client:
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def get_client() -> OpenAI:
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise LLMNotConfiguredError("OpenAI client not configured.")
+            # Retries are handled here so they share the per-call deadline and the breaker.
+            _client = OpenAI(
+                api_key=api_key,
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                http_client=_build_http_client(),
+                max_retries=0,
+            )
+    return _client
+
+
+def reset_client() -> None:
+    """Drop the pooled client (e.g. after changing OPENAI_* settings) and close the breaker."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+    breaker.reset()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, openai.APIConnectionError):
+        return True
+    return getattr(exc, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_RETRY_MAX_SECONDS)
+        except ValueError:
+            pass
+    # Full jitter keeps a fleet of workers from retrying in lockstep.
+    return random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * (2 ** attempt)))
+
+
+def chat_completion(
+    messages: List[Dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    **params: Any,
+) -> str:
+    """Run a chat completion and return the message content.
+
+    Retries 429/5xx/connection errors with jittered backoff until ``deadline_seconds``
+    elapses, and fails fast with LLMUnavailableError while the circuit breaker is open.
+    """
+    client = get_client()
+    deadline = time.monotonic() + (deadline_seconds or LLM_DEADLINE_SECONDS)
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMError("OpenAI request exceeded its deadline.")
+        if not breaker.allow():
+            raise LLMUnavailableError("OpenAI is unavailable (circuit open); try again shortly.")
+
+        try:
+            response = client.chat.completions.create(
+                model=model or DEFAULT_MODEL,
+                messages=messages,
+                timeout=min(LLM_TIMEOUT_SECONDS, remaining),
+                **params,
+            )
+        except Exception as exc:
+            if not _is_retryable(exc):
+                if isinstance(exc, openai.APIStatusError) and 400 <= exc.status_code < 500:
+                    # The provider answered, so it is healthy; the request itself was bad.
+                    breaker.record_success()
+                    raise LLMError(str(exc)) from exc
+                # Says nothing about the provider's health (e.g. a bug building the request).
+                breaker.abandon_trial()
+                raise
+
+            breaker.record_failure()
+            if attempt >= LLM_MAX_RETRIES:
+                raise LLMError(str(exc)) from exc
+            delay = _retry_delay(attempt, exc)
+            if time.monotonic() + delay >= deadline:
+                raise LLMError(str(exc)) from exc
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return response.choices[0].message.content or ""
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """Parse model output as JSON, falling back to the outermost {...} block.
+
+    Raises json.JSONDecodeError when no JSON object can be recovered.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        if not match:
+            raise
+        return json.loads(match.group(0))
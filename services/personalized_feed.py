@@ -0,0 +1,178 @@
+"""Materialized personalized feeds in Redis, shared per preference signature.
+
+Users with the same preferred categories/sources share one signature and one
+sorted set of story leads (member ``"<cluster_id>|<article_id>|<iso time>"``,
+score = lead time). A clustering run that moves articles can change a story's
+lead, and so both its member and its score, or remove the story; the lists are
+rebuilt after such a run rather than patched. A signature that nobody has read
+for ``SIGNATURE_IDLE_DAYS`` is dropped. Reads page through the set and hydrate
+stories in one batch; anything the set cannot answer (no Redis, no list yet, or
+paging past its cap) falls back to the database.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import redis
+
+from models.models import Article
+from services.story_feed import STORY_CURSOR_KIND, load_stories, story_leads
+from utils.pagination import Position, decode_cursor, page_cursors, parse_direction
+from utils.redis_client import get_redis_client
+
+LOGGER = logging.getLogger(__name__)
+
+SIGNATURES_KEY = "feed:signatures"
+SIGNATURE_PREFS_KEY = "feed:signature:{signature}:prefs"
+SIGNATURE_FEED_KEY = "feed:signature:{signature}:stories"
+MATERIALIZED_FEED_LIMIT = int(os.getenv("MATERIALIZED_FEED_LIMIT", "500"))
+SIGNATURE_IDLE_DAYS = 7
+_EPOCH = datetime(1970, 1, 1)
+
+
+def preference_signature(categories: Optional[Sequence[str]], sources: Optional[Sequence[str]]) -> str:
+    """Stable id for a set of feed preferences; order and duplicates do not matter."""
+    payload = json.dumps(
+        {"categories": sorted(set(categories or [])), "sources": sorted(set(sources or []))},
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def preference_criteria(categories: Optional[Sequence[str]], sources: Optional[Sequence[str]]) -> List:
+    criteria = [Article.cluster_id.isnot(None)]
+    if categories:
+        criteria.append(Article.category.in_(categories))
+    if sources:
+        criteria.append(Article.source_domain.in_(sources))
+    return criteria
+
+
+def _score(created_at: datetime) -> float:
+    return (created_at - _EPOCH).total_seconds()
+
+
+def _member(cluster_id: int, position: Position) -> str:
+    created_at, article_id = position
+    return f"{cluster_id}|{article_id}|{created_at.isoformat()}"
+
+
+def _parse_member(member: str) -> Tuple[int, Position]:
+    cluster_id, article_id, created_at = member.split("|", 2)
+    return int(cluster_id), (datetime.fromisoformat(created_at), int(article_id))
+
+
+def materialize_signature(redis_client, signature: str, categories, sources) -> None:
+    """Replace the signature's list with the newest story leads from the database."""
+    leads, _ = story_leads(preference_criteria(categories, sources), MATERIALIZED_FEED_LIMIT)
+    key = SIGNATURE_FEED_KEY.format(signature=signature)
+    staging = f"{key}:building"
+    pipe = redis_client.pipeline()
+    pipe.delete(staging)
+    if leads:
+        pipe.zadd(staging, {_member(cid, position): _score(position[0]) for cid, position in leads})
+        pipe.rename(staging, key)
+    else:
+        # An empty list is still an answer; an empty sorted set would not exist.
+        pipe.delete(key)
+        pipe.zadd(key, {"": 0})
+    pipe.execute()
+
+
+def rebuild_personalized_feeds() -> None:
+    """Rebuild every recently read signature's list; run after clustering commits."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    try:
+        idle_before = time.time() - SIGNATURE_IDLE_DAYS * 86400
+        for signature in redis_client.zrangebyscore(SIGNATURES_KEY, "-inf", idle_before):
+            redis_client.delete(
+                SIGNATURE_FEED_KEY.format(signature=signature),
+                SIGNATURE_PREFS_KEY.format(signature=signature),
+            )
+        redis_client.zremrangebyscore(SIGNATURES_KEY, "-inf", idle_before)
+
+        signatures = redis_client.zrange(SIGNATURES_KEY, 0, -1)
+        for signature in signatures:
+            prefs = redis_client.get(SIGNATURE_PREFS_KEY.format(signature=signature))
+            if prefs is None:
+                continue
+            prefs = json.loads(prefs)
+            materialize_signature(redis_client, signature, prefs["categories"], prefs["sources"])
+        print(f"Rebuilt {len(signatures)} personalized feeds.")
+    except redis.RedisError:
+        LOGGER.exception("Could not rebuild personalized feeds; readers will fall back to the database.")
+
+
+def _read_leads(redis_client, key: str, limit: int, position: Optional[Position], newer: bool):
+    """Return up to limit + 1 leads past ``position``, nearest first."""
+    # Fetch a little extra so leads sharing the cursor's score are not cut off.
+    count = limit + 11
+    if newer:
+        low = _score(position[0]) if position else "-inf"
+        members = redis_client.zrangebyscore(key, low, "+inf", start=0, num=count)
+    else:
+        high = _score(position[0]) if position else "+inf"
+        members = redis_client.zrevrangebyscore(key, high, "-inf", start=0, num=count)
+    leads = [_parse_member(m) for m in members if m]
+    leads.sort(key=lambda lead: lead[1], reverse=not newer)
+    if position is not None:
+        leads = [lead for lead in leads if (lead[1] > position if newer else lead[1] < position)]
+    return leads[: limit + 1]
+
+
+def materialized_page(categories, sources, limit: int, cursor: Optional[str],
+                      direction: Optional[str]) -> Optional[Dict]:
+    """Return a personalized page shaped like story_feed.paginate_stories, or None.
+
+    None means the caller should serve the page from the database.
+    Raises utils.pagination.InvalidCursor for malformed cursors or directions.
+    """
+    position = decode_cursor(cursor, STORY_CURSOR_KIND)
+    direction = parse_direction(direction)
+    if position is None:
+        direction = "next"
+    redis_client = get_redis_client()
+    if not redis_client:
+        return None
+
+    signature = preference_signature(categories, sources)
+    key = SIGNATURE_FEED_KEY.format(signature=signature)
+    try:
+        redis_client.zadd(SIGNATURES_KEY, {signature: time.time()})
+        if not redis_client.exists(key):
+            redis_client.set(
+                SIGNATURE_PREFS_KEY.format(signature=signature),
+                json.dumps({"categories": sorted(set(categories or [])), "sources": sorted(set(sources or []))}),
+            )
+            materialize_signature(redis_client, signature, categories, sources)
+        leads = _read_leads(redis_client, key, limit, position, newer=direction == "prev")
+        capped = redis_client.zcard(key) >= MATERIALIZED_FEED_LIMIT
+    except redis.RedisError:
+        LOGGER.warning("Materialized feed unavailable; serving from the database.", exc_info=True)
+        return None
+
+    has_more = len(leads) > limit
+    if direction == "next" and not has_more and capped:
+        # The list holds only the newest stories; older pages come from the database.
+        return None
+    leads = leads[:limit]
+    if direction == "prev":
+        leads.reverse()
+
+    stories = load_stories(preference_criteria(categories, sources), [cid for cid, _ in leads])
+    next_cursor, prev_cursor = page_cursors(
+        STORY_CURSOR_KIND,
+        leads[0][1] if leads else None,
+        leads[-1][1] if leads else None,
+        has_more,
+        direction,
+        had_cursor=position is not None,
+    )
+    return {"stories": stories, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
@@ -0,0 +1,210 @@
+"""Cached user principals for token_required.
+
+Authenticated requests only need a user's id, email, role, active flag and
+password timestamp. Those are cached per process (``LOCAL_TTL_SECONDS``) and in
+Redis (``REDIS_TTL_SECONDS``), so most requests do not touch the user table.
+Committed changes to those fields drop both cache entries; other processes'
+local copies expire within the short local TTL. New tokens carry ``role`` and
+``pwd_at`` claims. A token whose ``pwd_at`` is newer than the cached principal
+proves the cache is stale, so the principal is reloaded. Claims never grant
+anything on their own; the role always comes from the principal.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+import redis
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, load_only
+
+from models.models import User
+from utils.redis_client import get_redis_client, read_counter
+
+LOGGER = logging.getLogger(__name__)
+
+PRINCIPAL_KEY = "auth:principal:{user_id}"
+TOKEN_GENERATION_KEY = "auth:token_generation:{user_id}"
+LOCAL_TTL_SECONDS = int(os.getenv("PRINCIPAL_LOCAL_TTL_SECONDS", "15"))
+REDIS_TTL_SECONDS = int(os.getenv("PRINCIPAL_REDIS_TTL_SECONDS", "300"))
+LOCAL_MAX_ENTRIES = 10_000
+_PRINCIPAL_FIELDS = ("email", "role", "is_active", "password_changed_at")
+_PENDING_INVALIDATIONS = "principals_to_invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    role: str
+    is_active: bool
+    # Seconds since the epoch, matching the ``pwd_at`` token claim.
+    password_changed_at: Optional[float] = None
+
+
+_local_lock = threading.Lock()
+
+
+def _local_cache() -> "OrderedDict[int, tuple]":
+    # Kept per app, so an app recreated against another database starts empty.
+    return current_app.extensions.setdefault("principal_cache", OrderedDict())
+
+
+def password_timestamp(changed_at: Optional[datetime]) -> Optional[float]:
+    return round((changed_at - datetime(1970, 1, 1)).total_seconds(), 3) if changed_at else None
+
+
+def token_claims(user: User) -> dict:
+    """Extra claims for newly issued tokens; see the module docstring."""
+    return {"role": user.role, "pwd_at": password_timestamp(user.password_changed_at)}
+
+
+def _from_user(user: User) -> Principal:
+    return Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        is_active=bool(user.is_active),
+        password_changed_at=password_timestamp(user.password_changed_at),
+    )
+
+
+def _local_get(user_id: int) -> Optional[Principal]:
+    with _local_lock:
+        cache = _local_cache()
+        entry = cache.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del cache[user_id]
+            return None
+        cache.move_to_end(user_id)
+        return principal
+
+
+def _local_put(principal: Principal) -> None:
+    with _local_lock:
+        cache = _local_cache()
+        cache[principal.id] = (time.monotonic() + LOCAL_TTL_SECONDS, principal)
+        cache.move_to_end(principal.id)
+        while len(cache) > LOCAL_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _redis_get(user_id: int) -> Optional[Principal]:
+    redis_client = get_redis_client()
+    if not redis_client:
+        return None
+    try:
+        cached = redis_client.get(PRINCIPAL_KEY.format(user_id=user_id))
+    except redis.RedisError:
+        LOGGER.warning("Principal cache unavailable; reading users from the database.", exc_info=True)
+        return None
+    return Principal(**json.loads(cached)) if cached else None
+
+
+def _redis_put(principal: Principal) -> None:
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    try:
+        redis_client.set(
+            PRINCIPAL_KEY.format(user_id=principal.id), json.dumps(asdict(principal)), ex=REDIS_TTL_SECONDS
+        )
+    except redis.RedisError:
+        LOGGER.warning("Could not cache principal %s.", principal.id, exc_info=True)
+
+
+def _is_stale(principal: Principal, claims: dict) -> bool:
+    issued_pwd_at = claims.get("pwd_at")
+    return issued_pwd_at is not None and (principal.password_changed_at or 0) < issued_pwd_at
+
+
+def load_principal(user_id: int, claims: Optional[dict] = None) -> Optional[Principal]:
+    """Return the principal for ``user_id`` (None if the user does not exist)."""
+    claims = claims or {}
+    for lookup in (_local_get, _redis_get):
+        principal = lookup(user_id)
+        if principal is not None and not _is_stale(principal, claims):
+            if lookup is _redis_get:
+                _local_put(principal)
+            return principal
+
+    user = User.query.options(load_only(User.id, *(getattr(User, f) for f in _PRINCIPAL_FIELDS))) \
+        .filter_by(id=user_id).first()
+    if user is None:
+        return None
+    principal = _from_user(user)
+    _local_put(principal)
+    _redis_put(principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    with _local_lock:
+        _local_cache().pop(user_id, None)
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    try:
+        redis_client.delete(PRINCIPAL_KEY.format(user_id=user_id))
+    except redis.RedisError:
+        LOGGER.warning("Could not invalidate principal %s; it expires in %ss.", user_id, REDIS_TTL_SECONDS)
+
+
+def token_generation(user_id: int) -> Optional[int]:
+    """Current access-token generation for ``user_id``; None when Redis cannot answer.
+
+    Access tokens carry the generation they were issued under and are revoked
+    once it moves on. A missing key is seeded from the clock, so tokens issued
+    before Redis lost it are revoked rather than silently revived.
+    """
+    redis_client = get_redis_client()
+    if not redis_client:
+        return None
+    try:
+        return read_counter(redis_client, TOKEN_GENERATION_KEY.format(user_id=user_id))
+    except redis.RedisError:
+        LOGGER.warning("Token generation unavailable for user %s.", user_id, exc_info=True)
+        return None
+
+
+def revoke_access_tokens(user_id: int) -> None:
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    key = TOKEN_GENERATION_KEY.format(user_id=user_id)
+    try:
+        read_counter(redis_client, key)
+        redis_client.incr(key)
+    except redis.RedisError:
+        LOGGER.exception("Could not revoke access tokens for user %s.", user_id)
+
+
+@event.listens_for(User, "after_update")
+def _queue_invalidation(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _PRINCIPAL_FIELDS):
+        state.session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    # Invalidate only after commit, so a concurrent request cannot re-cache the old row.
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_principal(user_id)
+        # Access tokens embed these fields, so outstanding ones must be refreshed.
+        revoke_access_tokens(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_invalidations(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
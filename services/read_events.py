@@ -0,0 +1,207 @@
+"""Write-behind buffering of read events (READ_EVENTS_WRITE_BEHIND=true).
+
+With write-behind on, the read endpoints validate ids, record them in the
+user's read bitmap (so "hide read" filtering sees them at once) and append an
+event instead of writing ReadArticle. Events go to a Redis stream that the
+worker's ``flush_read_events`` job drains into ReadArticle in large batches.
+Unreads are appended to the same stream, so the flush applies each user's
+reads and unreads in the order they happened. Without Redis, events wait in
+an in-process buffer that a daemon thread in the same process flushes, and
+read-state lookups include the pending ids.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+import redis
+from sqlalchemy import tuple_
+
+from models.models import ReadArticle, db
+from services import change_log
+from services.read_state import mark_read, mark_unread
+from services.user_articles import insert_pairs
+from utils.redis_client import get_redis_client
+
+LOGGER = logging.getLogger(__name__)
+
+READ_EVENTS_STREAM = "read:events"
+READ_EVENTS_STREAM_MAXLEN = 1_000_000
+FLUSH_BATCH_SIZE = int(os.getenv("READ_EVENTS_FLUSH_BATCH", "5000"))
+LOCAL_FLUSH_INTERVAL_SECONDS = 2.0
+READ_OP = "read"
+UNREAD_OP = "unread"
+
+_LOCAL_LOCK = threading.Lock()
+# Held while buffered reads are written, so discarding them cannot race a flush.
+_LOCAL_FLUSH_LOCK = threading.Lock()
+_LOCAL_PENDING: Dict[int, Set[int]] = defaultdict(set)
+_LOCAL_FLUSHER = None
+
+
+def write_behind_enabled() -> bool:
+    return os.getenv("READ_EVENTS_WRITE_BEHIND", "false").lower() == "true"
+
+
+def pending_article_ids(user_id: int) -> Set[int]:
+    """Ids buffered in this process and not yet written (local buffer only)."""
+    with _LOCAL_LOCK:
+        return set(_LOCAL_PENDING.get(user_id, ()))
+
+
+def enqueue_read_events(user_id: int, article_ids: List[int]) -> None:
+    """Accept read events for later persistence; ids must already be validated."""
+    if not article_ids:
+        return
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            mark_read(user_id, article_ids, build=True)
+            redis_client.xadd(
+                READ_EVENTS_STREAM,
+                {"user_id": user_id, "article_ids": ",".join(str(aid) for aid in article_ids)},
+                maxlen=READ_EVENTS_STREAM_MAXLEN,
+                approximate=True,
+            )
+            return
+        except redis.RedisError:
+            LOGGER.warning("Read event stream unavailable; buffering in process.", exc_info=True)
+    with _LOCAL_LOCK:
+        _LOCAL_PENDING[user_id].update(article_ids)
+    _ensure_local_flusher()
+
+
+def enqueue_unread_event(user_id: int, article_id: int) -> bool:
+    """Queue an unread behind the user's streamed reads; False if Redis is unavailable."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return False
+    try:
+        redis_client.xadd(
+            READ_EVENTS_STREAM,
+            {"user_id": user_id, "article_ids": str(article_id), "op": UNREAD_OP},
+            maxlen=READ_EVENTS_STREAM_MAXLEN,
+            approximate=True,
+        )
+    except redis.RedisError:
+        LOGGER.warning("Read event stream unavailable; unreading directly.", exc_info=True)
+        return False
+    mark_unread(user_id, [article_id])
+    return True
+
+
+def discard_buffered_reads(user_id: int, article_ids: Iterable[int]) -> Set[int]:
+    """Drop reads still buffered in this process; returns the ids that were dropped."""
+    with _LOCAL_FLUSH_LOCK, _LOCAL_LOCK:
+        pending = _LOCAL_PENDING.get(user_id)
+        if not pending:
+            return set()
+        dropped = pending & set(article_ids)
+        pending -= dropped
+        if not pending:
+            del _LOCAL_PENDING[user_id]
+        return dropped
+
+
+def _write(pairs: List[Tuple[int, int]]) -> int:
+    inserted = insert_pairs(ReadArticle, change_log.READ, pairs)
+    db.session.commit()
+    return len(inserted)
+
+
+def _apply(entries) -> int:
+    """Apply a batch of stream entries; the last event per (user, article) wins."""
+    final: Dict[Tuple[int, int], str] = {}
+    for _, fields in entries:
+        op = fields.get("op", READ_OP)
+        for aid in fields["article_ids"].split(","):
+            if aid:
+                pair = (int(fields["user_id"]), int(aid))
+                final.pop(pair, None)
+                final[pair] = op
+    reads = [pair for pair, op in final.items() if op == READ_OP]
+    unreads = [pair for pair, op in final.items() if op == UNREAD_OP]
+    if unreads:
+        key = tuple_(ReadArticle.user_id, ReadArticle.article_id)
+        existing = list(db.session.query(ReadArticle.user_id, ReadArticle.article_id).filter(key.in_(unreads)))
+        if existing:
+            ReadArticle.query.filter(key.in_(existing)).delete(synchronize_session=False)
+            by_user = defaultdict(list)
+            for user_id, aid in existing:
+                by_user[user_id].append(aid)
+            for user_id, article_ids in by_user.items():
+                change_log.record_changes(change_log.READ, article_ids, change_log.REMOVED, user_id=user_id)
+    inserted = insert_pairs(ReadArticle, change_log.READ, reads)
+    db.session.commit()
+    return len(inserted)
+
+
+def flush_read_events() -> None:
+    """Drain the Redis stream into ReadArticle; scheduled on the worker under ``locks:read_events``."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    total = 0
+    while True:
+        entries = redis_client.xrange(READ_EVENTS_STREAM, "-", "+", count=FLUSH_BATCH_SIZE)
+        if not entries:
+            break
+        # Writes ignore duplicates and deletes of missing rows, so a crash
+        # before XDEL only replays the batch.
+        total += _apply(entries)
+        redis_client.xdel(READ_EVENTS_STREAM, *[entry_id for entry_id, _ in entries])
+        if len(entries) < FLUSH_BATCH_SIZE:
+            break
+    print(f"Flushed {total} read events.")
+
+
+def flush_local_buffer() -> int:
+    with _LOCAL_FLUSH_LOCK:
+        with _LOCAL_LOCK:
+            pending = {user_id: set(ids) for user_id, ids in _LOCAL_PENDING.items() if ids}
+        pairs = [(user_id, aid) for user_id, ids in pending.items() for aid in ids]
+        if not pairs:
+            return 0
+        written = _write(pairs)
+        with _LOCAL_LOCK:
+            for user_id, ids in pending.items():
+                remaining = _LOCAL_PENDING.get(user_id)
+                if remaining is None:
+                    continue
+                remaining -= ids
+                if not remaining:
+                    del _LOCAL_PENDING[user_id]
+        return written
+
+
+def _ensure_local_flusher() -> None:
+    global _LOCAL_FLUSHER
+    from flask import current_app
+
+    with _LOCAL_LOCK:
+        if _LOCAL_FLUSHER is not None and _LOCAL_FLUSHER.is_alive():
+            return
+        app = current_app._get_current_object()
+
+        def run():
+            while True:
+                time.sleep(LOCAL_FLUSH_INTERVAL_SECONDS)
+                with app.app_context():
+                    try:
+                        flush_local_buffer()
+                    except Exception:
+                        db.session.rollback()
+                        LOGGER.exception("Could not flush buffered read events; will retry.")
+
+        _LOCAL_FLUSHER = threading.Thread(target=run, name="read-events-flusher", daemon=True)
+        _LOCAL_FLUSHER.start()
+
+        def flush_at_exit():
+            with app.app_context():
+                flush_local_buffer()
+
+        atexit.register(flush_at_exit)
@@ -0,0 +1,110 @@
+"""Per-user read sets for server-side "hide read" filtering.
+
+Each user's read articles are mirrored in a Redis bitmap (bit N = article N),
+rebuilt from ReadArticle on first use. Bit 0 is a sentinel meaning "built", so
+a missing or expired key is never mistaken for "nothing read". Lookups cost one
+pipelined GETBIT per article on the page. Without Redis, one IN query per page
+against ReadArticle does the same job.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Set
+
+import redis
+
+from models.models import ReadArticle, db
+from utils.redis_client import get_redis_client
+
+LOGGER = logging.getLogger(__name__)
+
+READ_BITMAP_KEY = "read:bitmap:{user_id}"
+READ_BITMAP_TTL_SECONDS = 7 * 24 * 3600
+_BUILT_SENTINEL = 0
+
+
+def _ensure_bitmap(redis_client, user_id: int) -> str:
+    key = READ_BITMAP_KEY.format(user_id=user_id)
+    if redis_client.getbit(key, _BUILT_SENTINEL):
+        redis_client.expire(key, READ_BITMAP_TTL_SECONDS)
+        return key
+    article_ids = [aid for (aid,) in db.session.query(ReadArticle.article_id).filter_by(user_id=user_id)]
+    pipe = redis_client.pipeline()
+    for article_id in article_ids:
+        pipe.setbit(key, article_id, 1)
+    pipe.setbit(key, _BUILT_SENTINEL, 1)
+    pipe.expire(key, READ_BITMAP_TTL_SECONDS)
+    pipe.execute()
+    return key
+
+
+def read_article_ids(user_id: int, article_ids: Iterable[int]) -> Set[int]:
+    """Return the subset of ``article_ids`` the user has read."""
+    article_ids = list(dict.fromkeys(article_ids))
+    if not article_ids:
+        return set()
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            key = _ensure_bitmap(redis_client, user_id)
+            pipe = redis_client.pipeline()
+            for article_id in article_ids:
+                pipe.getbit(key, article_id)
+            return {aid for aid, bit in zip(article_ids, pipe.execute()) if bit}
+        except redis.RedisError:
+            LOGGER.warning("Read bitmap unavailable for user %s; using the database.", user_id, exc_info=True)
+    from services.read_events import pending_article_ids
+
+    read = {
+        aid
+        for (aid,) in db.session.query(ReadArticle.article_id).filter(
+            ReadArticle.user_id == user_id, ReadArticle.article_id.in_(article_ids)
+        )
+    }
+    # Write-behind reads buffered in this process are not in the table yet.
+    return read | (pending_article_ids(user_id) & set(article_ids))
+
+
+def _set_bits(user_id: int, article_ids: Iterable[int], value: int, build: bool = False) -> None:
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    key = READ_BITMAP_KEY.format(user_id=user_id)
+    try:
+        if build:
+            _ensure_bitmap(redis_client, user_id)
+        # Only touch bitmaps that are already built; others are rebuilt on first use.
+        elif not redis_client.getbit(key, _BUILT_SENTINEL):
+            return
+        pipe = redis_client.pipeline()
+        for article_id in article_ids:
+            pipe.setbit(key, article_id, value)
+        pipe.execute()
+    except redis.RedisError:
+        # A stale bitmap would hide or show the wrong stories; drop it instead.
+        LOGGER.warning("Could not update read bitmap for user %s; discarding it.", user_id, exc_info=True)
+        try:
+            redis_client.delete(key)
+        except redis.RedisError:
+            pass
+
+
+def mark_read(user_id: int, article_ids: Iterable[int], build: bool = False) -> None:
+    """Mirror committed ReadArticle inserts into the bitmap.
+
+    ``build=True`` is for reads not yet written to ReadArticle (write-behind):
+    the bitmap is built first so the reads are not lost until it is rebuilt.
+    """
+    _set_bits(user_id, article_ids, 1, build=build)
+
+
+def mark_unread(user_id: int, article_ids: Iterable[int]) -> None:
+    """Mirror committed ReadArticle deletes into the bitmap."""
+    _set_bits(user_id, article_ids, 0)
+
+
+def filter_read_stories(user_id: int, stories: List[Dict]) -> List[Dict]:
+    """Drop stories in which the user has read any source article."""
+    read = read_article_ids(user_id, (s["article_id"] for story in stories for s in story["sources"]))
+    if not read:
+        return stories
+    return [story for story in stories if not any(s["article_id"] in read for s in story["sources"])]
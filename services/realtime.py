@@ -0,0 +1,142 @@
+"""Real-time story notifications over Socket.IO.
+
+API servers accept authenticated Socket.IO connections; clients emit
+``subscribe`` with the categories they want ("*" for every category) and then
+receive compact ``story`` events. Pipeline jobs run in a separate worker
+process, so they publish through the Redis message queue that every API server
+listens on. Without ``REDIS_URL`` only an in-process server can be reached.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import jwt
+from flask import current_app, request
+from flask_socketio import SocketIO, join_room, leave_room
+
+from services.principals import Principal
+from services.tokens import principal_from_claims
+
+LOGGER = logging.getLogger(__name__)
+
+ALL_CATEGORIES = "*"
+MAX_SUBSCRIPTIONS = 20
+STORY_EVENT = "story"
+STORY_CREATED = "story.created"
+STORY_UPDATED = "story.updated"
+
+socketio = SocketIO()
+
+
+def category_room(category: str) -> str:
+    return f"category:{category}"
+
+
+def init_socketio(app) -> None:
+    socketio.init_app(
+        app,
+        message_queue=os.getenv("REDIS_URL") or None,
+        cors_allowed_origins=app.config.get("FRONTEND_URL"),
+        async_mode=os.getenv("SOCKETIO_ASYNC_MODE") or None,
+    )
+
+
+def _authenticate(auth) -> Optional[Principal]:
+    token = (auth or {}).get("token") or request.args.get("token")
+    if not token:
+        return None
+    try:
+        data = jwt.decode(token.replace("Bearer ", ""), current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    except jwt.InvalidTokenError:
+        return None
+    return principal_from_claims(data)
+
+
+@socketio.on("connect")
+def handle_connect(auth=None):
+    if not _authenticate(auth):
+        return False
+    return True
+
+
+def _requested_rooms(payload) -> List[str]:
+    categories = (payload or {}).get("categories") or []
+    if not isinstance(categories, list):
+        return []
+    categories = [str(c).strip() for c in categories if str(c).strip()][:MAX_SUBSCRIPTIONS]
+    # "*" already covers every category; joining both would deliver events twice.
+    if ALL_CATEGORIES in categories:
+        return [category_room(ALL_CATEGORIES)]
+    return [category_room(c) for c in categories]
+
+
+@socketio.on("subscribe")
+def handle_subscribe(payload):
+    rooms = _requested_rooms(payload)
+    if not rooms:
+        return {"ok": False, "message": "categories must be a non-empty list."}
+    for room in rooms:
+        join_room(room)
+    return {"ok": True, "rooms": rooms}
+
+
+@socketio.on("unsubscribe")
+def handle_unsubscribe(payload):
+    for room in _requested_rooms(payload):
+        leave_room(room)
+    return {"ok": True}
+
+
+@socketio.on_error_default
+def handle_error(exc):
+    LOGGER.exception("Socket.IO handler failed.")
+
+
+def build_story_events(articles: Iterable, changed_clusters: Iterable[int], existing_clusters: Iterable[int]) -> List[Dict]:
+    """Summarize the stories whose membership changed as one compact event each.
+
+    A story is "updated" when its cluster id existed before this run, otherwise
+    "created". Call before committing, while ``articles`` are still loaded.
+    """
+    changed_clusters = set(changed_clusters)
+    existing_clusters = set(existing_clusters)
+    stories: Dict[int, Dict] = {}
+    for article in sorted(articles, key=lambda a: a.created_at, reverse=True):
+        if article.cluster_id not in changed_clusters:
+            continue
+        event = stories.get(article.cluster_id)
+        if event is None:
+            event = stories[article.cluster_id] = {
+                "type": STORY_UPDATED if article.cluster_id in existing_clusters else STORY_CREATED,
+                "cluster_id": article.cluster_id,
+                "title": article.title,
+                "category": article.category,
+                "timestamp": article.created_at.isoformat(),
+                "source_count": 0,
+            }
+        event["source_count"] += 1
+    return list(stories.values())
+
+
+@lru_cache
+def _external_emitter() -> Optional[SocketIO]:
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    return SocketIO(message_queue=redis_url)
+
+
+def publish_story_events(events: List[Dict]) -> None:
+    """Push events to subscribers; failures are logged and never fail the job."""
+    emitter = _external_emitter() or (socketio if socketio.server else None)
+    if not emitter or not events:
+        return
+    try:
+        for event in events:
+            emitter.emit(STORY_EVENT, event, to=category_room(ALL_CATEGORIES))
+            if event.get("category"):
+                emitter.emit(STORY_EVENT, event, to=category_room(event["category"]))
+    except Exception:
+        LOGGER.exception("Could not publish %s story events.", len(events))
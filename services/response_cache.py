@@ -0,0 +1,131 @@
+"""Shared response cache for feed-style endpoints, invalidated by a data generation.
+
+Every pipeline job that changes what the feeds show bumps a generation counter
+in Redis. Cache keys embed the current generation, so a bump makes every older
+entry unreachable at once (they then age out via their TTL). Without Redis the
+cache is disabled: a per-process fallback could not see bumps made by the
+scheduler in another process.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Callable, Mapping, Optional
+
+import redis
+
+from utils.redis_client import get_redis_client, read_counter
+
+LOGGER = logging.getLogger(__name__)
+
+GENERATION_KEY = "cache:data_generation"
+PREFERENCE_VERSION_KEY = "cache:prefs_version:{user_id}"
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "1800"))
+# How long one request may hold the right to regenerate an entry, and how long
+# the others wait for it before computing the response themselves.
+REGENERATE_LOCK_SECONDS = 30
+REGENERATE_WAIT_SECONDS = float(os.getenv("RESPONSE_CACHE_WAIT_SECONDS", "2"))
+REGENERATE_POLL_SECONDS = 0.05
+
+
+def current_generation() -> Optional[int]:
+    """Return the data generation, or None when caching is unavailable."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return None
+    try:
+        return read_counter(redis_client, GENERATION_KEY)
+    except redis.RedisError:
+        LOGGER.warning("Could not read the data generation; serving uncached.", exc_info=True)
+        return None
+
+
+def preference_version(user_id: int) -> Optional[int]:
+    """Return the version of a user's feed preferences, or None without Redis."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return None
+    try:
+        return read_counter(redis_client, PREFERENCE_VERSION_KEY.format(user_id=user_id))
+    except redis.RedisError:
+        LOGGER.warning("Could not read preference version for user %s.", user_id, exc_info=True)
+        return None
+
+
+def bump_preference_version(user_id: int) -> None:
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    try:
+        redis_client.incr(PREFERENCE_VERSION_KEY.format(user_id=user_id))
+    except redis.RedisError:
+        LOGGER.exception("Could not bump preference version for user %s.", user_id)
+
+
+def bump_generation() -> None:
+    """Invalidate every cached response; call after committing feed-visible changes."""
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    try:
+        redis_client.incr(GENERATION_KEY)
+    except redis.RedisError:
+        LOGGER.exception("Could not bump the data generation; cached feeds may be stale until TTL.")
+
+
+def cache_key(namespace: str, params: Mapping[str, object], generation: int) -> str:
+    """Build a key from params with missing/empty values dropped and keys sorted."""
+    normalized = {k: str(v) for k, v in params.items() if v not in (None, "")}
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+    return f"cache:{namespace}:g{generation}:{digest}"
+
+
+def get_or_compute(namespace: str, params: Mapping[str, object],
+                   compute: Callable[[], Optional[str]]) -> Optional[str]:
+    """Return the cached body for ``params``, computing and storing it on a miss.
+
+    ``compute`` returns a serialized body, or None for responses that must not be
+    cached (e.g. not found). Only one caller regenerates a missing entry; the
+    rest wait briefly for it and fall back to computing on their own.
+    """
+    generation = current_generation()
+    if generation is None:
+        return compute()
+    redis_client = get_redis_client()
+    key = cache_key(namespace, params, generation)
+    lock_key = f"{key}:lock"
+
+    try:
+        body = redis_client.get(key)
+        if body is not None:
+            return body
+        lock_value = str(uuid.uuid4())
+        if not redis_client.set(lock_key, lock_value, nx=True, ex=REGENERATE_LOCK_SECONDS):
+            deadline = time.monotonic() + REGENERATE_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(REGENERATE_POLL_SECONDS)
+                body = redis_client.get(key)
+                if body is not None:
+                    return body
+            return compute()
+    except redis.RedisError:
+        LOGGER.warning("Response cache unavailable; serving uncached.", exc_info=True)
+        return compute()
+
+    try:
+        body = compute()
+        if body is not None:
+            redis_client.set(key, body, ex=RESPONSE_CACHE_TTL_SECONDS)
+        return body
+    except redis.RedisError:
+        LOGGER.warning("Could not store cached response %s.", key, exc_info=True)
+        return body
+    finally:
+        try:
+            if redis_client.get(lock_key) == lock_value:
+                redis_client.delete(lock_key)
+        except redis.RedisError:
+            pass
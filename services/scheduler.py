@@ -5,6 +5,10 @@ from services.clustering_engine import cluster_recent_articles
 from services.scraper import run_harvester
 from services.ai_engine import process_unsummarized_news
 from services.digest_service import send_daily_digests
+from services.email_service import deliver_pending_emails
+from services.change_log import prune_change_log
+from services.read_events import flush_read_events
+from services.trending import compute_trending_scores
 from services.monitoring import (
     record_job_failure,
     record_job_missed,
@@ -103,4 +107,60 @@ def start_background_jobs(app):
         minutes=15,
     )
 
+    # Step 5: Prune the delta-sync change log (Daily)
+    scheduler.add_job(
+        id="prune_change_log",
+        name="Prune change log",
+        func=lambda: run_with_context(
+            prune_change_log,
+            "prune_change_log",
+            "locks:prune_change_log",
+            10 * 60,
+        ),
+        trigger="interval",
+        hours=24,
+    )
+
+    # Step 6: Write buffered read events to the database (Every minute)
+    scheduler.add_job(
+        id="flush_read_events",
+        name="Flush read events",
+        func=lambda: run_with_context(
+            flush_read_events,
+            "flush_read_events",
+            "locks:read_events",
+            5 * 60,
+        ),
+        trigger="interval",
+        minutes=1,
+    )
+
+    # Step 7: Refresh trending scores between clustering runs (Every 10m)
+    scheduler.add_job(
+        id="compute_trending_scores",
+        name="Compute trending scores",
+        func=lambda: run_with_context(
+            compute_trending_scores,
+            "compute_trending_scores",
+            "locks:trending",
+            5 * 60,
+        ),
+        trigger="interval",
+        minutes=10,
+    )
+
+    # Step 8: Deliver queued emails (Every minute)
+    scheduler.add_job(
+        id="deliver_emails",
+        name="Deliver emails",
+        func=lambda: run_with_context(
+            deliver_pending_emails,
+            "deliver_emails",
+            "locks:email_outbox",
+            5 * 60,
+        ),
+        trigger="interval",
+        minutes=1,
+    )
+
     scheduler.start()
@@ -5,6 +5,8 @@ from urllib.parse import urlparse
 from datetime import datetime
 
 from models.models import Article, db
+from services.response_cache import bump_generation
+from services.token_budget import trim_to_budget
 
 RSS_FEEDS = {
     "Tech": "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml",
@@ -25,6 +27,11 @@ SCRAPE_ALLOWED_DOMAINS = {
     "www.reuters.com",
 }
 
+# Token budgets for stored article text (roughly the old 8000/2000 character caps).
+# Stored text keeps every paragraph; boilerplate is only dropped from the summarizer prompt.
+SCRAPED_CONTENT_TOKEN_BUDGET = 2000
+RSS_CONTENT_TOKEN_BUDGET = 500
+
 HEADERS = {
     "User-Agent": "news-aggregator/1.0 (+https://yourdomain.example)",
     "Accept-Language": "en-GB,en;q=0.8",
@@ -49,9 +56,9 @@ def _extract_text_generic(html: str) -> str:
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
 
-    paragraphs = soup.find_all("p")
-    text = " ".join(p.get_text(" ", strip=True) for p in paragraphs)
-    return " ".join(text.split())
+    # Keep paragraph breaks so trimming can drop boilerplate paragraphs.
+    paragraphs = (" ".join(p.get_text(" ", strip=True).split()) for p in soup.find_all("p"))
+    return "\n\n".join(p for p in paragraphs if p)
 
 def _extract_rss_summary(entry) -> str:
     # feedparser often exposes summary or description
@@ -76,7 +83,7 @@ def run_harvester():
                 continue
 
             # URL dedupe
-            if link in seen_urls or Article.query.filter_by(source_url=link).first():
+            if link in seen_urls or db.session.query(Article.id).filter_by(source_url=link).first():
                 continue
 
             source_domain = urlparse(link).netloc
@@ -90,13 +97,15 @@ def run_harvester():
                 html, status = _safe_get(link)
                 fetch_status = status
                 if status == "ok" and html:
-                    raw_content = _extract_text_generic(html)[:8000]
+                    raw_content = trim_to_budget(
+                        _extract_text_generic(html), SCRAPED_CONTENT_TOKEN_BUDGET, drop_low_info=False
+                    )
                 elif status in ("blocked_403", "blocked_429", "failed"):
                     # fallback to RSS summary when blocked/failed
-                    raw_content = rss_summary[:2000] if rss_summary else ""
+                    raw_content = trim_to_budget(rss_summary, RSS_CONTENT_TOKEN_BUDGET, drop_low_info=False)
             else:
                 # Not allowed → RSS-only (keeps logs clean)
-                raw_content = rss_summary[:2000] if rss_summary else ""
+                raw_content = trim_to_budget(rss_summary, RSS_CONTENT_TOKEN_BUDGET, drop_low_info=False)
 
             new_article = Article(
                 title=title,
@@ -114,7 +123,7 @@ def run_harvester():
             if new_article.content_hash:
                 if (
                     new_article.content_hash in seen_hashes
-                    or Article.query.filter_by(content_hash=new_article.content_hash).first()
+                    or db.session.query(Article.id).filter_by(content_hash=new_article.content_hash).first()
                 ):
                     continue
                 seen_hashes.add(new_article.content_hash)
@@ -123,3 +132,5 @@ def run_harvester():
             seen_urls.add(link)
 
     db.session.commit()
+    if seen_urls:
+        bump_generation()
@@ -0,0 +1,74 @@
+"""Full-text search over article titles and summaries.
+
+Postgres matches ``websearch_to_tsquery`` against the GIN-indexed tsvector
+expression in models.ARTICLE_SEARCH_VECTOR (titles weigh more than summaries)
+and ranks with ``ts_rank_cd``. SQLite (local development and tests) uses the
+FTS5 table kept in sync by triggers, ranked with bm25. Results are paged by
+keyset on (rank, id), or on (created_at, id) when sorted by recency, so deep
+pages cost the same as the first one.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.orm import load_only
+
+from models.models import ARTICLE_SEARCH_TABLE, ARTICLE_SEARCH_VECTOR, Article, db
+from utils.pagination import Position, keyset_page
+
+SORT_RELEVANCE = "relevance"
+SORT_RECENT = "recent"
+SEARCH_SORTS = (SORT_RELEVANCE, SORT_RECENT)
+MAX_QUERY_LENGTH = 200
+MAX_QUERY_TERMS = 12
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+_search_table = table(ARTICLE_SEARCH_TABLE, column("rowid"))
+
+
+def search_terms(q: Optional[str]) -> List[str]:
+    return _TERM.findall((q or "")[:MAX_QUERY_LENGTH].lower())[:MAX_QUERY_TERMS]
+
+
+def _fts5_query(terms: Sequence[str]) -> str:
+    # Quoting every term keeps user input from being read as FTS5 syntax.
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _matching_query(q: str, columns):
+    """Return (query of (Article, rank), rank expression) for the dialect in use."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        vector = literal_column(ARTICLE_SEARCH_VECTOR)
+        tsquery = func.websearch_to_tsquery("english", q[:MAX_QUERY_LENGTH])
+        rank = func.ts_rank_cd(vector, tsquery)
+        query = db.session.query(Article, rank.label("rank")).filter(vector.op("@@")(tsquery))
+    elif dialect == "sqlite":
+        # bm25 is lower for better matches; negate it so higher is better everywhere.
+        rank = literal_column(f"-bm25({ARTICLE_SEARCH_TABLE}, 2.0, 1.0)")
+        query = db.session.query(Article, rank.label("rank")) \
+            .join(_search_table, _search_table.c.rowid == Article.id) \
+            .filter(text(f"{ARTICLE_SEARCH_TABLE} MATCH :fts_query").bindparams(
+                fts_query=_fts5_query(search_terms(q))))
+    else:
+        # No full-text support: every term must appear in the title or summary.
+        rank = literal_column("0.0")
+        query = db.session.query(Article, rank.label("rank")).filter(*[
+            or_(Article.title.ilike(f"%{term}%"), Article.ai_summary.ilike(f"%{term}%"))
+            for term in search_terms(q)
+        ])
+    return query.options(load_only(*columns)), rank
+
+
+def search_articles(q: str, criteria: Sequence, columns, limit: int, position: Optional[Position],
+                    direction: str, sort: str = SORT_RELEVANCE):
+    """Return ``(rows, has_more)``; rows are (Article, rank) pairs, best first.
+
+    Callers must check ``search_terms(q)`` is non-empty first.
+    """
+    query, rank = _matching_query(q, columns)
+    query = query.filter(*criteria)
+    if sort == SORT_RECENT:
+        return keyset_page(query, Article.created_at, Article.id, limit, position, direction)
+    return keyset_page(query, rank, Article.id, limit, position, direction)
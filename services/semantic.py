@@ -0,0 +1,77 @@
+"""Related stories and semantic search over the stored article embeddings."""
+
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from models.models import Article, db
+from services.embeddings import embed_texts, get_model, load_embeddings
+from services.vector_index import get_index
+
+LOGGER = logging.getLogger(__name__)
+
+# Several hits usually belong to the same story, so fetch extra candidates.
+CANDIDATES_PER_RESULT = 5
+
+_warming = threading.Event()
+
+
+def related_cluster_ids(cluster_id: int, limit: int) -> Optional[List[Tuple[int, float]]]:
+    """Return (cluster_id, score) of the stories nearest to ``cluster_id``, best first.
+
+    None means the story does not exist; an empty list means nothing to compare.
+    """
+    article_ids = [aid for (aid,) in db.session.query(Article.id).filter(Article.cluster_id == cluster_id)]
+    if not article_ids:
+        return None
+    vectors = list(load_embeddings(article_ids).values())
+    if not vectors:
+        return []
+    centroid = np.mean(vectors, axis=0)
+    centroid /= np.linalg.norm(centroid) or 1.0
+
+    hits = get_index().search(centroid, limit * CANDIDATES_PER_RESULT, exclude=article_ids)
+    clusters = dict(
+        db.session.query(Article.id, Article.cluster_id).filter(Article.id.in_([aid for aid, _ in hits]))
+    )
+    related = {}
+    for article_id, score in hits:
+        cid = clusters.get(article_id)
+        if cid is not None and cid != cluster_id and cid not in related:
+            related[cid] = score
+    return list(related.items())[:limit]
+
+
+def semantic_article_hits(q: str, limit: int) -> List[Tuple[int, float]]:
+    """Return (article_id, score) pairs for the articles closest in meaning to ``q``."""
+    return get_index().search(embed_texts([q])[0], limit)
+
+
+def _warm_up(app) -> None:
+    try:
+        with app.app_context():
+            get_model()
+            get_index()
+        LOGGER.info("Semantic search is ready.")
+    except Exception:
+        LOGGER.exception("Could not load semantic search; queries will retry the load.")
+    finally:
+        _warming.clear()
+
+
+def start_warm_up(app) -> threading.Thread:
+    """Load the embedding model and vector index on a background thread.
+
+    Runs per process (gunicorn workers import the app after forking), so the
+    first semantic query does not pay for the load inside a request.
+    """
+    _warming.set()
+    thread = threading.Thread(target=_warm_up, args=(app,), name="semantic-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def warming_up() -> bool:
+    return _warming.is_set()
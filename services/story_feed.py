@@ -0,0 +1,173 @@
+"""Story feed queries: keyset pagination over stories and story payload assembly.
+
+A story is a cluster of articles; its position in the feed is the (created_at, id)
+of its newest matching article (the "lead"). Pages are found by scanning
+articles newest first through the feed indexes and taking clusters in order of
+first appearance, so no query has to aggregate the whole table.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+
+from models.models import Article, db
+from utils.pagination import Position, decode_cursor, page_cursors, parse_direction
+
+STORY_CURSOR_KIND = "story"
+SCAN_CHUNK_MIN = 50
+
+
+def story_columns():
+    """Only the columns story payloads use; list endpoints never need article text."""
+    return load_only(
+        Article.id,
+        Article.cluster_id,
+        Article.title,
+        Article.ai_summary,
+        Article.source_domain,
+        Article.source_url,
+        Article.created_at,
+    )
+
+
+def build_stories(articles: Iterable[Article]) -> List[Dict]:
+    """Group newest-first articles into story payloads, keeping first-appearance order."""
+    stories: Dict[int, Dict] = {}
+    for a in articles:
+        cid = a.cluster_id
+        if cid not in stories:
+            stories[cid] = {
+                "cluster_id": cid,
+                "story_title": a.title,
+                "summary": a.ai_summary,
+                "sources": [],
+                "timestamp": a.created_at,
+                "lead_article_id": a.id,
+            }
+        stories[cid]["sources"].append({
+            "article_id": a.id,
+            "name": a.source_domain,
+            "url": a.source_url,
+            "title": a.title,
+        })
+    return list(stories.values())
+
+
+def load_stories(criteria: Sequence, cluster_ids: Sequence[int]) -> List[Dict]:
+    """Hydrate stories for ``cluster_ids`` (in that order) from articles matching ``criteria``."""
+    if not cluster_ids:
+        return []
+    articles = (
+        Article.query.options(story_columns())
+        .filter(*criteria, Article.cluster_id.in_(cluster_ids))
+        .order_by(Article.created_at.desc(), Article.id.desc())
+        .all()
+    )
+    by_id = {story["cluster_id"]: story for story in build_stories(articles)}
+    return [by_id[cid] for cid in cluster_ids if cid in by_id]
+
+
+def _scan(criteria: Sequence, position: Optional[Position], newer: bool, limit: int):
+    key = tuple_(Article.created_at, Article.id)
+    query = db.session.query(Article.cluster_id, Article.created_at, Article.id).filter(*criteria)
+    if newer:
+        if position is not None:
+            query = query.filter(key > tuple_(*position))
+        return query.order_by(Article.created_at.asc(), Article.id.asc()).limit(limit).all()
+    if position is not None:
+        query = query.filter(key < tuple_(*position))
+    return query.order_by(Article.created_at.desc(), Article.id.desc()).limit(limit).all()
+
+
+def _older_story_leads(criteria, limit: int, position: Optional[Position]) -> Tuple[List[Tuple[int, Position]], bool]:
+    chunk = max(limit * 4, SCAN_CHUNK_MIN)
+    chosen: List[Tuple[int, Position]] = []
+    seen = set()
+    scan_position = position
+    while len(chosen) <= limit:
+        rows = _scan(criteria, scan_position, newer=False, limit=chunk)
+        if not rows:
+            break
+        fresh = []
+        for cluster_id, created_at, article_id in rows:
+            if cluster_id not in seen:
+                seen.add(cluster_id)
+                fresh.append((cluster_id, (created_at, article_id)))
+        if position is not None and fresh:
+            # Clusters with an article at or above the cursor were on an earlier page.
+            shown = {
+                cid
+                for (cid,) in db.session.query(Article.cluster_id)
+                .filter(
+                    *criteria,
+                    Article.cluster_id.in_([cid for cid, _ in fresh]),
+                    tuple_(Article.created_at, Article.id) >= tuple_(*position),
+                )
+                .distinct()
+            }
+            fresh = [item for item in fresh if item[0] not in shown]
+        chosen.extend(fresh)
+        scan_position = (rows[-1].created_at, rows[-1].id)
+        if len(rows) < chunk:
+            break
+    return chosen[:limit], len(chosen) > limit
+
+
+def _newer_story_leads(criteria, limit: int, position: Position) -> Tuple[List[Tuple[int, Position]], bool]:
+    chunk = max(limit * 4, SCAN_CHUNK_MIN)
+    leads: Dict[int, Position] = {}
+    scan_position = position
+    exhausted = False
+    while True:
+        rows = _scan(criteria, scan_position, newer=True, limit=chunk)
+        exhausted = len(rows) < chunk
+        unseen = {row.cluster_id for row in rows} - leads.keys()
+        if unseen:
+            for cluster_id, created_at, article_id in db.session.query(
+                Article.cluster_id, Article.created_at, Article.id
+            ).filter(*criteria, Article.cluster_id.in_(unseen)):
+                candidate = (created_at, article_id)
+                if cluster_id not in leads or candidate > leads[cluster_id]:
+                    leads[cluster_id] = candidate
+        if rows:
+            scan_position = (rows[-1].created_at, rows[-1].id)
+        # Every cluster whose lead is at or below the scan position has been seen.
+        settled = [p for p in leads.values() if exhausted or p <= scan_position]
+        if exhausted or len(settled) > limit:
+            break
+    nearest = sorted(
+        (p, cid) for cid, p in leads.items() if exhausted or p <= scan_position
+    )
+    page = nearest[:limit]
+    return [(cid, p) for p, cid in reversed(page)], len(nearest) > limit
+
+
+def story_leads(criteria: Sequence, limit: int) -> Tuple[List[Tuple[int, Position]], bool]:
+    """Return the newest ``limit`` (cluster_id, lead position) pairs and whether more exist."""
+    return _older_story_leads(criteria, limit, None)
+
+
+def paginate_stories(criteria: Sequence, limit: int, cursor: Optional[str], direction: Optional[str]) -> Dict:
+    """Return a page of stories with opaque next/prev cursors.
+
+    Raises utils.pagination.InvalidCursor for malformed cursors or directions.
+    """
+    position = decode_cursor(cursor, STORY_CURSOR_KIND)
+    direction = parse_direction(direction)
+    if direction == "prev" and position is not None:
+        leads, has_more = _newer_story_leads(criteria, limit, position)
+    else:
+        direction = "next"
+        leads, has_more = _older_story_leads(criteria, limit, position)
+
+    stories = load_stories(criteria, [cid for cid, _ in leads])
+    next_cursor, prev_cursor = page_cursors(
+        STORY_CURSOR_KIND,
+        leads[0][1] if leads else None,
+        leads[-1][1] if leads else None,
+        has_more,
+        direction,
+        had_cursor=position is not None,
+    )
+    return {"stories": stories, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
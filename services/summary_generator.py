@@ -1,20 +1,13 @@
 import json
-import re
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
-
-from services.ai_engine import client as ai_client
+from services.llm_client import LLMError, chat_completion, extract_json_object
 
 
 class SummaryGenError(Exception):
     pass
 
 
-def _get_client() -> OpenAI:
-    return ai_client or OpenAI()
-
-
 def _build_messages(
     *,
     text: str,
@@ -56,15 +49,9 @@ def _build_messages(
 
 def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     try:
-        return json.loads(text)
+        return extract_json_object(text)
     except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            return None
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            return None
+        return None
 
 
 def generate_summary(
@@ -75,7 +62,6 @@ def generate_summary(
     fact_mode: bool = True,
     model: Optional[str] = None,
 ) -> Dict[str, Any]:
-    client = _get_client()
     messages = _build_messages(
         text=text,
         style=style,
@@ -84,16 +70,15 @@ def generate_summary(
     )
 
     try:
-        response = client.chat.completions.create(
-            model=model or "gpt-4o-mini",
-            messages=messages,
+        content = chat_completion(
+            messages,
+            model=model,
             temperature=0.3,
             response_format={"type": "json_object"},
         )
-    except Exception as exc:
+    except LLMError as exc:
         raise SummaryGenError(f"OpenAI request failed: {exc}") from exc
 
-    content = response.choices[0].message.content or ""
     data = _extract_json(content)
     if isinstance(data, dict) and isinstance(data.get("summary"), str):
         warnings = data.get("warnings", [])
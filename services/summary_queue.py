@@ -0,0 +1,153 @@
+"""Priority ordering and retry backoff for articles waiting on an AI summary."""
+
+import math
+import os
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import load_only, undefer_group
+
+from models.models import Article, db
+from services.change_log import ARTICLE, SUMMARIZED, record_change
+
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "10"))
+SUMMARY_MAX_ATTEMPTS = int(os.getenv("SUMMARY_MAX_ATTEMPTS", "5"))
+SUMMARY_RETRY_BASE_MINUTES = 10
+SUMMARY_RETRY_MAX_MINUTES = 12 * 60
+
+# How many of the newest pending articles are scored for each batch slot.
+CANDIDATE_MULTIPLIER = 20
+RECENCY_HALF_LIFE_HOURS = 6.0
+STORY_TITLE_SIMILARITY = 0.5
+
+SOURCE_PRIORITY: Dict[str, float] = {
+    "www.reuters.com": 1.3,
+    "reuters.com": 1.3,
+    "www.reutersagency.com": 1.2,
+    "reutersagency.com": 1.2,
+    "www.nytimes.com": 1.2,
+    "www.espn.com": 1.0,
+}
+CATEGORY_PRIORITY: Dict[str, float] = {
+    "World": 1.2,
+    "Politics": 1.1,
+    "Business": 1.1,
+    "Tech": 1.0,
+    "Sports": 0.9,
+    "Lifestyle": 0.8,
+}
+
+_TITLE_WORD = re.compile(r"[a-z0-9']{4,}")
+_TITLE_STOPWORDS = {"with", "from", "that", "this", "will", "have", "after", "over", "into", "about", "says"}
+
+
+def _pending_filter(now: datetime):
+    return (
+        Article.ai_summary.is_(None),
+        func.coalesce(Article.summary_attempts, 0) < SUMMARY_MAX_ATTEMPTS,
+        or_(Article.next_summary_attempt_at.is_(None), Article.next_summary_attempt_at <= now),
+    )
+
+
+def _title_keywords(title: str) -> frozenset:
+    return frozenset(w for w in _TITLE_WORD.findall((title or "").lower()) if w not in _TITLE_STOPWORDS)
+
+
+def _story_sizes(candidates: List[Article]) -> Dict[int, int]:
+    """Estimate how many outlets cover each candidate's story.
+
+    Clustered articles use their cluster size; unclustered ones (the usual case,
+    since clustering runs on summaries) count candidates with similar titles.
+    """
+    sizes: Dict[int, int] = {}
+    cluster_ids = {a.cluster_id for a in candidates if a.cluster_id is not None}
+    cluster_sizes: Dict[int, int] = {}
+    if cluster_ids:
+        rows = (
+            db.session.query(Article.cluster_id, func.count(Article.id))
+            .filter(Article.cluster_id.in_(cluster_ids))
+            .group_by(Article.cluster_id)
+            .all()
+        )
+        cluster_sizes = dict(rows)
+
+    keywords = {a.id: _title_keywords(a.title) for a in candidates}
+    for article in candidates:
+        if article.cluster_id is not None:
+            sizes[article.id] = cluster_sizes.get(article.cluster_id, 1)
+            continue
+        own = keywords[article.id]
+        similar = 1
+        for other in candidates:
+            if other.id == article.id or not own:
+                continue
+            theirs = keywords[other.id]
+            union = own | theirs
+            if union and len(own & theirs) / len(union) >= STORY_TITLE_SIMILARITY:
+                similar += 1
+        sizes[article.id] = similar
+    return sizes
+
+
+def score_article(article: Article, story_size: int, now: datetime) -> float:
+    created_at = article.created_at or now
+    age_hours = max(0.0, (now - created_at).total_seconds() / 3600.0)
+    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    priority = SOURCE_PRIORITY.get(article.source_domain, 1.0) * CATEGORY_PRIORITY.get(article.category, 1.0)
+    size_boost = 1.0 + math.log(max(story_size, 1))
+    retry_penalty = 1.0 / (1 + (article.summary_attempts or 0))
+    return recency * priority * size_boost * retry_penalty
+
+
+def fetch_summary_batch(limit: int = SUMMARY_BATCH_SIZE, now: Optional[datetime] = None) -> List[Article]:
+    """Return the highest-priority pending articles that are due for a summary attempt."""
+    now = now or datetime.utcnow()
+    candidates = (
+        Article.query.options(
+            load_only(
+                Article.id,
+                Article.title,
+                Article.source_domain,
+                Article.category,
+                Article.cluster_id,
+                Article.created_at,
+                Article.summary_attempts,
+            )
+        )
+        .filter(*_pending_filter(now))
+        .order_by(Article.created_at.desc())
+        .limit(limit * CANDIDATE_MULTIPLIER)
+        .all()
+    )
+    if not candidates:
+        return []
+    sizes = _story_sizes(candidates)
+    candidates.sort(key=lambda a: score_article(a, sizes[a.id], now), reverse=True)
+    batch = candidates[:limit]
+    # Load article text for the chosen few only, in one query.
+    Article.query.options(undefer_group("content")).filter(Article.id.in_([a.id for a in batch])).all()
+    return batch
+
+
+def retry_delay(attempts: int) -> timedelta:
+    minutes = min(SUMMARY_RETRY_MAX_MINUTES, SUMMARY_RETRY_BASE_MINUTES * (2 ** max(attempts - 1, 0)))
+    return timedelta(minutes=minutes * random.uniform(0.8, 1.2))
+
+
+def record_summary_success(article: Article, summary: str, now: Optional[datetime] = None) -> None:
+    article.ai_summary = summary
+    article.summary_error = None
+    article.next_summary_attempt_at = None
+    article.processed_at = now or datetime.utcnow()
+    record_change(ARTICLE, article.id, SUMMARIZED)
+
+
+def record_summary_failure(article: Article, error: str, now: Optional[datetime] = None) -> None:
+    now = now or datetime.utcnow()
+    article.summary_attempts = (article.summary_attempts or 0) + 1
+    article.summary_error = error
+    article.processed_at = now
+    article.next_summary_attempt_at = now + retry_delay(article.summary_attempts)
@@ -0,0 +1,151 @@
+"""Token counting and sentence-aware trimming of model input."""
+
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from services.llm_client import DEFAULT_MODEL
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only when tiktoken is missing
+    tiktoken = None
+
+# Input token budgets per model for article text sent to the summarizer.
+MODEL_INPUT_BUDGETS: Dict[str, int] = {
+    "gpt-4o-mini": 1500,
+    "gpt-4o": 1000,
+}
+DEFAULT_INPUT_BUDGET = 1000
+# When set, overrides the per-model budgets above.
+SUMMARY_INPUT_TOKEN_BUDGET = int(os.getenv("SUMMARY_INPUT_TOKEN_BUDGET", "0")) or None
+
+# Rough chars-per-token ratio for English when no tokenizer is available.
+FALLBACK_CHARS_PER_TOKEN = 4
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])[\"'”’)]*\s+(?=[\"'“‘(]?[A-Z0-9])")
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_BOILERPLATE = re.compile(
+    r"\b(subscribe|sign up|newsletter|cookies?|all rights reserved|advertisement|"
+    r"click here|follow us|read more|share this|terms of (use|service)|privacy policy)\b|©",
+    re.IGNORECASE,
+)
+MIN_PARAGRAPH_WORDS = 6
+# Longer paragraphs are only boilerplate if the matches cover most of the text.
+MAX_BOILERPLATE_WORDS = 25
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encodings are downloaded on first use; fall back when offline.
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / FALLBACK_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def input_budget(model: Optional[str] = None) -> int:
+    if SUMMARY_INPUT_TOKEN_BUDGET:
+        return SUMMARY_INPUT_TOKEN_BUDGET
+    return MODEL_INPUT_BUDGETS.get(model or DEFAULT_MODEL, DEFAULT_INPUT_BUDGET)
+
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in _PARAGRAPH_SPLIT.split(text) if p.strip()]
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+def _is_low_information(paragraph: str) -> bool:
+    words = len(paragraph.split())
+    if words < MIN_PARAGRAPH_WORDS:
+        return True
+    matched = sum(len(match.group()) for match in _BOILERPLATE.finditer(paragraph))
+    if not matched:
+        return False
+    return words < MAX_BOILERPLATE_WORDS or matched * 2 > len(paragraph)
+
+
+def drop_low_information(paragraphs: List[str]) -> List[str]:
+    seen = set()
+    kept = []
+    for paragraph in paragraphs:
+        key = paragraph.lower()
+        if key in seen or _is_low_information(paragraph):
+            continue
+        seen.add(key)
+        kept.append(paragraph)
+    # Never drop everything; short articles are sometimes all "low information".
+    return kept or paragraphs
+
+
+def _hard_cut(text: str, budget: int, model: str) -> str:
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[: budget * FALLBACK_CHARS_PER_TOKEN]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+
+
+def trim_to_budget(
+    text: str,
+    budget: int,
+    model: str = DEFAULT_MODEL,
+    drop_low_info: bool = True,
+) -> str:
+    """Trim ``text`` to at most ``budget`` tokens, cutting at sentence boundaries.
+
+    When the text is over budget, boilerplate and very short paragraphs are
+    dropped first (if ``drop_low_info``), then whole sentences are kept in order
+    until the budget is reached.
+    """
+    if not text or count_tokens(text, model) <= budget:
+        return text
+
+    paragraphs = split_paragraphs(text)
+    if not paragraphs:
+        return ""
+    if drop_low_info:
+        paragraphs = drop_low_information(paragraphs)
+        candidate = "\n\n".join(paragraphs)
+        if count_tokens(candidate, model) <= budget:
+            return candidate
+
+    kept_paragraphs: List[str] = []
+    used = 0
+    for paragraph in paragraphs:
+        kept_sentences: List[str] = []
+        for sentence in split_sentences(paragraph):
+            cost = count_tokens(sentence, model) + 1
+            if used + cost > budget:
+                break
+            kept_sentences.append(sentence)
+            used += cost
+        else:
+            kept_paragraphs.append(" ".join(kept_sentences))
+            continue
+        if kept_sentences:
+            kept_paragraphs.append(" ".join(kept_sentences))
+        break
+
+    if not kept_paragraphs:
+        # A single sentence longer than the budget; cut it on a token boundary.
+        return _hard_cut(paragraphs[0], budget, model)
+    return "\n\n".join(kept_paragraphs)
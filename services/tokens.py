@@ -0,0 +1,169 @@
+"""Access/refresh token issuance and verification.
+
+Login returns a short-lived access token and an opaque refresh token, plus the
+legacy 24-hour ``token`` that existing clients send. An access token carries the
+principal (id, email, role, password timestamp) and the user's token generation
+(services/principals.py), so token_required verifies it with the signature and
+one Redis GET, with no database access. Deactivation, role or password changes
+move the generation on and revoke outstanding access tokens immediately. When
+Redis cannot answer, access tokens fall back to the cached principal lookup
+that legacy tokens use.
+
+Refresh tokens are stored as SHA-256 hashes and rotated on every use. Presenting
+a token that was already rotated means it leaked, so its whole family is revoked.
+"""
+
+import datetime
+import secrets
+from typing import Dict, Optional, Tuple
+
+import jwt
+from flask import current_app
+
+from models.models import RefreshToken, User, db
+from services.principals import (
+    Principal,
+    load_principal,
+    revoke_access_tokens,
+    token_claims,
+    token_generation,
+)
+from utils.auth import generate_token, hash_token
+
+ACCESS_TOKEN_TYPE = "access"
+ACCESS_TOKEN_TTL = datetime.timedelta(minutes=15)
+REFRESH_TOKEN_TTL = datetime.timedelta(days=30)
+LEGACY_TOKEN_TTL = datetime.timedelta(hours=24)
+
+
+class InvalidRefreshToken(Exception):
+    pass
+
+
+def _encode(claims: Dict) -> str:
+    return jwt.encode(claims, current_app.config["SECRET_KEY"], algorithm="HS256")
+
+
+def _access_token(user: User, now: datetime.datetime) -> str:
+    claims = {
+        "user_id": user.id,
+        "type": ACCESS_TOKEN_TYPE,
+        "email": user.email,
+        "exp": now + ACCESS_TOKEN_TTL,
+        **token_claims(user),
+    }
+    generation = token_generation(user.id)
+    if generation is not None:
+        claims["gen"] = generation
+    return _encode(claims)
+
+
+def _new_refresh_token(user_id: int, family_id: str, now: datetime.datetime) -> Tuple[RefreshToken, str]:
+    raw = generate_token()
+    row = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_token(raw),
+        family_id=family_id,
+        created_at=now,
+        expires_at=now + REFRESH_TOKEN_TTL,
+    )
+    db.session.add(row)
+    return row, raw
+
+
+def _issue(user: User, family_id: str, now: datetime.datetime) -> Tuple[Dict, RefreshToken]:
+    row, refresh_token = _new_refresh_token(user.id, family_id, now)
+    body = {
+        "token": _encode({"user_id": user.id, "exp": now + LEGACY_TOKEN_TTL, **token_claims(user)}),
+        "access_token": _access_token(user, now),
+        "refresh_token": refresh_token,
+        "token_type": "Bearer",
+        "expires_in": int(ACCESS_TOKEN_TTL.total_seconds()),
+    }
+    return body, row
+
+
+def issue_tokens(user: User) -> Dict:
+    """Return the login response body, starting a new refresh token family; the caller commits."""
+    body, _ = _issue(user, secrets.token_hex(16), datetime.datetime.utcnow())
+    return body
+
+
+def _revoke_family(family_id: str, now: datetime.datetime) -> None:
+    RefreshToken.query.filter(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)) \
+        .update({RefreshToken.revoked_at: now}, synchronize_session=False)
+
+
+def _detect_reuse(row: RefreshToken, now: datetime.datetime) -> InvalidRefreshToken:
+    # A rotated token coming back means two parties hold the family; end it.
+    _revoke_family(row.family_id, now)
+    db.session.commit()
+    return InvalidRefreshToken("Refresh token has been revoked.")
+
+
+def rotate_refresh_token(raw: Optional[str]) -> Dict:
+    """Exchange a refresh token for new tokens; the caller commits.
+
+    Raises InvalidRefreshToken; reuse of a rotated token is committed (family
+    revoked) before raising.
+    """
+    row = RefreshToken.query.filter_by(token_hash=hash_token(raw)).first() if raw else None
+    if row is None:
+        raise InvalidRefreshToken("Refresh token is invalid.")
+    now = datetime.datetime.utcnow()
+    if row.revoked_at is not None:
+        if row.replaced_by_id is not None:
+            raise _detect_reuse(row, now)
+        raise InvalidRefreshToken("Refresh token has been revoked.")
+    if row.expires_at < now:
+        raise InvalidRefreshToken("Refresh token has expired.")
+    user = db.session.get(User, row.user_id)
+    if user is None or not user.is_active:
+        raise InvalidRefreshToken("User is inactive or missing.")
+
+    # Claim the token atomically so two concurrent refreshes cannot both rotate it.
+    claimed = RefreshToken.query.filter(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None)) \
+        .update({RefreshToken.revoked_at: now}, synchronize_session=False)
+    if not claimed:
+        raise _detect_reuse(row, now)
+    body, new_row = _issue(user, row.family_id, now)
+    db.session.flush()
+    row.replaced_by_id = new_row.id
+    return body
+
+
+def revoke_refresh_token(raw: Optional[str], everywhere: bool = False) -> bool:
+    """Revoke the token's family, or with ``everywhere`` all of the user's sessions; the caller commits."""
+    row = RefreshToken.query.filter_by(token_hash=hash_token(raw)).first() if raw else None
+    if row is None:
+        return False
+    now = datetime.datetime.utcnow()
+    if everywhere:
+        revoke_user_refresh_tokens(row.user_id)
+        revoke_access_tokens(row.user_id)
+    else:
+        _revoke_family(row.family_id, now)
+    return True
+
+
+def revoke_user_refresh_tokens(user_id: int) -> None:
+    RefreshToken.query.filter(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)) \
+        .update({RefreshToken.revoked_at: datetime.datetime.utcnow()}, synchronize_session=False)
+
+
+def principal_from_claims(data: Dict) -> Optional[Principal]:
+    """Resolve decoded JWT claims to an active principal, or None to reject the token."""
+    if data.get("type") == ACCESS_TOKEN_TYPE and "gen" in data:
+        current = token_generation(data["user_id"])
+        if current is not None:
+            if data["gen"] < current:
+                return None
+            return Principal(
+                id=data["user_id"],
+                email=data["email"],
+                role=data["role"],
+                is_active=True,
+                password_changed_at=data.get("pwd_at"),
+            )
+    principal = load_principal(data.get("user_id"), data)
+    return principal if principal and principal.is_active else None
@@ -0,0 +1,159 @@
+"""Trending ranking of recent stories, precomputed into StoryScore.
+
+Each run costs one grouped query over the articles in the trending window plus
+the change-log entries written since the previous run: read/save additions and
+removals are folded into per-article ArticleEngagement totals, so engagement is
+never recounted from the read/saved tables. A story's score rewards source
+count, velocity (articles added in the last ``VELOCITY_HOURS``) and engagement,
+and decays with age:
+
+    (sources * w_s + velocity * w_v + log1p(reads) * w_r + log1p(saves) * w_sv)
+        / (age_hours + 2) ** GRAVITY
+
+Scores decay with age, so the whole table is replaced per run. Runs hold a row
+lock on their JobCursor for the whole transaction, so the scheduled job and
+the run after clustering never apply the same change-log entries twice or
+interleave their StoryScore rewrites.
+"""
+
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.exc import IntegrityError
+
+from models.models import Article, ArticleEngagement, ChangeLog, JobCursor, StoryScore, db
+from services import change_log
+
+TRENDING_WINDOW_HOURS = int(os.getenv("TRENDING_WINDOW_HOURS", "48"))
+VELOCITY_HOURS = 2
+# News stays relevant longer than a link aggregator's posts, so decay gently
+# and let coverage dominate: twelve outlets an hour ago beat one a minute ago.
+GRAVITY = 1.2
+SOURCE_WEIGHT = 4.0
+VELOCITY_WEIGHT = 1.0
+READ_WEIGHT = 1.0
+SAVE_WEIGHT = 2.0
+ENGAGEMENT_CURSOR = "trending_engagement"
+ENGAGEMENT_BATCH_SIZE = 5000
+_DELTAS = {change_log.ADDED: 1, change_log.REMOVED: -1}
+_COUNTERS = {change_log.READ: "read_count", change_log.SAVED: "save_count"}
+
+
+def trending_score(source_count: int, recent_count: int, read_count: int, save_count: int,
+                   age_hours: float) -> float:
+    weight = (
+        source_count * SOURCE_WEIGHT
+        + recent_count * VELOCITY_WEIGHT
+        + math.log1p(max(read_count, 0)) * READ_WEIGHT
+        + math.log1p(max(save_count, 0)) * SAVE_WEIGHT
+    )
+    return weight / (max(age_hours, 0.0) + 2) ** GRAVITY
+
+
+def _locked_cursor() -> JobCursor:
+    """Lock the engagement cursor row until commit; a concurrent run waits here."""
+    cursor = JobCursor.query.filter_by(name=ENGAGEMENT_CURSOR).with_for_update().first()
+    if cursor is None:
+        db.session.add(JobCursor(name=ENGAGEMENT_CURSOR, position=0))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another run created it first.
+            db.session.rollback()
+        cursor = JobCursor.query.filter_by(name=ENGAGEMENT_CURSOR).with_for_update().first()
+    return cursor
+
+
+def apply_engagement_changes() -> int:
+    """Fold settled read/save change-log entries since the last run into ArticleEngagement."""
+    cursor = _locked_cursor()
+    settled = change_log.settled_before()
+    applied = 0
+    while True:
+        entries = (
+            db.session.query(
+                ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action, ChangeLog.created_at
+            )
+            .filter(ChangeLog.id > cursor.position, ChangeLog.entity.in_(list(_COUNTERS)))
+            .order_by(ChangeLog.id.asc())
+            .limit(ENGAGEMENT_BATCH_SIZE)
+            .all()
+        )
+        full_batch = len(entries) == ENGAGEMENT_BATCH_SIZE
+        # Like delta sync, never move the cursor past an entry that has not settled.
+        unsettled = next((i for i, entry in enumerate(entries) if entry.created_at > settled), None)
+        if unsettled is not None:
+            entries, full_batch = entries[:unsettled], False
+        if not entries:
+            break
+        deltas: Dict[Tuple[int, str], int] = defaultdict(int)
+        for _, entity, article_id, action, _ in entries:
+            deltas[(article_id, _COUNTERS[entity])] += _DELTAS.get(action, 0)
+
+        article_ids = {article_id for article_id, _ in deltas}
+        totals = {
+            row.article_id: row
+            for row in ArticleEngagement.query.filter(ArticleEngagement.article_id.in_(article_ids))
+        }
+        for (article_id, counter), delta in deltas.items():
+            row = totals.get(article_id)
+            if row is None:
+                row = totals[article_id] = ArticleEngagement(article_id=article_id, read_count=0, save_count=0)
+                db.session.add(row)
+            setattr(row, counter, getattr(row, counter) + delta)
+        cursor.position = entries[-1][0]
+        applied += len(entries)
+        if not full_batch:
+            break
+    return applied
+
+
+def compute_trending_scores() -> None:
+    """Recompute StoryScore for stories with articles in the trending window."""
+    applied = apply_engagement_changes()
+    now = datetime.utcnow()
+    velocity_cutoff = now - timedelta(hours=VELOCITY_HOURS)
+    stories = (
+        db.session.query(
+            Article.cluster_id,
+            func.max(Article.category),
+            func.count(func.distinct(Article.source_domain)),
+            func.count(Article.id),
+            func.sum(case((Article.created_at >= velocity_cutoff, 1), else_=0)),
+            func.coalesce(func.sum(ArticleEngagement.read_count), 0),
+            func.coalesce(func.sum(ArticleEngagement.save_count), 0),
+            func.min(Article.created_at),
+            func.max(Article.created_at),
+        )
+        .outerjoin(ArticleEngagement, ArticleEngagement.article_id == Article.id)
+        .filter(
+            Article.cluster_id.isnot(None),
+            Article.created_at >= now - timedelta(hours=TRENDING_WINDOW_HOURS),
+        )
+        .group_by(Article.cluster_id)
+        .all()
+    )
+    rows = [
+        {
+            "cluster_id": cluster_id,
+            "score": trending_score(sources, recent, reads, saves, (now - first_at).total_seconds() / 3600),
+            "category": category,
+            "source_count": sources,
+            "article_count": articles,
+            "recent_count": recent,
+            "read_count": reads,
+            "save_count": saves,
+            "latest_at": latest_at,
+            "computed_at": now,
+        }
+        for cluster_id, category, sources, articles, recent, reads, saves, first_at, latest_at in stories
+    ]
+    StoryScore.query.delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(StoryScore), rows)
+    db.session.commit()
+    print(f"Scored {len(rows)} trending stories ({applied} engagement changes).")
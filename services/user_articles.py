@@ -0,0 +1,81 @@
+"""Batched writes of per-user saved/read entries.
+
+Inserts use the dialect's ``INSERT ... ON CONFLICT DO NOTHING ... RETURNING``
+so a batch is one statement, duplicates (including concurrent ones) are
+skipped by the unique constraint, and only newly inserted ids come back.
+"""
+
+from collections import defaultdict
+from typing import Iterable, List, Sequence, Set, Tuple
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.models import Article, db
+from services import change_log
+
+MAX_BULK_ARTICLES = 500
+
+
+def parse_article_ids(value) -> List[int]:
+    """Validate a request's article id list; order is kept and duplicates dropped."""
+    if not isinstance(value, list) or not value:
+        raise ValueError("article_ids must be a non-empty list.")
+    if len(value) > MAX_BULK_ARTICLES:
+        raise ValueError(f"At most {MAX_BULK_ARTICLES} article_ids per request.")
+    # No coercion: 1.5, true and "3" are client bugs, not ids.
+    if any(type(item) is not int or item <= 0 for item in value):
+        raise ValueError("article_ids must be positive integers.")
+    return list(dict.fromkeys(value))
+
+
+def existing_article_ids(article_ids: Iterable[int]) -> Set[int]:
+    article_ids = list(article_ids)
+    if not article_ids:
+        return set()
+    return {aid for (aid,) in db.session.query(Article.id).filter(Article.id.in_(article_ids))}
+
+
+def _insert_ignoring_duplicates(entry_model):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(entry_model).on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+    if dialect == "sqlite":
+        return sqlite.insert(entry_model).on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+    return None
+
+
+def insert_entries(entry_model, entity: str, user_id: int, article_ids: List[int]) -> List[int]:
+    """Insert entries for existing ``article_ids`` and log them; return the newly added ids.
+
+    The caller commits, so the entries and their change-log rows land together.
+    """
+    return [aid for _, aid in insert_pairs(entry_model, entity, [(user_id, aid) for aid in article_ids])]
+
+
+def insert_pairs(entry_model, entity: str, pairs: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Insert (user_id, article_id) entries for any number of users; return the new pairs."""
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return []
+    rows = [{"user_id": user_id, "article_id": aid} for user_id, aid in pairs]
+    statement = _insert_ignoring_duplicates(entry_model)
+    if statement is not None:
+        returning = statement.returning(entry_model.user_id, entry_model.article_id)
+        # RETURNING order is not guaranteed across batches; report in request order.
+        returned = {(user_id, aid) for user_id, aid in db.session.execute(returning, rows)}
+        inserted = [pair for pair in pairs if pair in returned]
+    else:
+        # Other databases: skip known duplicates, then a plain insert.
+        key = tuple_(entry_model.user_id, entry_model.article_id)
+        already = set(db.session.query(entry_model.user_id, entry_model.article_id).filter(key.in_(pairs)))
+        inserted = [pair for pair in pairs if pair not in already]
+        if inserted:
+            db.session.execute(insert(entry_model), [{"user_id": u, "article_id": a} for u, a in inserted])
+
+    by_user = defaultdict(list)
+    for user_id, aid in inserted:
+        by_user[user_id].append(aid)
+    for user_id, article_ids in by_user.items():
+        change_log.record_changes(entity, article_ids, change_log.ADDED, user_id=user_id)
+    return inserted
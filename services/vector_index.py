@@ -0,0 +1,112 @@
+"""In-process top-k lookup over stored article embeddings.
+
+Each API process keeps the last ``VECTOR_INDEX_DAYS`` of embeddings as one
+contiguous float32 matrix. Vectors are normalized, so a query is a single
+matrix-vector product plus ``argpartition``; 1M x 384 is roughly 1.5 GB and a
+few tens of ms per query on one core, so size the window to the host. The index
+is persisted as ArticleEmbedding rows and refreshed incrementally: every
+``VECTOR_INDEX_REFRESH_SECONDS`` only rows newer than the last load are read,
+and a full reload once a day drops rows that aged out of the window.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.models import ArticleEmbedding, db
+from services.embeddings import EMBEDDING_MODEL, from_bytes
+
+VECTOR_INDEX_DAYS = int(os.getenv("VECTOR_INDEX_DAYS", "30"))
+VECTOR_INDEX_REFRESH_SECONDS = int(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "60"))
+_FULL_RELOAD_SECONDS = 24 * 3600
+
+
+class VectorIndex:
+    """Immutable snapshot; ``extended`` returns a new index so readers never see a partial update."""
+
+    def __init__(self, ids=None, matrix=None):
+        self.ids = ids if ids is not None else np.empty(0, dtype=np.int64)
+        self.matrix = matrix if matrix is not None else np.empty((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def extended(self, ids: List[int], vectors: np.ndarray) -> "VectorIndex":
+        if not ids:
+            return self
+        # Re-embedded articles replace their previous row.
+        keep = ~np.isin(self.ids, ids)
+        matrix = self.matrix[keep] if len(self) else np.empty((0, vectors.shape[1]), dtype=np.float32)
+        return VectorIndex(
+            np.concatenate([self.ids[keep], np.asarray(ids, dtype=np.int64)]),
+            np.vstack([matrix, vectors.astype(np.float32, copy=False)]),
+        )
+
+    def search(self, vector: np.ndarray, k: int, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (article_id, cosine similarity) pairs, best first."""
+        if not len(self) or k <= 0:
+            return []
+        scores = self.matrix @ vector.astype(np.float32, copy=False)
+        exclude = np.asarray(list(exclude), dtype=np.int64)
+        if len(exclude):
+            scores[np.isin(self.ids, exclude)] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+_LOCK = threading.Lock()
+_INDEX = VectorIndex()
+_loaded_until: Optional[datetime] = None
+_refreshed_at = float("-inf")
+_reloaded_at = float("-inf")
+
+
+def _load_rows(since: Optional[datetime], cutoff: datetime):
+    query = db.session.query(
+        ArticleEmbedding.article_id, ArticleEmbedding.created_at, ArticleEmbedding.vector
+    ).filter(ArticleEmbedding.model == EMBEDDING_MODEL, ArticleEmbedding.created_at >= cutoff)
+    if since is not None:
+        query = query.filter(ArticleEmbedding.created_at > since)
+    return query.order_by(ArticleEmbedding.created_at).all()
+
+
+def get_index() -> VectorIndex:
+    """Return the process-wide index, loading rows added since the last refresh."""
+    global _INDEX, _loaded_until, _refreshed_at, _reloaded_at
+    now = time.monotonic()
+    if now - _refreshed_at < VECTOR_INDEX_REFRESH_SECONDS:
+        return _INDEX
+    with _LOCK:
+        if now - _refreshed_at < VECTOR_INDEX_REFRESH_SECONDS:
+            return _INDEX
+        # A daily full reload drops rows that left the window.
+        full_reload = now - _reloaded_at >= _FULL_RELOAD_SECONDS
+        index = VectorIndex() if full_reload else _INDEX
+        since = None if full_reload else _loaded_until
+        rows = _load_rows(since, datetime.utcnow() - timedelta(days=VECTOR_INDEX_DAYS))
+        if rows:
+            index = index.extended(
+                [article_id for article_id, _, _ in rows],
+                np.vstack([from_bytes(vector) for _, _, vector in rows]),
+            )
+            _loaded_until = rows[-1][1]
+        _INDEX = index
+        _refreshed_at = now
+        if full_reload:
+            _reloaded_at = now
+    return _INDEX
+
+
+def reset_index() -> None:
+    """Forget everything loaded; the next get_index() reloads from the database."""
+    global _INDEX, _loaded_until, _refreshed_at, _reloaded_at
+    with _LOCK:
+        _INDEX = VectorIndex()
+        _loaded_until = None
+        _refreshed_at = _reloaded_at = float("-inf")
@@ -1,8 +1,7 @@
 import json
-import re
 from typing import Any, Dict
 
-from services.ai_engine import client
+from services.llm_client import LLMError, chat_completion, extract_json_object
 from services.viral_prompts import build_messages
 
 
@@ -10,16 +9,6 @@ class ViralPostError(Exception):
     pass
 
 
-def _extract_json_object(text: str) -> Dict[str, Any]:
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            raise
-        return json.loads(match.group(0))
-
-
 def generate_viral_post(
     *,
     summary: str,
@@ -32,9 +21,6 @@ def generate_viral_post(
     fact_mode: str,
     model: str = "gpt-4o-mini",
 ) -> Dict[str, Any]:
-    if client is None:
-        raise ViralPostError("OpenAI client not configured.")
-
     messages = build_messages(
         summary=summary,
         platform=platform,
@@ -47,18 +33,17 @@ def generate_viral_post(
     )
 
     try:
-        response = client.chat.completions.create(
+        content = chat_completion(
+            messages,
             model=model,
-            messages=messages,
             temperature=0.4,
             response_format={"type": "json_object"},
         )
-    except Exception as exc:
+    except LLMError as exc:
         raise ViralPostError(f"OpenAI request failed: {exc}") from exc
 
-    content = response.choices[0].message.content or ""
     try:
-        data = _extract_json_object(content)
+        data = extract_json_object(content)
     except json.JSONDecodeError as exc:
         raise ViralPostError("Model did not return valid JSON.") from exc
 
@@ -0,0 +1,97 @@
+"""Micro-benchmark serialization and compression of a 200-story feed payload.
+
+Usage::
+
+    python tests/bench_json_payload.py --stories 200 --sources 4 --iterations 200
+
+Compares the previous path (isoformat per row, sorted-key stdlib json) with the
+app's JSON provider, and reports gzip/brotli sizes and timings for the result.
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from flask import Flask  # noqa: E402
+
+from utils import compression  # noqa: E402
+from utils.json_provider import JSONProvider, orjson  # noqa: E402
+
+
+def build_payload(stories: int, sources: int, iso_strings: bool):
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    items = []
+    for index in range(stories):
+        timestamp = base - timedelta(minutes=index, microseconds=index)
+        items.append({
+            "cluster_id": 1_700_000_000 + index,
+            "story_title": f"Officials respond as story {index} develops across several outlets",
+            "summary": "- First key point of the story.\n- Second key point with detail.\n- Third point.",
+            "sources": [
+                {
+                    "article_id": index * sources + s,
+                    "name": f"www.source{s}.example.com",
+                    "url": f"https://www.source{s}.example.com/news/{index}/story-slug",
+                    "title": f"Source {s} headline for story {index}",
+                }
+                for s in range(sources)
+            ],
+            "timestamp": timestamp.isoformat() if iso_strings else timestamp,
+            "lead_article_id": index * sources,
+        })
+    return {"stories": items, "count": stories, "limit": stories, "next_cursor": "abc", "prev_cursor": None}
+
+
+def _time(func, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(stories: int, sources: int, iterations: int):
+    provider = JSONProvider(Flask(__name__))
+
+    def legacy():
+        # Mirrors the old route path: isoformat per row, then Flask's default dumps.
+        return json.dumps(build_payload(stories, sources, iso_strings=True), sort_keys=True)
+
+    def current():
+        return provider.dumps(build_payload(stories, sources, iso_strings=False))
+
+    body = current().encode("utf-8")
+    report = {
+        "serializer": "orjson" if orjson is not None else "json",
+        "raw_bytes": len(body),
+        "legacy_build_and_dumps_ms": round(_time(legacy, iterations), 3),
+        "provider_build_and_dumps_ms": round(_time(current, iterations), 3),
+        "gzip_bytes": len(compression._compress(body, "gzip")),
+        "gzip_ms": round(_time(lambda: compression._compress(body, "gzip"), iterations), 3),
+    }
+    if compression.brotli is not None:
+        report["brotli_bytes"] = len(compression._compress(body, "br"))
+        report["brotli_ms"] = round(_time(lambda: compression._compress(body, "br"), iterations), 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.stories, args.sources, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
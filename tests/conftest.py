@@ -0,0 +1,38 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Return a factory that reloads the app against a fresh SQLite database.
+
+    ``make_app(seed, **env)`` sets ``env`` as environment variables, reloads the
+    app, recreates the tables and calls ``seed(app_module, models)`` inside an
+    app context. It returns ``(app_module, <seed's return value>)``.
+    """
+
+    def factory(seed=None, **env):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{Path(tmp_path) / 'app.db'}")
+        monkeypatch.setenv("SECRET_KEY", "test-secret")
+        monkeypatch.setenv("RUN_BACKGROUND_JOBS", "false")
+        monkeypatch.setenv("TESTING", "1")
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        app_module = importlib.import_module("app")
+        importlib.reload(app_module)
+        models = importlib.import_module("models.models")
+        with app_module.app.app_context():
+            app_module.db.drop_all()
+            app_module.db.create_all()
+            seeded = seed(app_module, models) if seed else None
+        return app_module, seeded
+
+    return factory
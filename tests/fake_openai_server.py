@@ -0,0 +1,286 @@
+"""Local stand-in for the OpenAI chat completions API, for load and latency testing.
+
+Responses are deterministic for a given request body and match the JSON schemas
+the joke/comment/viral/analysis/summary generators expect. Latency, 5xx errors
+and 429s can be injected, and ``"stream": true`` requests are answered with SSE
+chunks like the real API.
+
+Run standalone with ``python tests/fake_openai_server.py --port 8099`` and point
+the app at it with ``OPENAI_BASE_URL=http://127.0.0.1:8099/v1``.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAIConfig:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: float = 0.05,
+        stream_chunk_chars: int = 24,
+        seed: int = 1234,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.stream_chunk_chars = stream_chunk_chars
+        self.seed = seed
+
+
+def _detect_kind(messages) -> str:
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system").lower()
+    if "joke" in system:
+        return "joke"
+    if "copywriter" in system:
+        return "viral"
+    if "comments" in system:
+        return "comment"
+    if "analyst" in system:
+        return "analysis"
+    if "summarizer" in system:
+        return "summary"
+    return "bullets"
+
+
+def _max_variants(messages, default: int = 1) -> int:
+    user = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
+    match = re.search(r"Max variants:\s*(\d+)", user)
+    return max(1, int(match.group(1))) if match else default
+
+
+def build_content(messages) -> str:
+    """Deterministic completion text for a request, shaped for the detected generator."""
+    kind = _detect_kind(messages)
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    count = _max_variants(messages)
+
+    if kind == "joke":
+        jokes = [
+            {
+                "style": "one_liner",
+                "setup": f"Setup {digest}-{i}",
+                "punchline": f"Punchline {digest}-{i}",
+                "full_joke": f"Setup {digest}-{i} Punchline {digest}-{i}",
+                "cta": "Share if you laughed.",
+            }
+            for i in range(count)
+        ]
+        return json.dumps({"best_variant_index": 0, "warnings": [], "jokes": jokes})
+    if kind == "comment":
+        variants = [{"text": f"Comment {digest}-{i}"} for i in range(count)]
+        return json.dumps({"platform": "General", "style": "neutral", "audience": "general", "variants": variants})
+    if kind == "viral":
+        variants = [{"text": f"Post {digest}-{i}"} for i in range(count)]
+        return json.dumps({"platform": "twitter", "variants": variants})
+    if kind == "analysis":
+        variants = [
+            {
+                "title": f"Analysis {digest}-{i}",
+                "hook": "Why it matters.",
+                "analysis": f"Analysis body {digest}-{i}.",
+                "key_takeaways": ["Takeaway."],
+                "counterpoints": ["Counterpoint."],
+                "what_to_watch": ["Next step."],
+                "reading_time_seconds": 120,
+            }
+            for i in range(3)
+        ]
+        return json.dumps({"best_variant_index": 0, "warnings": [], "variants": variants})
+    if kind == "summary":
+        return json.dumps({"summary": f"Summary {digest}.", "warnings": []})
+    return f"- Point one ({digest})\n- Point two\n- Point three"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeOpenAIServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        body = json.loads(raw or b"{}")
+        outcome, delay = self.server.next_outcome()
+        time.sleep(delay)
+
+        if outcome == "rate_limited":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                headers={"Retry-After": str(self.server.config.retry_after_seconds)},
+            )
+            return
+        if outcome == "error":
+            self._send_json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+            return
+
+        messages = body.get("messages", [])
+        model = body.get("model", "gpt-4o-mini")
+        content = build_content(messages)
+        self.server.record("ok", _detect_kind(messages))
+
+        if body.get("stream"):
+            self._stream(model, content)
+            return
+
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        self._send_json(200, {
+            "id": f"chatcmpl-fake-{hashlib.sha1(raw).hexdigest()[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, model: str, content: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        size = self.server.config.stream_chunk_chars
+        for start in range(0, len(content), size):
+            chunk = {
+                "id": "chatcmpl-fake-stream",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        final = {
+            "id": "chatcmpl-fake-stream",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: FakeOpenAIConfig = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.config = config or FakeOpenAIConfig()
+        self.stats = Counter()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _latency_seconds(self) -> float:
+        config = self.config
+        if config.latency_ms <= 0:
+            return 0.0
+        if config.latency_distribution == "uniform":
+            return self._random.uniform(0, 2 * config.latency_ms) / 1000.0
+        if config.latency_distribution == "lognormal":
+            # latency_ms is the median of the distribution.
+            return self._random.lognormvariate(0, config.latency_sigma) * config.latency_ms / 1000.0
+        return config.latency_ms / 1000.0
+
+    def next_outcome(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            delay = self._latency_seconds()
+            if roll < self.config.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return "rate_limited", delay
+            if roll < self.config.rate_limit_rate + self.config.error_rate:
+                self.stats["errors"] += 1
+                return "error", delay
+            return "ok", delay
+
+    def record(self, outcome: str, kind: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats[f"kind:{kind}"] += 1
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    server = FakeOpenAIServer(config, port=args.port)
+    print(f"Fake OpenAI server listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local stand-in for an SMTP provider, for email outbox tests and load runs.
+
+Accepted messages are kept in memory (parsed) and counted. Latency, temporary
+failures (``451`` after DATA) and permanently rejected recipients (``550`` at
+RCPT) can be injected.
+
+Run standalone with ``python tests/fake_smtp_server.py --port 8025`` and point
+the app at it with ``EMAIL_BACKEND=smtp SMTP_HOST=127.0.0.1 SMTP_PORT=8025``.
+"""
+
+import argparse
+import email
+import random
+import socketserver
+import threading
+import time
+from collections import Counter
+from email import policy
+
+
+class FakeSMTPConfig:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        temp_failure_rate: float = 0.0,
+        fail_first: int = 0,
+        rejected_recipients=(),
+        seed: int = 1234,
+    ):
+        self.latency_ms = latency_ms
+        self.temp_failure_rate = temp_failure_rate
+        # The first ``fail_first`` messages get a temporary failure regardless of the rate.
+        self.fail_first = fail_first
+        self.rejected_recipients = {r.lower() for r in rejected_recipients}
+        self.seed = seed
+
+
+def _address(argument: str) -> str:
+    start, end = argument.find("<"), argument.find(">")
+    return argument[start + 1:end].strip().lower() if start != -1 and end > start else argument.strip().lower()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    def handle(self):
+        server = self.server
+        server.record("connections")
+        self._reply("220 fake-smtp ready")
+        sender, recipients = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            command, _, argument = line.partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                self._reply("250-fake-smtp")
+                self._reply("250 8BITMIME")
+            elif command == "HELO":
+                self._reply("250 fake-smtp")
+            elif command == "MAIL":
+                sender, recipients = _address(argument.partition(":")[2]), []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                recipient = _address(argument.partition(":")[2])
+                if recipient in server.config.rejected_recipients:
+                    server.record("rejected")
+                    self._reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(recipient)
+                    self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                outcome, delay = server.next_outcome()
+                if delay:
+                    time.sleep(delay)
+                if outcome == "temp_failure":
+                    self._reply("451 Temporary failure, try again later")
+                else:
+                    server.accept(sender, recipients, data)
+                    self._reply("250 OK queued")
+                sender, recipients = None, []
+            elif command == "RSET":
+                sender, recipients = None, []
+                self._reply("250 OK")
+            elif command == "NOOP":
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, config: FakeSMTPConfig = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.config = config or FakeSMTPConfig()
+        self.stats = Counter()
+        self.messages = []
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def next_outcome(self):
+        with self._lock:
+            self.stats["messages"] += 1
+            delay = self.config.latency_ms / 1000.0
+            if self.stats["messages"] <= self.config.fail_first or self._random.random() < self.config.temp_failure_rate:
+                self.stats["temp_failures"] += 1
+                return "temp_failure", delay
+            return "ok", delay
+
+    def accept(self, sender: str, recipients, data: bytes) -> None:
+        message = email.message_from_bytes(data, policy=policy.default)
+        with self._lock:
+            self.stats["accepted"] += 1
+            self.messages.append({"from": sender, "to": list(recipients), "message": message})
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def start(self) -> "FakeSMTPServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--temp-failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FakeSMTPConfig(latency_ms=args.latency_ms, temp_failure_rate=args.temp_failure_rate)
+    server = FakeSMTPServer(config, port=args.port)
+    print(f"Fake SMTP server listening on 127.0.0.1:{server.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Drive the summarizer and the generate endpoints against the fake OpenAI server.
+
+Usage::
+
+    python tests/llm_load_harness.py --requests 500 --concurrency 32 --latency-ms 400
+
+Reports throughput and latency percentiles for both paths, plus what the fake
+server saw (including injected 429s/5xx that the client retried).
+"""
+
+import argparse
+import importlib
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import jwt
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_openai_server import FakeOpenAIConfig, FakeOpenAIServer  # noqa: E402
+
+SUMMARY = "The city council approved a new transit budget on Monday after a long public debate."
+
+GENERATE_REQUESTS = [
+    ("/api/news/generate-joke", {"summary": SUMMARY, "max_variants": 2}),
+    (
+        "/api/news/generate-comment",
+        {"summary": SUMMARY, "platform": "General", "style": "neutral", "audience": "general"},
+    ),
+    (
+        "/api/news/generate-viral-post",
+        {
+            "summary": SUMMARY,
+            "platform": "twitter",
+            "tone": "upbeat",
+            "goal": "engagement",
+            "audience": "commuters",
+            "brand_voice": "friendly",
+        },
+    ),
+    ("/api/news/generate-analysis", {"summary": SUMMARY}),
+    ("/api/news/generate-summary", {"text": SUMMARY * 3}),
+]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _latency_report(latencies, elapsed):
+    return {
+        "count": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+
+def _create_app(db_path):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "load-test-secret")
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    app_module = importlib.import_module("app")
+    importlib.reload(app_module)
+    return app_module
+
+
+def run_load(config: FakeOpenAIConfig, *, requests=100, concurrency=8, articles=30, db_path=None):
+    """Run both load phases against a fresh fake server and return a report dict."""
+    llm_client = importlib.import_module("services.llm_client")
+    db_path = db_path or Path(tempfile.mkdtemp()) / "llm_load.db"
+
+    with FakeOpenAIServer(config) as server:
+        os.environ["OPENAI_API_KEY"] = "sk-fake"
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        llm_client.reset_client()
+        try:
+            app_module = _create_app(db_path)
+            report = {
+                "summarizer": _run_summarizer(app_module, articles),
+                "endpoints": _run_endpoints(app_module, requests, concurrency),
+            }
+        finally:
+            llm_client.reset_client()
+            os.environ.pop("OPENAI_BASE_URL", None)
+        report["server"] = dict(server.stats)
+    return report
+
+
+def _run_summarizer(app_module, articles):
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    ai_engine = importlib.import_module("services.ai_engine")
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add_all([
+            models.Article(
+                title=f"Load test article {i}",
+                source_url=f"https://load.example.com/{i}",
+                source_domain="load.example.com",
+                raw_content=f"{SUMMARY} Paragraph {i} adds detail about the vote. " * 20,
+                category="World",
+            )
+            for i in range(articles)
+        ])
+        db.session.commit()
+
+        started = time.perf_counter()
+        # Each run handles one batch; bound the rounds so injected failures cannot loop forever.
+        for _ in range(math.ceil(articles / 10) + 2):
+            ai_engine.process_unsummarized_news()
+        elapsed = time.perf_counter() - started
+
+        summarized = models.Article.query.filter(models.Article.ai_summary.isnot(None)).count()
+        failed = models.Article.query.filter(models.Article.summary_error.isnot(None)).count()
+
+    return {
+        "articles": articles,
+        "summarized": summarized,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "articles_per_s": round(summarized / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def _run_endpoints(app_module, requests, concurrency):
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+
+    with app.app_context():
+        user = models.User(email="load@example.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def call(index):
+        path, payload = GENERATE_REQUESTS[index % len(GENERATE_REQUESTS)]
+        with app.test_client() as client:
+            started = time.perf_counter()
+            response = client.post(path, json=payload, headers=headers)
+            return path, response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    report = _latency_report([latency for _, _, latency in results], elapsed)
+    report["concurrency"] = concurrency
+    report["statuses"] = dict(Counter(status for _, status, _ in results))
+    report["by_endpoint"] = {
+        path: _latency_report([lat for p, _, lat in results if p == path], elapsed)
+        for path, _ in GENERATE_REQUESTS
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    report = run_load(
+        config,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        articles=args.articles,
+    )
+
+    summarizer = report["summarizer"]
+    endpoints = report["endpoints"]
+    print(
+        f"Summarizer: {summarizer['summarized']}/{summarizer['articles']} summarized "
+        f"({summarizer['failed']} failed) in {summarizer['elapsed_s']}s "
+        f"-> {summarizer['articles_per_s']} articles/s"
+    )
+    print(
+        f"Endpoints:  {endpoints['count']} requests @ concurrency {endpoints['concurrency']} "
+        f"-> {endpoints['throughput_per_s']} req/s, p50 {endpoints['p50_ms']}ms, "
+        f"p95 {endpoints['p95_ms']}ms, p99 {endpoints['p99_ms']}ms, statuses {endpoints['statuses']}"
+    )
+    for path, stats in endpoints["by_endpoint"].items():
+        print(f"  {path:<34} p50 {stats['p50_ms']}ms  p95 {stats['p95_ms']}ms")
+    print(f"Fake server: {report['server']}")
+
+
+if __name__ == "__main__":
+    main()
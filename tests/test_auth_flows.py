@@ -80,3 +80,22 @@ def test_auth_flow_register_confirm_reset_change(tmp_path, monkeypatch):
             headers={"Authorization": f"Bearer {token}"},
         )
         assert change_response.status_code == 200
+
+
+def test_auth_rate_limit_uses_forwarded_client_behind_trusted_proxy(make_app, monkeypatch):
+    app_module, _ = make_app(TRUSTED_PROXY_COUNT="1")
+    auth_routes = importlib.import_module("routes.auth")
+    monkeypatch.setattr(auth_routes, "IP_RATE_LIMIT", (2, 300))
+    app = app_module.app
+
+    def login(client_ip, email):
+        return app.test_client().post(
+            "/api/auth/login",
+            json={"email": email, "password": "wrongpassword"},
+            headers={"X-Forwarded-For": client_ip},
+            environ_base={"REMOTE_ADDR": "10.0.0.1"},
+        ).status_code
+
+    # Every request arrives from the proxy, but each client gets its own budget.
+    assert [login("203.0.113.7", f"a{i}@example.com") for i in range(3)] == [401, 401, 429]
+    assert login("198.51.100.9", "b@example.com") == 401
@@ -0,0 +1,127 @@
+import importlib
+import threading
+
+
+class FakeRedis:
+    def __init__(self):
+        self.zsets = {}
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if low <= score <= high]:
+            del zset[member]
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyrank(self, key, start, end):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        end = len(ordered) + end if end < 0 else end
+        if end < start:
+            return
+        for member, _ in ordered[start:end + 1]:
+            del self.zsets[key][member]
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zrange(self, key, start, end, withscores=False):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return ordered[start:end + 1]
+
+    def expire(self, key, seconds):
+        return True
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def _seed(app_module, models):
+    user = models.User(email="login@example.com", is_email_confirmed=True)
+    user.set_password("correct-password")
+    app_module.db.session.add(user)
+    app_module.db.session.commit()
+
+
+def _setup_app(make_app, monkeypatch):
+    passwords = importlib.import_module("utils.passwords")
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    app_module, _ = make_app(_seed)
+    return app_module, importlib.import_module("models.models"), passwords
+
+
+def _login(client, password, ip="10.0.0.1", email="login@example.com"):
+    return client.post(
+        "/api/auth/login",
+        json={"email": email, "password": password},
+        environ_base={"REMOTE_ADDR": ip},
+    )
+
+
+def test_login_floods_are_rejected_before_bcrypt(make_app, monkeypatch):
+    app_module, models, passwords = _setup_app(make_app, monkeypatch)
+    rate_limit = importlib.import_module("utils.rate_limit")
+    auth_routes = importlib.import_module("routes.auth")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(rate_limit, "get_redis_client", lambda: fake_redis)
+    monkeypatch.setattr(auth_routes, "EMAIL_RATE_LIMIT", (3, 900))
+    checks = []
+    real_checkpw = passwords.bcrypt.checkpw
+    monkeypatch.setattr(passwords.bcrypt, "checkpw", lambda *args: checks.append(1) or real_checkpw(*args))
+
+    with app_module.app.test_client() as client:
+        for attempt in range(3):
+            assert _login(client, "wrong-password", ip=f"10.0.0.{attempt}").status_code == 401
+        limited = _login(client, "correct-password", ip="10.0.0.9")
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) > 0
+        assert len(checks) == 3
+
+        # Other accounts are unaffected until the IP itself floods.
+        assert _login(client, "whatever", email="other@example.com").status_code == 401
+
+
+def test_ip_limit_falls_back_to_process_without_redis(make_app, monkeypatch):
+    app_module, models, passwords = _setup_app(make_app, monkeypatch)
+    auth_routes = importlib.import_module("routes.auth")
+    monkeypatch.setattr(auth_routes, "IP_RATE_LIMIT", (2, 300))
+
+    with app_module.app.test_client() as client:
+        assert _login(client, "wrong", email="a@example.com").status_code == 401
+        assert _login(client, "wrong", email="b@example.com").status_code == 401
+        assert _login(client, "wrong", email="c@example.com").status_code == 429
+        assert _login(client, "wrong", email="c@example.com", ip="10.0.0.2").status_code == 401
+
+
+def test_login_rehashes_when_cost_changes_and_sheds_load_when_busy(make_app, monkeypatch):
+    app_module, models, passwords = _setup_app(make_app, monkeypatch)
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 5)
+
+    with app_module.app.app_context():
+        changed_at = models.User.query.one().password_changed_at
+
+    with app_module.app.test_client() as client:
+        assert _login(client, "correct-password").status_code == 200
+        with app_module.app.app_context():
+            user = models.User.query.one()
+            assert user.password_hash.startswith("$2b$05$")
+            assert user.password_changed_at == changed_at
+        assert _login(client, "correct-password").status_code == 200
+
+        monkeypatch.setattr(passwords, "_slots", threading.BoundedSemaphore(1))
+        passwords._slots.acquire()
+        busy = _login(client, "correct-password")
+        assert busy.status_code == 503
+        assert busy.headers["Retry-After"] == "1"
@@ -0,0 +1,99 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+def test_changes_endpoint_returns_only_what_changed(make_app, monkeypatch):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    change_log = importlib.import_module("services.change_log")
+    summary_queue = importlib.import_module("services.summary_queue")
+    monkeypatch.setattr(change_log, "CHANGE_LOG_SETTLE_SECONDS", 0)
+
+    with app.app_context():
+        users = []
+        for email in ("sync@example.com", "other@example.com"):
+            user = models.User(email=email)
+            user.set_password("password")
+            db.session.add(user)
+            users.append(user)
+        articles = [
+            models.Article(
+                title=f"Story {index}",
+                source_url=f"https://example.com/{index}",
+                source_domain="example.com",
+                ai_summary="summary",
+                category="Tech",
+                cluster_id=10 + index,
+            )
+            for index in range(3)
+        ]
+        pending = models.Article(title="Pending", source_url="https://example.com/pending")
+        db.session.add_all(articles + [pending])
+        db.session.commit()
+        article_ids = [a.id for a in articles]
+        pending_id = pending.id
+        tokens = [jwt.encode({"user_id": u.id}, app.config["SECRET_KEY"], algorithm="HS256") for u in users]
+
+    headers, other_headers = ({"Authorization": f"Bearer {token}"} for token in tokens)
+
+    with app.test_client() as client:
+        cursor = client.get("/api/news/changes", headers=headers).get_json()["next_cursor"]
+
+        client.post("/api/news/save", json={"article_id": article_ids[0]}, headers=headers)
+        client.post("/api/news/save", json={"article_id": article_ids[1]}, headers=headers)
+        assert client.delete(f"/api/news/save/{article_ids[1]}", headers=headers).status_code == 200
+        assert client.delete(f"/api/news/save/{article_ids[2]}", headers=headers).status_code == 404
+        client.post("/api/news/read", json={"article_id": article_ids[2]}, headers=headers)
+        client.post("/api/news/save", json={"article_id": article_ids[2]}, headers=other_headers)
+
+        with app.app_context():
+            summary_queue.record_summary_success(db.session.get(models.Article, pending_id), "new summary")
+            change_log.record_changes(change_log.STORY, [10, 99], change_log.UPSERTED)
+            change_log.record_changes(change_log.STORY, [11], change_log.REMOVED)
+            db.session.commit()
+
+        payload = client.get(f"/api/news/changes?since={cursor}", headers=headers).get_json()
+        assert [story["cluster_id"] for story in payload["stories"]["updated"]] == [10]
+        assert sorted(payload["stories"]["removed"]) == [11, 99]
+        assert [a["article_id"] for a in payload["articles"]["updated"]] == [pending_id]
+        assert payload["articles"]["updated"][0]["summary"] == "new summary"
+        assert payload["saved"] == {"added": [article_ids[0]], "removed": [article_ids[1]]}
+        assert payload["read"] == {"added": [article_ids[2]], "removed": []}
+        assert payload["has_more"] is False
+
+        paged = client.get(f"/api/news/changes?since={cursor}&limit=2", headers=headers).get_json()
+        assert paged["has_more"] is True
+
+        quiet = client.get(f"/api/news/changes?since={payload['next_cursor']}", headers=headers).get_json()
+        assert quiet["stories"] == {"updated": [], "removed": []}
+        assert quiet["saved"] == {"added": [], "removed": []}
+
+        # Entries younger than the settle window are held back and the cursor stays put,
+        # since a transaction with a lower id could still commit.
+        monkeypatch.setattr(change_log, "CHANGE_LOG_SETTLE_SECONDS", 60)
+        client.post("/api/news/save", json={"article_id": article_ids[2]}, headers=headers)
+        held = client.get(f"/api/news/changes?since={payload['next_cursor']}", headers=headers).get_json()
+        assert held["saved"] == {"added": [], "removed": []}
+        with app.app_context():
+            models.ChangeLog.query.update({"created_at": datetime.utcnow() - timedelta(minutes=2)})
+            db.session.commit()
+        settled = client.get(f"/api/news/changes?since={held['next_cursor']}", headers=headers).get_json()
+        assert settled["saved"] == {"added": [article_ids[2]], "removed": []}
+
+        assert client.get("/api/news/changes?since=nonsense", headers=headers).status_code == 400
+        utils_pagination = importlib.import_module("utils.pagination")
+        stale = utils_pagination.encode_cursor("changes", (datetime.utcnow() - timedelta(days=30), 0))
+        assert client.get(f"/api/news/changes?since={stale}", headers=headers).status_code == 410
+
+    with app.app_context():
+        old = models.ChangeLog(entity="story", entity_id=1, action="upserted",
+                               created_at=datetime.utcnow() - timedelta(days=30))
+        db.session.add(old)
+        db.session.commit()
+        before = models.ChangeLog.query.count()
+        change_log.prune_change_log()
+        assert models.ChangeLog.query.count() == before - 1
@@ -0,0 +1,69 @@
+import importlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+
+def _add_article(db, models, index, topic):
+    article = models.Article(
+        title=f"{topic} story {index}",
+        source_url=f"https://example.com/{index}",
+        source_domain=f"source{index}.com",
+        ai_summary=topic,
+        category="Tech",
+        created_at=datetime.utcnow() - timedelta(minutes=index),
+    )
+    db.session.add(article)
+    db.session.commit()
+    return article.id
+
+
+def test_reclustering_keeps_story_ids_and_logs_only_real_changes(make_app, monkeypatch):
+    app_module, _ = make_app()
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    clustering_engine = importlib.import_module("services.clustering_engine")
+    vectors = {"markets": [1.0, 0.0], "football": [0.0, 1.0]}
+    monkeypatch.setattr(
+        clustering_engine, "embeddings_for",
+        lambda articles: np.array([vectors[a.ai_summary] for a in articles]),
+    )
+    published = []
+    monkeypatch.setattr(clustering_engine, "publish_story_events", published.append)
+    refreshed = []
+    monkeypatch.setattr(clustering_engine, "rebuild_personalized_feeds", lambda: refreshed.append("feeds"))
+    monkeypatch.setattr(clustering_engine, "bump_generation", lambda: refreshed.append("generation"))
+
+    with app_module.app.app_context():
+        ids = [_add_article(db, models, i, topic) for i, topic in enumerate(["markets", "markets", "football"])]
+        clustering_engine.cluster_recent_articles()
+        first = {a.id: a.cluster_id for a in models.Article.query.all()}
+        assert first[ids[0]] == first[ids[1]] != first[ids[2]]
+        assert {event["type"] for event in published[0]} == {"story.created"}
+        # Feeds are rebuilt before cached responses are invalidated.
+        assert refreshed == ["feeds", "generation"]
+        logged = models.ChangeLog.query.count()
+
+        # Nothing moved: no change log entries and no events.
+        clustering_engine.cluster_recent_articles()
+        assert {a.id: a.cluster_id for a in models.Article.query.all()} == first
+        assert models.ChangeLog.query.count() == logged
+        assert len(published) == 1
+
+        # A new source joins the markets story, which keeps its id.
+        new_id = _add_article(db, models, 3, "markets")
+        clustering_engine.cluster_recent_articles()
+        after = {a.id: a.cluster_id for a in models.Article.query.all()}
+        assert after[new_id] == after[ids[0]] == first[ids[0]]
+        assert after[ids[2]] == first[ids[2]]
+        new_entries = models.ChangeLog.query.order_by(models.ChangeLog.id).offset(logged).all()
+        assert {(e.entity, e.entity_id, e.action) for e in new_entries} == {
+            ("article", new_id, "clustered"),
+            ("story", first[ids[0]], "upserted"),
+        }
+        assert [(e["type"], e["cluster_id"], e["source_count"]) for e in published[1]] == [
+            ("story.updated", first[ids[0]], 3)
+        ]
@@ -0,0 +1,86 @@
+import gzip
+import importlib
+import json
+from datetime import datetime, timedelta
+
+import jwt
+
+
+def _seed(app_module, models):
+    db = app_module.db
+    base = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    user = models.User(email="gzip@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    for index in range(40):
+        db.session.add(models.Article(
+            title=f"Story number {index} about compression",
+            source_url=f"https://example.com/{index}",
+            source_domain="example.com",
+            ai_summary="A reasonably long summary that repeats across stories. " * 3,
+            category="Tech",
+            cluster_id=index,
+            created_at=base - timedelta(minutes=index),
+        ))
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app_module.app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_large_responses_are_gzipped_and_keep_iso_timestamps(make_app):
+    app_module, headers = make_app(_seed)
+
+    with app_module.app.test_client() as client:
+        plain = client.get("/api/news/feed?limit=40", headers=headers)
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["Vary"]
+        stories = plain.get_json()["stories"]
+        assert stories[0]["timestamp"] == "2024-05-01T12:00:00.123456"
+
+        zipped = client.get("/api/news/feed?limit=40", headers={**headers, "Accept-Encoding": "gzip, br;q=0"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert int(zipped.headers["Content-Length"]) < len(plain.data)
+        assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+        etag = zipped.headers["ETag"]
+        assert etag.endswith('-gzip"')
+        assert etag == plain.headers["ETag"][:-1] + '-gzip"'
+
+        revalidated = client.get(
+            "/api/news/feed?limit=40", headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+
+        small = client.get("/api/news/story/1", headers={**headers, "Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in small.headers
+
+
+def test_json_provider_matches_stdlib_fallback(make_app, monkeypatch):
+    app_module, _ = make_app()
+    json_provider = importlib.import_module("utils.json_provider")
+    payload = {"timestamp": datetime(2024, 5, 1, 12, 0, 0), "title": "Café", "ids": [1, 2]}
+
+    fast = app_module.app.json.dumps(payload)
+    monkeypatch.setattr(json_provider, "orjson", None)
+    slow = app_module.app.json.dumps(payload)
+    assert json.loads(fast) == json.loads(slow) == {
+        "timestamp": "2024-05-01T12:00:00",
+        "title": "Café",
+        "ids": [1, 2],
+    }
+
+
+def test_jsonify_responses_are_serialized_by_orjson(make_app):
+    def seed(app_module, models):
+        headers = _seed(app_module, models)
+        models.Article.query.filter_by(cluster_id=1).update({"title": "Café opens"})
+        app_module.db.session.commit()
+        return headers
+
+    app_module, headers = make_app(seed)
+
+    with app_module.app.test_client() as client:
+        response = client.get("/api/news/archive?limit=5", headers=headers)
+    assert response.status_code == 200
+    # The stdlib provider escapes non-ASCII (ensure_ascii); orjson writes raw UTF-8.
+    assert "Café opens".encode("utf-8") in response.data
+    assert b'": ' not in response.data
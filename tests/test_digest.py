@@ -0,0 +1,73 @@
+import importlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+
+def _seed(app_module, models):
+    db = app_module.db
+    now = datetime.utcnow()
+    for index, (category, domain) in enumerate([("tech", "a.com"), ("tech", "b.com"), ("sports", "c.com")]):
+        db.session.add(models.Article(
+            title=f"{category} story {index}",
+            source_url=f"https://{domain}/{index}",
+            source_domain=domain,
+            ai_summary=f"Summary {index}",
+            category=category,
+            cluster_id=index + 1,
+            created_at=now - timedelta(hours=index + 1),
+        ))
+    prefs = [
+        (["tech", "sports"], ["a.com"], True),
+        (["sports", "tech", "tech"], ["a.com"], True),
+        (["sports"], [], True),
+        (["sports"], [], False),
+        (["business"], [], True),
+    ]
+    for index, (categories, sources, enabled) in enumerate(prefs):
+        user = models.User(email=f"digest{index}@example.com", is_email_confirmed=True)
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(models.UserPreferences(
+            user_id=user.id,
+            preferred_categories=categories,
+            preferred_sources=sources,
+            digest_time="08:00",
+            digest_enabled=enabled,
+        ))
+    db.session.commit()
+
+
+def test_digests_render_once_per_preference_signature(make_app, monkeypatch):
+    app_module, _ = make_app(_seed)
+    digest_service = importlib.import_module("services.digest_service")
+    monkeypatch.setattr(digest_service, "_current_digest_time", lambda: "08:00")
+
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            digest_service.send_daily_digests()
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        # Rerunning the same slot queues nothing new.
+        digest_service.send_daily_digests()
+        models = importlib.import_module("models.models")
+        queued = models.EmailOutbox.query.all()
+        by_email = {row.to_email: row.body for row in queued}
+
+    assert len(queued) == 3
+    assert set(by_email) == {"digest0@example.com", "digest1@example.com", "digest2@example.com"}
+    assert by_email["digest0@example.com"] == by_email["digest1@example.com"]
+    assert "tech story 0" in by_email["digest0@example.com"]
+    assert "tech story 1" not in by_email["digest0@example.com"]
+    assert "sports story 2" in by_email["digest2@example.com"]
+    # One joined user/preferences query plus one article query per distinct signature.
+    assert len(statements) == 4
@@ -0,0 +1,112 @@
+import importlib
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_smtp_server import FakeSMTPConfig, FakeSMTPServer  # noqa: E402
+
+
+def _setup_app(make_app, monkeypatch):
+    passwords = importlib.import_module("utils.passwords")
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    app_module, _ = make_app()
+    return app_module
+
+
+def test_registration_queues_email_without_contacting_the_provider(make_app, monkeypatch):
+    app_module = _setup_app(make_app, monkeypatch)
+    email_service = importlib.import_module("services.email_service")
+    models = importlib.import_module("models.models")
+
+    def _unreachable():
+        raise OSError("provider down")
+
+    monkeypatch.setattr(email_service, "_open_connection", _unreachable)
+
+    with app_module.app.test_client() as client:
+        response = client.post("/api/auth/register", json={"email": "new@example.com", "password": "password123"})
+        assert response.status_code == 201
+        assert client.post("/api/auth/forgot-password", json={"email": "new@example.com"}).status_code == 200
+
+    with app_module.app.app_context():
+        queued = models.EmailOutbox.query.order_by(models.EmailOutbox.id).all()
+        assert [row.subject for row in queued] == ["Confirm your account", "Reset your password"]
+        assert {row.status for row in queued} == {"pending"}
+
+        # The provider being down only delays delivery.
+        assert email_service.deliver_pending_emails() == 0
+        queued = models.EmailOutbox.query.all()
+        assert {row.status for row in queued} == {"pending"}
+        assert all(row.attempts == 1 and row.next_attempt_at > datetime.utcnow() for row in queued)
+
+
+def test_outbox_delivery_batches_retries_and_deduplicates(make_app, monkeypatch):
+    app_module = _setup_app(make_app, monkeypatch)
+    email_service = importlib.import_module("services.email_service")
+    models = importlib.import_module("models.models")
+    config = FakeSMTPConfig(fail_first=2, rejected_recipients=["bounce@example.com"])
+
+    with FakeSMTPServer(config) as server, app_module.app.app_context():
+        monkeypatch.setattr(email_service, "EMAIL_BACKEND", "smtp")
+        monkeypatch.setattr(email_service, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(email_service, "SMTP_PORT", server.port)
+
+        messages = [
+            {"to_email": f"reader{i}@example.com", "subject": "Hello", "body": f"Body {i}", "idempotency_key": f"k{i}"}
+            for i in range(10)
+        ]
+        messages.append({"to_email": "bounce@example.com", "subject": "Hello", "body": "Bounce"})
+        assert email_service.enqueue_emails(messages) == 11
+        assert email_service.enqueue_email("reader0@example.com", "Hello", "Again", idempotency_key="k0") is False
+        app_module.db.session.commit()
+
+        assert email_service.deliver_pending_emails(batch_size=4, workers=2) == 8
+        rows = {row.to_email: row for row in models.EmailOutbox.query.all()}
+        assert rows["bounce@example.com"].status == "failed"
+        retrying = [row for row in rows.values() if row.status == "pending"]
+        assert len(retrying) == 2 and all(row.attempts == 1 for row in retrying)
+
+        models.EmailOutbox.query.filter_by(status="pending").update({"next_attempt_at": datetime.utcnow()})
+        app_module.db.session.commit()
+        assert email_service.deliver_pending_emails(batch_size=4, workers=2) == 2
+        assert email_service.deliver_pending_emails() == 0
+
+        statuses = [row.status for row in models.EmailOutbox.query.all()]
+        assert statuses.count("sent") == 10
+
+    delivered = sorted(server.messages, key=lambda item: item["to"])
+    assert len(delivered) == 10
+    assert len({item["message"]["Message-ID"] for item in delivered}) == 10
+    # Connections are reused within a worker's share of each batch.
+    assert server.stats["connections"] < server.stats["messages"]
+
+
+def test_stale_sending_rows_are_reclaimed(make_app, monkeypatch):
+    app_module = _setup_app(make_app, monkeypatch)
+    email_service = importlib.import_module("services.email_service")
+    models = importlib.import_module("models.models")
+    sent = []
+
+    class _Recorder:
+        def send(self, message):
+            sent.append(message["To"])
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(email_service, "_open_connection", _Recorder)
+
+    with app_module.app.app_context():
+        email_service.enqueue_email("late@example.com", "Hello", "Body")
+        app_module.db.session.commit()
+        # A worker that died mid-send leaves the row leased until next_attempt_at.
+        models.EmailOutbox.query.update({"status": "sending", "next_attempt_at": datetime.utcnow() + timedelta(minutes=5)})
+        app_module.db.session.commit()
+        assert email_service.deliver_pending_emails() == 0
+
+        models.EmailOutbox.query.update({"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)})
+        app_module.db.session.commit()
+        assert email_service.deliver_pending_emails() == 1
+    assert sent == ["late@example.com"]
@@ -0,0 +1,117 @@
+import importlib
+
+import jwt
+from sqlalchemy import event
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, key):
+        self.storage.pop(key, None)
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    user = models.User(email="etag@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.add(models.Article(
+        title="Story",
+        source_url="https://example.com/story",
+        source_domain="example.com",
+        ai_summary="summary",
+        category="Tech",
+        cluster_id=3,
+    ))
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _count_article_queries(app_module):
+    statements = []
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "article" in statement or "user_preferences" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_feed_and_personalized_revalidate_with_etags(make_app, monkeypatch):
+    app_module, headers = make_app(_seed)
+    response_cache = importlib.import_module("services.response_cache")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: fake_redis)
+
+    with app_module.app.test_client() as client:
+        first = client.get("/api/news/feed?limit=5", headers=headers)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+        statements, stop = _count_article_queries(app_module)
+        try:
+            revalidated = client.get("/api/news/feed?limit=5", headers={**headers, "If-None-Match": etag})
+            compressed = client.get(
+                "/api/news/feed?limit=5",
+                headers={**headers, "If-None-Match": f'W/{etag[:-1]}-gzip"'},
+            )
+            personalized = client.get("/api/news/personalized", headers=headers)
+            personalized_etag = personalized.headers["ETag"]
+            statements.clear()
+            personalized_304 = client.get(
+                "/api/news/personalized", headers={**headers, "If-None-Match": personalized_etag}
+            )
+            assert statements == []
+        finally:
+            stop()
+        assert revalidated.status_code == 304
+        assert revalidated.data == b""
+        assert revalidated.headers["ETag"] == etag
+        assert compressed.status_code == 304
+        assert personalized_304.status_code == 304
+
+        assert client.get("/api/news/story/3", headers=headers).headers["Cache-Control"] == "private, max-age=60"
+
+        client.put("/api/user/preferences", json={"preferred_categories": ["Tech"]}, headers=headers)
+        after_prefs = client.get(
+            "/api/news/personalized", headers={**headers, "If-None-Match": personalized_etag}
+        )
+        assert after_prefs.status_code == 200
+        assert after_prefs.headers["ETag"] != personalized_etag
+
+        response_cache.bump_generation()
+        after_pipeline = client.get("/api/news/feed?limit=5", headers={**headers, "If-None-Match": etag})
+        assert after_pipeline.status_code == 200
+        assert after_pipeline.headers["ETag"] != etag
+
+
+def test_etags_fall_back_to_body_hash_without_redis(make_app, monkeypatch):
+    app_module, headers = make_app(_seed)
+    response_cache = importlib.import_module("services.response_cache")
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: None)
+
+    with app_module.app.test_client() as client:
+        etag = client.get("/api/news/story/3", headers=headers).headers["ETag"]
+        assert client.get("/api/news/story/3", headers={**headers, "If-None-Match": etag}).status_code == 304
+        assert client.get("/api/news/story/3", headers={**headers, "If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,104 @@
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+
+def _api_status_error(status_code):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return openai.APIStatusError(f"status {status_code}", response=response, body=None)
+
+
+class FakeCompletions:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        message = SimpleNamespace(content=outcome)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _load_llm_client(monkeypatch, outcomes):
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    llm_client = importlib.import_module("services.llm_client")
+    llm_client.breaker.reset()
+
+    completions = FakeCompletions(outcomes)
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(llm_client, "get_client", lambda: fake_client)
+    monkeypatch.setattr(llm_client.time, "sleep", lambda seconds: None)
+    return llm_client, completions
+
+
+def test_chat_completion_retries_rate_limits(monkeypatch):
+    llm_client, completions = _load_llm_client(
+        monkeypatch,
+        [FakeStatusError(429), FakeStatusError(503), '{"summary": "ok"}'],
+    )
+
+    content = llm_client.chat_completion([{"role": "user", "content": "hi"}])
+
+    assert completions.calls == 3
+    assert llm_client.extract_json_object(content) == {"summary": "ok"}
+    assert llm_client.breaker.state == "closed"
+
+
+def test_chat_completion_does_not_retry_client_errors(monkeypatch):
+    llm_client, completions = _load_llm_client(monkeypatch, [_api_status_error(400)])
+
+    with pytest.raises(llm_client.LLMError):
+        llm_client.chat_completion([{"role": "user", "content": "hi"}])
+    assert completions.calls == 1
+
+
+def test_non_provider_errors_leave_the_breaker_alone(monkeypatch):
+    llm_client, completions = _load_llm_client(monkeypatch, [TypeError("bad argument")])
+    llm_client.breaker.record_failure()
+
+    with pytest.raises(TypeError):
+        llm_client.chat_completion([{"role": "user", "content": "hi"}])
+    assert completions.calls == 1
+    # A 4xx would have reset the failure count; an unrelated error must not.
+    assert llm_client.breaker._failures == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    llm_client = importlib.import_module("services.llm_client")
+
+    now = [0.0]
+    breaker = llm_client.CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] = 11.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.abandon_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
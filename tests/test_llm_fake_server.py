@@ -0,0 +1,72 @@
+import importlib
+import sys
+from pathlib import Path
+
+from openai import OpenAI
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_openai_server import FakeOpenAIConfig, FakeOpenAIServer  # noqa: E402
+from llm_load_harness import run_load  # noqa: E402
+
+
+def _isolate_env(monkeypatch):
+    for name in ("DATABASE_URL", "SECRET_KEY", "RUN_BACKGROUND_JOBS", "OPENAI_API_KEY", "OPENAI_BASE_URL"):
+        monkeypatch.setenv(name, "placeholder")
+    monkeypatch.setenv("TESTING", "1")
+
+
+def test_generate_endpoints_and_summarizer_against_fake_server(tmp_path, monkeypatch):
+    _isolate_env(monkeypatch)
+
+    report = run_load(
+        FakeOpenAIConfig(latency_ms=5, latency_distribution="uniform"),
+        requests=20,
+        concurrency=4,
+        articles=12,
+        db_path=tmp_path / "load.db",
+    )
+
+    assert report["summarizer"]["summarized"] == 12
+    assert report["summarizer"]["failed"] == 0
+    assert report["endpoints"]["statuses"] == {200: 20}
+    for kind in ("joke", "comment", "viral", "analysis", "summary", "bullets"):
+        assert report["server"][f"kind:{kind}"] > 0
+
+
+def test_rate_limited_provider_trips_circuit_breaker(tmp_path, monkeypatch):
+    _isolate_env(monkeypatch)
+
+    report = run_load(
+        FakeOpenAIConfig(rate_limit_rate=1.0, retry_after_seconds=0.01),
+        requests=10,
+        concurrency=2,
+        articles=5,
+        db_path=tmp_path / "outage.db",
+    )
+
+    assert report["summarizer"]["summarized"] == 0
+    # Only the first article burns through its retries; the open breaker stops the batch.
+    assert report["summarizer"]["failed"] <= 2
+    assert report["endpoints"]["statuses"] == {502: 10}
+    assert report["server"]["rate_limited"] == report["server"]["requests"]
+
+    llm_client = importlib.import_module("services.llm_client")
+    assert llm_client.breaker.state == "closed"
+
+
+def test_fake_server_streams_chunks():
+    with FakeOpenAIServer(FakeOpenAIConfig()) as server:
+        client = OpenAI(api_key="sk-fake", base_url=server.base_url, max_retries=0)
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a professional news summarizer."},
+                {"role": "user", "content": "Summarize: markets rallied."},
+            ],
+            stream=True,
+        )
+        text = "".join(chunk.choices[0].delta.content or "" for chunk in stream)
+        client.close()
+
+    assert text.startswith('{"summary": "Summary ')
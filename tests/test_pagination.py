@@ -0,0 +1,129 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+def _seed(app_module, models):
+    db = app_module.db
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    user = models.User(email="pager@example.com")
+    user.set_password("password")
+    db.session.add(user)
+
+    # Story 1 is the newest; each story has an older follow-up article, and
+    # story 5's follow-up lands between stories 1 and 2.
+    offsets = {1: (0, 90), 2: (10, 95), 3: (20, 100), 4: (30, 105), 5: (5, 110)}
+    for cluster_id, (lead_minutes, older_minutes) in offsets.items():
+        for index, minutes in enumerate((lead_minutes, older_minutes)):
+            db.session.add(models.Article(
+                title=f"Story {cluster_id} article {index}",
+                source_url=f"https://example.com/{cluster_id}/{index}",
+                source_domain="example.com",
+                ai_summary="summary",
+                category="Tech",
+                cluster_id=cluster_id,
+                created_at=base - timedelta(minutes=minutes),
+            ))
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app_module.app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_story_feed_cursor_pagination_both_directions(make_app):
+    app_module, headers = make_app(_seed)
+
+    with app_module.app.test_client() as client:
+        pages = []
+        cursor = None
+        while True:
+            url = "/api/news/feed?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            payload = client.get(url, headers=headers).get_json()
+            pages.append(payload)
+            cursor = payload["next_cursor"]
+            if not cursor:
+                break
+
+        seen = [story["cluster_id"] for page in pages for story in page["stories"]]
+        assert seen == [1, 5, 2, 3, 4]
+        assert all(len(story["sources"]) == 2 for page in pages for story in page["stories"])
+        assert pages[0]["prev_cursor"] is None
+
+        back = client.get(
+            f"/api/news/feed?limit=2&direction=prev&cursor={pages[2]['prev_cursor']}",
+            headers=headers,
+        ).get_json()
+        assert [story["cluster_id"] for story in back["stories"]] == [2, 3]
+
+        first = client.get(
+            f"/api/news/feed?limit=2&direction=prev&cursor={back['prev_cursor']}",
+            headers=headers,
+        ).get_json()
+        assert [story["cluster_id"] for story in first["stories"]] == [1, 5]
+        assert first["prev_cursor"] is None
+
+        legacy = client.get("/api/news/feed?limit=3&offset=0", headers=headers).get_json()
+        assert legacy["offset"] == 0
+        assert "next_cursor" not in legacy
+
+        bad = client.get("/api/news/feed?cursor=not-a-cursor", headers=headers)
+        assert bad.status_code == 400
+
+
+def test_archive_cursor_pagination(make_app):
+    app_module, headers = make_app(_seed)
+
+    with app_module.app.test_client() as client:
+        first = client.get("/api/news/archive?limit=4", headers=headers).get_json()
+        second = client.get(f"/api/news/archive?limit=4&cursor={first['next_cursor']}", headers=headers).get_json()
+        third = client.get(f"/api/news/archive?limit=4&cursor={second['next_cursor']}", headers=headers).get_json()
+
+        ids = [a["article_id"] for page in (first, second, third) for a in page["articles"]]
+        assert len(ids) == len(set(ids)) == 10
+        assert third["next_cursor"] is None
+
+        back = client.get(
+            f"/api/news/archive?limit=4&direction=prev&cursor={second['prev_cursor']}",
+            headers=headers,
+        ).get_json()
+        assert [a["article_id"] for a in back["articles"]] == [a["article_id"] for a in first["articles"]]
+
+        story_cursor = client.get("/api/news/feed?limit=1", headers=headers).get_json()["next_cursor"]
+        assert client.get(f"/api/news/archive?cursor={story_cursor}", headers=headers).status_code == 400
+
+        # A cursor whose key type does not match its kind is rejected, not compared against the wrong column.
+        pagination = importlib.import_module("utils.pagination")
+        scored_archive = pagination.encode_cursor("article", (0.5, 1))
+        assert client.get(f"/api/news/archive?cursor={scored_archive}", headers=headers).status_code == 400
+        dated_trending = pagination.encode_cursor("trending", (datetime(2024, 5, 1), 1))
+        assert client.get(f"/api/news/trending?cursor={dated_trending}", headers=headers).status_code == 400
+        assert pagination.decode_cursor(pagination.encode_cursor("trending", (2.5, 7)), "trending", scored=True) == (2.5, 7)
+
+
+def test_list_endpoints_do_not_select_article_text(make_app):
+    from sqlalchemy import event
+
+    app_module, headers = make_app(_seed)
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with app_module.app.test_client() as client:
+            for url in (
+                "/api/news/feed?limit=2",
+                "/api/news/feed?limit=2&offset=0",
+                "/api/news/archive?limit=4",
+                "/api/news/story/1",
+            ):
+                assert client.get(url, headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    article_selects = [s for s in statements if "FROM article" in s]
+    assert article_selects
+    assert not any("raw_content" in s or "rss_summary" in s for s in article_selects)
@@ -0,0 +1,170 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+class FakeRedis:
+    """Just enough of redis-py's string and sorted-set API for the feed materializer."""
+
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.storage)
+
+    def rename(self, src, dst):
+        self.storage[dst] = self.storage.pop(src)
+
+    def zadd(self, key, mapping):
+        self.storage.setdefault(key, {}).update({m: float(s) for m, s in mapping.items()})
+
+    def zcard(self, key):
+        return len(self.storage.get(key, {}))
+
+    def _sorted(self, key):
+        return sorted(self.storage.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+
+    @staticmethod
+    def _bound(value):
+        return {"-inf": float("-inf"), "+inf": float("inf")}.get(value, value)
+
+    def zrange(self, key, start, end):
+        items = [m for m, _ in self._sorted(key)]
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def zrangebyscore(self, key, low, high, start=None, num=None):
+        low, high = self._bound(low), self._bound(high)
+        items = [m for m, s in self._sorted(key) if low <= s <= high]
+        return items[start:start + num] if num is not None else items
+
+    def zrevrangebyscore(self, key, high, low, start=None, num=None):
+        low, high = self._bound(low), self._bound(high)
+        items = [m for m, s in reversed(self._sorted(key)) if low <= s <= high]
+        return items[start:start + num] if num is not None else items
+
+    def zremrangebyscore(self, key, low, high):
+        low, high = self._bound(low), self._bound(high)
+        zset = self.storage.get(key, {})
+        for member in [m for m, s in zset.items() if low <= s <= high]:
+            del zset[member]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def _pages(client, headers, limit):
+    ids, cursor = [], None
+    while True:
+        url = f"/api/news/personalized?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        payload = client.get(url, headers=headers).get_json()
+        ids.extend(story["cluster_id"] for story in payload["stories"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_personalized_feed_is_served_from_shared_materialized_list(make_app, monkeypatch):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    personalized_feed = importlib.import_module("services.personalized_feed")
+    response_cache = importlib.import_module("services.response_cache")
+    base = datetime(2024, 5, 1, 12, 0, 0)
+
+    with app.app_context():
+        headers = []
+        for email in ("a@example.com", "b@example.com"):
+            user = models.User(email=email)
+            user.set_password("password")
+            db.session.add(user)
+            db.session.flush()
+            # Same preferences in a different order share one signature.
+            categories = ["Tech", "World"] if email.startswith("a") else ["World", "Tech", "Tech"]
+            db.session.add(models.UserPreferences(user_id=user.id, preferred_categories=categories))
+            token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+            headers.append({"Authorization": f"Bearer {token}"})
+        for index in range(9):
+            db.session.add(models.Article(
+                title=f"Story {index}",
+                source_url=f"https://example.com/{index}",
+                source_domain="example.com",
+                ai_summary="summary",
+                category=["Tech", "World", "Sports"][index % 3],
+                cluster_id=100 + index,
+                created_at=base - timedelta(minutes=index),
+            ))
+        db.session.commit()
+
+    with app.test_client() as client:
+        monkeypatch.setattr(personalized_feed, "get_redis_client", lambda: None)
+        from_db = _pages(client, headers[0], limit=2)
+        assert from_db == [100, 101, 103, 104, 106, 107]
+
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(personalized_feed, "get_redis_client", lambda: fake_redis)
+        monkeypatch.setattr(response_cache, "get_redis_client", lambda: fake_redis)
+        assert _pages(client, headers[0], limit=2) == from_db
+        assert _pages(client, headers[1], limit=4) == from_db
+        assert fake_redis.zcard(personalized_feed.SIGNATURES_KEY) == 1
+
+        first = client.get("/api/news/personalized?limit=2", headers=headers[0]).get_json()
+        second = client.get(f"/api/news/personalized?limit=2&cursor={first['next_cursor']}", headers=headers[0])
+        back = client.get(
+            f"/api/news/personalized?limit=2&direction=prev&cursor={second.get_json()['prev_cursor']}",
+            headers=headers[0],
+        ).get_json()
+        assert [s["cluster_id"] for s in back["stories"]] == [100, 101]
+        assert back["prev_cursor"] is None
+
+        with app.app_context():
+            db.session.add(models.Article(
+                title="Breaking",
+                source_url="https://example.com/breaking",
+                source_domain="example.com",
+                ai_summary="summary",
+                category="World",
+                cluster_id=200,
+                created_at=base + timedelta(minutes=5),
+            ))
+            db.session.commit()
+            personalized_feed.rebuild_personalized_feeds()
+        response_cache.bump_generation()
+        assert _pages(client, headers[1], limit=3) == [200] + from_db
+
+        # Pages past the capped list fall back to the database.
+        monkeypatch.setattr(personalized_feed, "MATERIALIZED_FEED_LIMIT", 3)
+        with app.app_context():
+            personalized_feed.rebuild_personalized_feeds()
+        response_cache.bump_generation()
+        assert _pages(client, headers[0], limit=2) == [200] + from_db
@@ -103,3 +103,130 @@ def test_preferences_personalized_feed_and_saved_reads(tmp_path, monkeypatch):
         read_list_response = client.get("/api/news/read-articles", headers=headers)
         assert read_list_response.status_code == 200
         assert read_list_response.get_json()["count"] == 1
+
+
+def test_saved_and_read_listings_page_by_cursor(tmp_path, monkeypatch):
+    from datetime import datetime, timedelta
+
+    app_module = _setup_app(tmp_path, monkeypatch)
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    base = datetime(2024, 5, 1, 12, 0, 0)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = models.User(email="reader@example.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        article_ids = []
+        for index in range(7):
+            article = models.Article(
+                title=f"Story {index}",
+                source_url=f"https://example.com/{index}",
+                source_domain="example.com",
+                ai_summary="summary",
+                category="Tech",
+                created_at=base,
+            )
+            db.session.add(article)
+            db.session.flush()
+            article_ids.append(article.id)
+            # Two entries share a timestamp so the id tiebreak is exercised.
+            entry_time = base + timedelta(minutes=min(index, 5))
+            db.session.add(models.SavedArticle(user_id=user_id, article_id=article.id, created_at=entry_time))
+            db.session.add(models.ReadArticle(user_id=user_id, article_id=article.id, created_at=entry_time))
+        db.session.commit()
+
+    token = jwt.encode({"user_id": user_id}, app.config["SECRET_KEY"], algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}"}
+    newest_first = list(reversed(article_ids))
+
+    with app.test_client() as client:
+        for url, key in (("/api/news/saved", "saved_at"), ("/api/news/read-articles", "read_at")):
+            seen = []
+            cursor = None
+            pages = []
+            while True:
+                page = client.get(f"{url}?limit=3" + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+                assert page.status_code == 200
+                payload = page.get_json()
+                pages.append(payload)
+                seen.extend(a["article_id"] for a in payload["articles"])
+                assert all(key in a for a in payload["articles"])
+                cursor = payload["next_cursor"]
+                if not cursor:
+                    break
+            assert seen == newest_first
+
+            back = client.get(
+                f"{url}?limit=3&direction=prev&cursor={pages[1]['prev_cursor']}", headers=headers
+            ).get_json()
+            assert [a["article_id"] for a in back["articles"]] == seen[:3]
+
+            ids = client.get(f"{url}?ids_only=true&limit=5", headers=headers).get_json()
+            assert ids["article_ids"] == newest_first[:5]
+            assert "articles" not in ids
+
+        assert client.get("/api/news/saved?cursor=garbage", headers=headers).status_code == 400
+        read_cursor = client.get("/api/news/read-articles?limit=1", headers=headers).get_json()["next_cursor"]
+        assert client.get(f"/api/news/saved?cursor={read_cursor}", headers=headers).status_code == 400
+
+
+def test_bulk_read_and_save_are_idempotent_and_partial(tmp_path, monkeypatch):
+    app_module = _setup_app(tmp_path, monkeypatch)
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = models.User(email="bulk@example.com")
+        user.set_password("password")
+        db.session.add(user)
+        articles = [
+            models.Article(title=f"Story {i}", source_url=f"https://example.com/{i}", cluster_id=i)
+            for i in range(4)
+        ]
+        db.session.add_all(articles)
+        db.session.commit()
+        user_id = user.id
+        ids = [a.id for a in articles]
+
+    token = jwt.encode({"user_id": user_id}, app.config["SECRET_KEY"], algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with app.test_client() as client:
+        assert client.post("/api/news/read", json={"article_id": ids[0]}, headers=headers).status_code == 201
+        assert client.post("/api/news/read", json={"article_id": ids[0]}, headers=headers).status_code == 200
+        assert client.post("/api/news/read", json={"article_id": 9999}, headers=headers).status_code == 404
+
+        response = client.post(
+            "/api/news/read/bulk",
+            json={"article_ids": [ids[0], ids[1], ids[2], ids[1], 9999]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.get_json() == {"added": [ids[1], ids[2]], "existing": [ids[0]], "missing": [9999]}
+
+        retry = client.post("/api/news/read/bulk", json={"article_ids": [ids[1], ids[2]]}, headers=headers)
+        assert retry.get_json()["added"] == []
+
+        saved = client.post("/api/news/save/bulk", json={"article_ids": ids}, headers=headers).get_json()
+        assert saved["added"] == ids
+
+        for bad in ({"article_ids": []}, {"article_ids": "1,2"}, {"article_ids": ["x"]},
+                    {"article_ids": [ids[0], 1.5]}, {"article_ids": [True]}, {"article_ids": ["3"]},
+                    {"article_ids": list(range(1, 502))}):
+            assert client.post("/api/news/read/bulk", json=bad, headers=headers).status_code == 400
+
+    with app.app_context():
+        assert models.ReadArticle.query.filter_by(user_id=user_id).count() == 3
+        assert models.SavedArticle.query.filter_by(user_id=user_id).count() == 4
+        read_changes = models.ChangeLog.query.filter_by(user_id=user_id, entity="read").count()
+        assert read_changes == 3
@@ -0,0 +1,113 @@
+import importlib
+
+import jwt
+from sqlalchemy import event
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    admin = models.User(email="admin@example.com", role="admin")
+    admin.set_password("password")
+    member = models.User(email="member@example.com")
+    member.set_password("password")
+    db.session.add_all([admin, member])
+    db.session.commit()
+    secret = app.config["SECRET_KEY"]
+    tokens = {
+        user.email: {"Authorization": f"Bearer {jwt.encode({'user_id': user.id}, secret, algorithm='HS256')}"}
+        for user in (admin, member)
+    }
+    ids = {user.email: user.id for user in (admin, member)}
+    return models, tokens, ids
+
+
+def _count_user_queries(app_module):
+    statements = []
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM user" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_principals_are_cached_and_invalidated_on_change(make_app, monkeypatch):
+    app_module, (models, tokens, ids) = make_app(_seed)
+    principals = importlib.import_module("services.principals")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(principals, "get_redis_client", lambda: fake_redis)
+    admin, member = tokens["admin@example.com"], tokens["member@example.com"]
+
+    statements, stop = _count_user_queries(app_module)
+    try:
+        with app_module.app.test_client() as client:
+            for _ in range(3):
+                assert client.get("/api/news/saved", headers=member).status_code == 200
+            assert len(statements) == 1
+
+            # Another process (empty local cache) is served from Redis.
+            app_module.app.extensions.pop("principal_cache")
+            assert client.get("/api/news/saved", headers=member).status_code == 200
+            assert len(statements) == 1
+
+            assert client.get("/api/admin/users", headers=member).status_code == 403
+            response = client.patch(
+                f"/api/admin/users/{ids['member@example.com']}/role", json={"role": "admin"}, headers=admin
+            )
+            assert response.status_code == 200
+            assert client.get("/api/admin/users", headers=member).status_code == 200
+    finally:
+        stop()
+
+    with app_module.app.app_context():
+        user = app_module.db.session.get(models.User, ids["member@example.com"])
+        user.is_active = False
+        app_module.db.session.commit()
+    with app_module.app.test_client() as client:
+        assert client.get("/api/news/saved", headers=member).status_code == 401
+
+
+def test_login_tokens_carry_claims_that_refresh_stale_principals(make_app):
+    app_module, (models, tokens, ids) = make_app(_seed)
+    principals = importlib.import_module("services.principals")
+
+    with app_module.app.app_context():
+        user = app_module.db.session.get(models.User, ids["member@example.com"])
+        claims = principals.token_claims(user)
+        stale = principals.load_principal(user.id)
+        user.set_password("changed")
+        app_module.db.session.commit()
+        # Simulate another process whose cached copy predates the password change.
+        principals._local_put(stale)
+        fresh_claims = principals.token_claims(user)
+
+        assert claims["role"] == "user"
+        assert principals.load_principal(user.id, claims) == stale
+        refreshed = principals.load_principal(user.id, fresh_claims)
+        assert refreshed.password_changed_at == fresh_claims["pwd_at"]
@@ -0,0 +1,86 @@
+import importlib
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+
+def _hot_queries(Article):
+    """Query shapes mapped to the indexes that can serve them without a sort."""
+    clustered = Article.query.filter(Article.cluster_id.isnot(None))
+    newest = (Article.created_at.desc(), Article.id.desc())
+    return [
+        (clustered.order_by(*newest).limit(100), {"ix_article_clustered_created"}),
+        (
+            clustered.filter(Article.category == "Tech").order_by(*newest).limit(100),
+            {"ix_article_clustered_category_created", "ix_article_category_created"},
+        ),
+        (
+            clustered.filter(Article.source_domain == "example.com").order_by(*newest).limit(100),
+            {"ix_article_clustered_source_created"},
+        ),
+        (
+            Article.query.filter(Article.cluster_id == 123).order_by(Article.created_at.desc()),
+            {"ix_article_cluster_created"},
+        ),
+        (
+            Article.query.filter(Article.category == "Sports").order_by(*newest).limit(100),
+            {"ix_article_category_created"},
+        ),
+        (
+            Article.query.filter(Article.ai_summary.is_(None)).order_by(Article.created_at.desc()).limit(200),
+            {"ix_article_pending_summary"},
+        ),
+    ]
+
+
+def _compile(query, engine):
+    return str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+
+
+def test_hot_article_queries_use_indexes_on_sqlite(make_app):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    Article = importlib.import_module("models.models").Article
+
+    with app.app_context():
+        for query, expected_indexes in _hot_queries(Article):
+            sql = _compile(query, db.engine)
+            plan = " ".join(row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+            assert any(f"INDEX {name} " in f"{plan} " for name in expected_indexes), f"{sql}\n{plan}"
+            assert "USE TEMP B-TREE FOR ORDER BY" not in plan, f"{sql}\nneeds a sort: {plan}"
+
+
+def _plan_index_names(node):
+    names = set()
+    if "Index Name" in node:
+        names.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        names |= _plan_index_names(child)
+    return names
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+def test_hot_article_queries_use_indexes_on_postgres(make_app):
+    app_module, _ = make_app()
+    app = app_module.app
+    models = importlib.import_module("models.models")
+    Article = models.Article
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+
+    models.db.metadata.drop_all(engine)
+    models.db.metadata.create_all(engine)
+    try:
+        with app.app_context(), engine.connect() as conn:
+            # Empty tables make sequential scans look free; force the planner to show index choice.
+            conn.execute(text("SET enable_seqscan = off"))
+            for query, expected_indexes in _hot_queries(Article):
+                sql = _compile(query, engine)
+                plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+                plan = plan if isinstance(plan, list) else json.loads(plan)
+                assert expected_indexes & _plan_index_names(plan[0]["Plan"]), plan
+    finally:
+        models.db.metadata.drop_all(engine)
+        engine.dispose()
@@ -0,0 +1,181 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+        self.streams = {}
+        self.sequence = 0
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+    def expire(self, key, seconds):
+        return key in self.storage
+
+    def getbit(self, key, offset):
+        return int(offset in self.storage.get(key, set()))
+
+    def setbit(self, key, offset, value):
+        bits = self.storage.setdefault(key, set())
+        previous = int(offset in bits)
+        if value:
+            bits.add(offset)
+        else:
+            bits.discard(offset)
+        return previous
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.sequence += 1
+        entry_id = f"{self.sequence}-0"
+        self.streams.setdefault(key, []).append((entry_id, {k: str(v) for k, v in fields.items()}))
+        return entry_id
+
+    def xrange(self, key, start, end, count=None):
+        return list(self.streams.get(key, []))[:count]
+
+    def xdel(self, key, *entry_ids):
+        entries = self.streams.get(key, [])
+        self.streams[key] = [entry for entry in entries if entry[0] not in entry_ids]
+        return len(entries) - len(self.streams[key])
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    user = models.User(email="behind@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.flush()
+    article_ids = []
+    for cluster_id in (1, 2, 3):
+        article = models.Article(
+            title=f"Story {cluster_id}",
+            source_url=f"https://example.com/{cluster_id}",
+            source_domain="example.com",
+            ai_summary="summary",
+            category="Tech",
+            cluster_id=cluster_id,
+            created_at=base - timedelta(minutes=cluster_id),
+        )
+        db.session.add(article)
+        db.session.flush()
+        article_ids.append(article.id)
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return models, {"Authorization": f"Bearer {token}"}, article_ids
+
+
+def _clusters(client, headers):
+    response = client.get("/api/news/feed?exclude_read=true", headers=headers)
+    return [story["cluster_id"] for story in response.get_json()["stories"]]
+
+
+def _read_rows(app_module, models):
+    with app_module.app.app_context():
+        return sorted(aid for (aid,) in app_module.db.session.query(models.ReadArticle.article_id))
+
+
+def test_read_events_are_streamed_then_flushed(make_app, monkeypatch):
+    app_module, (models, headers, article_ids) = make_app(_seed, READ_EVENTS_WRITE_BEHIND="true")
+    read_events = importlib.import_module("services.read_events")
+    read_state = importlib.import_module("services.read_state")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(read_events, "get_redis_client", lambda: fake_redis)
+    monkeypatch.setattr(read_state, "get_redis_client", lambda: fake_redis)
+
+    with app_module.app.test_client() as client:
+        bulk = client.post(
+            "/api/news/read/bulk", json={"article_ids": [article_ids[0], 999]}, headers=headers
+        )
+        assert bulk.status_code == 202
+        assert bulk.get_json() == {"queued": [article_ids[0]], "missing": [999]}
+        single = client.post("/api/news/read", json={"article_id": article_ids[0]}, headers=headers)
+        assert single.status_code == 202
+        assert client.post("/api/news/read", json={"article_id": 999}, headers=headers).status_code == 404
+
+        assert _read_rows(app_module, models) == []
+        assert _clusters(client, headers) == [2, 3]
+
+    with app_module.app.app_context():
+        read_events.flush_read_events()
+        read_events.flush_read_events()
+    assert _read_rows(app_module, models) == [article_ids[0]]
+    assert fake_redis.streams[read_events.READ_EVENTS_STREAM] == []
+
+    with app_module.app.test_client() as client:
+        # Unreads queue behind earlier reads: a flushed read and a still-queued one.
+        client.post("/api/news/read", json={"article_id": article_ids[1]}, headers=headers)
+        assert client.delete(f"/api/news/read/{article_ids[1]}", headers=headers).status_code == 202
+        assert client.delete(f"/api/news/read/{article_ids[0]}", headers=headers).status_code == 202
+        assert client.delete(f"/api/news/read/{article_ids[2]}", headers=headers).status_code == 404
+        assert _clusters(client, headers) == [1, 2, 3]
+    assert _read_rows(app_module, models) == [article_ids[0]]
+
+    with app_module.app.app_context():
+        read_events.flush_read_events()
+        removed = models.ChangeLog.query.filter_by(action=read_events.change_log.REMOVED).all()
+        assert [row.entity_id for row in removed] == [article_ids[0]]
+    assert _read_rows(app_module, models) == []
+
+
+def test_read_events_buffer_in_process_without_redis(make_app, monkeypatch):
+    app_module, (models, headers, article_ids) = make_app(_seed, READ_EVENTS_WRITE_BEHIND="true")
+    read_events = importlib.import_module("services.read_events")
+    read_state = importlib.import_module("services.read_state")
+    monkeypatch.setattr(read_events, "get_redis_client", lambda: None)
+    monkeypatch.setattr(read_state, "get_redis_client", lambda: None)
+    monkeypatch.setattr(read_events, "_ensure_local_flusher", lambda: None)
+
+    with app_module.app.test_client() as client:
+        response = client.post("/api/news/read", json={"article_id": article_ids[2]}, headers=headers)
+        assert response.status_code == 202
+        assert _read_rows(app_module, models) == []
+        assert _clusters(client, headers) == [1, 2]
+
+    with app_module.app.app_context():
+        assert read_events.flush_local_buffer() == 1
+    assert _read_rows(app_module, models) == [article_ids[2]]
+    assert read_events.pending_article_ids(1) == set()
+
+    with app_module.app.test_client() as client:
+        client.post("/api/news/read", json={"article_id": article_ids[1]}, headers=headers)
+        assert client.delete(f"/api/news/read/{article_ids[1]}", headers=headers).status_code == 200
+        assert client.delete(f"/api/news/read/{article_ids[2]}", headers=headers).status_code == 200
+    assert read_events.pending_article_ids(1) == set()
+    with app_module.app.app_context():
+        assert read_events.flush_local_buffer() == 0
+    assert _read_rows(app_module, models) == []
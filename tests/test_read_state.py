@@ -0,0 +1,125 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+    def expire(self, key, seconds):
+        return key in self.storage
+
+    def getbit(self, key, offset):
+        return int(offset in self.storage.get(key, set()))
+
+    def setbit(self, key, offset, value):
+        bits = self.storage.setdefault(key, set())
+        previous = int(offset in bits)
+        if value:
+            bits.add(offset)
+        else:
+            bits.discard(offset)
+        return previous
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    user = models.User(email="hide@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.flush()
+    article_ids = {}
+    for cluster_id in (1, 2, 3):
+        for index in range(2):
+            article = models.Article(
+                title=f"Story {cluster_id}.{index}",
+                source_url=f"https://example.com/{cluster_id}/{index}",
+                source_domain="example.com",
+                ai_summary="summary",
+                category="Tech",
+                cluster_id=cluster_id,
+                created_at=base - timedelta(minutes=cluster_id * 10 + index),
+            )
+            db.session.add(article)
+            db.session.flush()
+            article_ids[(cluster_id, index)] = article.id
+    db.session.add(models.ReadArticle(user_id=user.id, article_id=article_ids[(2, 1)]))
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}, article_ids
+
+
+def _clusters(client, url, headers):
+    return [story["cluster_id"] for story in client.get(url, headers=headers).get_json()["stories"]]
+
+
+def _exercise(app_module, headers, article_ids):
+    with app_module.app.test_client() as client:
+        for url in ("/api/news/feed", "/api/news/personalized"):
+            assert _clusters(client, url, headers) == [1, 2, 3]
+            assert _clusters(client, f"{url}?exclude_read=true", headers) == [1, 3]
+
+        client.post("/api/news/read", json={"article_id": article_ids[(3, 0)]}, headers=headers)
+        assert _clusters(client, "/api/news/feed?exclude_read=true", headers) == [1]
+
+        client.delete(f"/api/news/read/{article_ids[(2, 1)]}", headers=headers)
+        assert _clusters(client, "/api/news/personalized?exclude_read=1", headers) == [1, 2]
+        assert _clusters(client, "/api/news/feed", headers) == [1, 2, 3]
+
+
+def test_exclude_read_uses_bitmap(make_app, monkeypatch):
+    app_module, (headers, article_ids) = make_app(_seed)
+    read_state = importlib.import_module("services.read_state")
+    response_cache = importlib.import_module("services.response_cache")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(read_state, "get_redis_client", lambda: fake_redis)
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: fake_redis)
+
+    _exercise(app_module, headers, article_ids)
+
+    bitmap = next(value for key, value in fake_redis.storage.items() if key.startswith("read:bitmap:"))
+    assert bitmap == {0, article_ids[(3, 0)]}
+
+
+def test_exclude_read_falls_back_to_database(make_app, monkeypatch):
+    app_module, (headers, article_ids) = make_app(_seed)
+    read_state = importlib.import_module("services.read_state")
+    monkeypatch.setattr(read_state, "get_redis_client", lambda: None)
+
+    _exercise(app_module, headers, article_ids)
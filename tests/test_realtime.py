@@ -0,0 +1,63 @@
+import importlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import jwt
+
+
+def test_subscribers_receive_story_events_for_their_categories(make_app):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    realtime = importlib.import_module("services.realtime")
+    realtime._external_emitter.cache_clear()
+
+    with app.app_context():
+        user = models.User(email="push@example.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+
+    anonymous = realtime.socketio.test_client(app)
+    assert not anonymous.is_connected()
+    forged = realtime.socketio.test_client(app, auth={"token": jwt.encode({"user_id": 1}, "wrong", algorithm="HS256")})
+    assert not forged.is_connected()
+
+    tech = realtime.socketio.test_client(app, auth={"token": token})
+    everything = realtime.socketio.test_client(app, auth={"token": f"Bearer {token}"})
+    assert tech.is_connected() and everything.is_connected()
+    assert tech.emit("subscribe", {"categories": ["Tech"]}, callback=True)["ok"] is True
+    assert everything.emit("subscribe", {"categories": ["*", "Tech"]}, callback=True)["rooms"] == ["category:*"]
+    assert tech.emit("subscribe", {"categories": "Tech"}, callback=True)["ok"] is False
+
+    now = datetime(2024, 5, 1, 12, 0, 0)
+    articles = [
+        SimpleNamespace(id=1, cluster_id=500, title="Newest", category="Tech", created_at=now),
+        SimpleNamespace(id=2, cluster_id=500, title="Older", category="Tech", created_at=now - timedelta(hours=1)),
+        SimpleNamespace(id=3, cluster_id=501, title="Match", category="Sports", created_at=now),
+    ]
+    events = realtime.build_story_events(articles, changed_clusters={500, 501}, existing_clusters={500})
+    assert events[0] == {
+        "type": "story.updated",
+        "cluster_id": 500,
+        "title": "Newest",
+        "category": "Tech",
+        "timestamp": "2024-05-01T12:00:00",
+        "source_count": 2,
+    }
+    assert events[1]["type"] == "story.created"
+
+    realtime.publish_story_events(events)
+    tech_events = [msg["args"][0] for msg in tech.get_received() if msg["name"] == "story"]
+    all_events = [msg["args"][0] for msg in everything.get_received() if msg["name"] == "story"]
+    assert [e["cluster_id"] for e in tech_events] == [500]
+    assert sorted(e["cluster_id"] for e in all_events) == [500, 501]
+
+    tech.emit("unsubscribe", {"categories": ["Tech"]})
+    realtime.publish_story_events(events)
+    assert [msg for msg in tech.get_received() if msg["name"] == "story"] == []
+
+    for client in (tech, everything):
+        client.disconnect()
@@ -0,0 +1,162 @@
+import importlib
+
+from sqlalchemy import event
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+
+def _seed(app_module, models):
+    user = models.User(email="refresh@example.com", is_email_confirmed=True)
+    user.set_password("password123")
+    app_module.db.session.add(user)
+    app_module.db.session.commit()
+
+
+def _setup_app(make_app, monkeypatch):
+    passwords = importlib.import_module("utils.passwords")
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    app_module, _ = make_app(_seed)
+    return app_module, importlib.import_module("models.models")
+
+
+def _login(client):
+    response = client.post("/api/auth/login", json={"email": "refresh@example.com", "password": "password123"})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _count_user_queries(app_module):
+    statements = []
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM "user"' in statement or "FROM user" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_access_tokens_skip_the_database_and_are_revoked_on_deactivation(make_app, monkeypatch):
+    app_module, models = _setup_app(make_app, monkeypatch)
+    principals = importlib.import_module("services.principals")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(principals, "get_redis_client", lambda: fake_redis)
+
+    with app_module.app.test_client() as client:
+        tokens = _login(client)
+        assert {"token", "access_token", "refresh_token", "expires_in"} <= set(tokens)
+        assert client.get("/api/news/saved", headers=_bearer(tokens["token"])).status_code == 200
+
+        app_module.app.extensions.pop("principal_cache")
+        fake_redis.delete(principals.PRINCIPAL_KEY.format(user_id=1))
+        statements, stop = _count_user_queries(app_module)
+        try:
+            for _ in range(3):
+                assert client.get("/api/news/saved", headers=_bearer(tokens["access_token"])).status_code == 200
+        finally:
+            stop()
+        assert statements == []
+
+        with app_module.app.app_context():
+            user = models.User.query.one()
+            user.is_active = False
+            app_module.db.session.commit()
+        assert client.get("/api/news/saved", headers=_bearer(tokens["access_token"])).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_refresh_tokens_rotate_and_reuse_revokes_the_family(make_app, monkeypatch):
+    app_module, models = _setup_app(make_app, monkeypatch)
+    principals = importlib.import_module("services.principals")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(principals, "get_redis_client", lambda: fake_redis)
+
+    with app_module.app.test_client() as client:
+        first = _login(client)
+        rotated = client.post("/api/auth/refresh", json={"refresh_token": first["refresh_token"]})
+        assert rotated.status_code == 200
+        second = rotated.get_json()
+        assert second["refresh_token"] != first["refresh_token"]
+        assert client.get("/api/news/saved", headers=_bearer(second["access_token"])).status_code == 200
+
+        # Replaying the rotated token ends the whole family, including its successor.
+        assert client.post("/api/auth/refresh", json={"refresh_token": first["refresh_token"]}).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+
+        third = _login(client)
+        other = _login(client)
+        assert client.post("/api/auth/logout", json={"refresh_token": third["refresh_token"]}).status_code == 200
+        assert client.post("/api/auth/refresh", json={"refresh_token": third["refresh_token"]}).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": other["refresh_token"]}).status_code == 200
+
+        everywhere = _login(client)
+        response = client.post("/api/auth/logout", json={"refresh_token": everywhere["refresh_token"], "all": True})
+        assert response.status_code == 200
+        assert client.get("/api/news/saved", headers=_bearer(everywhere["access_token"])).status_code == 401
+
+    with app_module.app.app_context():
+        assert models.RefreshToken.query.filter(models.RefreshToken.revoked_at.is_(None)).count() == 0
+
+
+def test_access_tokens_fall_back_to_principal_lookup_without_redis(make_app, monkeypatch):
+    app_module, models = _setup_app(make_app, monkeypatch)
+
+    with app_module.app.test_client() as client:
+        tokens = _login(client)
+        assert client.get("/api/news/saved", headers=_bearer(tokens["access_token"])).status_code == 200
+        with app_module.app.app_context():
+            user = models.User.query.one()
+            user.is_active = False
+            app_module.db.session.commit()
+        assert client.get("/api/news/saved", headers=_bearer(tokens["access_token"])).status_code == 401
+
+
+def test_change_password_revokes_sessions_and_returns_new_tokens(make_app, monkeypatch):
+    app_module, models = _setup_app(make_app, monkeypatch)
+    principals = importlib.import_module("services.principals")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(principals, "get_redis_client", lambda: fake_redis)
+
+    with app_module.app.test_client() as client:
+        current = _login(client)
+        other = _login(client)
+        response = client.post(
+            "/api/auth/change-password",
+            json={"current_password": "password123", "new_password": "newpassword456"},
+            headers=_bearer(current["access_token"]),
+        )
+        assert response.status_code == 200
+        fresh = response.get_json()
+
+        for stale in (current, other):
+            assert client.post("/api/auth/refresh", json={"refresh_token": stale["refresh_token"]}).status_code == 401
+            assert client.get("/api/news/saved", headers=_bearer(stale["access_token"])).status_code == 401
+        assert client.get("/api/news/saved", headers=_bearer(fresh["access_token"])).status_code == 200
+        assert client.get("/api/news/saved", headers=_bearer(fresh["token"])).status_code == 200
+        assert client.post("/api/auth/refresh", json={"refresh_token": fresh["refresh_token"]}).status_code == 200
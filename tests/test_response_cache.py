@@ -0,0 +1,117 @@
+import importlib
+
+import jwt
+
+
+class FakeRedis:
+    def __init__(self):
+        self.storage = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.storage:
+            return False
+        self.storage[key] = value
+        return True
+
+    def get(self, key):
+        return self.storage.get(key)
+
+    def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+    def delete(self, key):
+        self.storage.pop(key, None)
+
+
+def _seed(app_module, models):
+    db = app_module.db
+    user = models.User(email="cache@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.add(models.Article(
+        title="Cached story",
+        source_url="https://example.com/cached",
+        source_domain="example.com",
+        ai_summary="summary",
+        category="Tech",
+        cluster_id=7,
+    ))
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app_module.app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_feed_and_story_responses_are_cached_per_generation(make_app, monkeypatch):
+    app_module, headers = make_app(_seed)
+    response_cache = importlib.import_module("services.response_cache")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: fake_redis)
+
+    news = importlib.import_module("routes.news")
+    calls = {"feed": 0, "story": 0}
+    real_feed_page, real_story_body = news._story_feed_page, news._story_body
+
+    def counting_feed_page(*args):
+        calls["feed"] += 1
+        return real_feed_page(*args)
+
+    def counting_story_body(*args):
+        calls["story"] += 1
+        return real_story_body(*args)
+
+    monkeypatch.setattr(news, "_story_feed_page", counting_feed_page)
+    monkeypatch.setattr(news, "_story_body", counting_story_body)
+
+    with app_module.app.test_client() as client:
+        first = client.get("/api/news/feed?category=Tech&limit=5", headers=headers)
+        # Same filters in a different order hit the same entry.
+        second = client.get("/api/news/feed?limit=5&category=Tech", headers=headers)
+        assert first.get_json() == second.get_json()
+        assert first.get_json()["stories"][0]["cluster_id"] == 7
+        assert calls["feed"] == 1
+
+        client.get("/api/news/feed?category=Sports&limit=5", headers=headers)
+        assert calls["feed"] == 2
+
+        assert client.get("/api/news/story/7", headers=headers).status_code == 200
+        assert client.get("/api/news/story/7", headers=headers).status_code == 200
+        assert calls["story"] == 1
+        assert client.get("/api/news/story/999", headers=headers).status_code == 404
+        assert client.get("/api/news/story/999", headers=headers).status_code == 404
+        assert calls["story"] == 3
+
+        response_cache.bump_generation()
+        client.get("/api/news/feed?category=Tech&limit=5", headers=headers)
+        client.get("/api/news/story/7", headers=headers)
+        assert calls == {"feed": 3, "story": 4}
+
+        assert client.get("/api/news/feed?cursor=bogus", headers=headers).status_code == 400
+        assert not [key for key in fake_redis.storage if key.endswith(":lock")]
+
+
+def test_concurrent_miss_waits_for_regeneration_then_falls_back(monkeypatch):
+    response_cache = importlib.import_module("services.response_cache")
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: fake_redis)
+    monkeypatch.setattr(response_cache, "REGENERATE_WAIT_SECONDS", 0.2)
+
+    key = response_cache.cache_key("feed", {"limit": 5}, response_cache.current_generation())
+    fake_redis.set(f"{key}:lock", "someone-else")
+    assert response_cache.get_or_compute("feed", {"limit": 5}, lambda: "fresh") == "fresh"
+    # The waiting request must not overwrite the entry the lock holder is building.
+    assert fake_redis.get(key) is None
+
+    fake_redis.set(key, "cached")
+    assert response_cache.get_or_compute("feed", {"limit": 5}, lambda: "fresh") == "cached"
+
+
+def test_cache_disabled_without_redis(monkeypatch):
+    response_cache = importlib.import_module("services.response_cache")
+    monkeypatch.setattr(response_cache, "get_redis_client", lambda: None)
+
+    calls = []
+    for _ in range(2):
+        response_cache.get_or_compute("feed", {}, lambda: calls.append(1) or "body")
+    assert len(calls) == 2
+    response_cache.bump_generation()
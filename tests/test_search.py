@@ -0,0 +1,83 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    rows = [
+        ("Solar power record", "Grids adapt.", "Science"),
+        ("Markets rally", "Solar stocks lead the gains.", "Business"),
+        ("Solar eclipse tonight", "Where to watch the solar eclipse.", "Science"),
+        ("Football final", "A late winner.", "Sports"),
+    ]
+    user = models.User(email="search@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    ids = {}
+    for index, (title, summary, category) in enumerate(rows):
+        article = models.Article(
+            title=title,
+            source_url=f"https://example.com/{index}",
+            source_domain="example.com",
+            ai_summary=summary,
+            category=category,
+            cluster_id=index + 1,
+            created_at=base - timedelta(hours=index),
+        )
+        db.session.add(article)
+        db.session.flush()
+        ids[title] = article.id
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return models, {"Authorization": f"Bearer {token}"}, ids
+
+
+def _titles(response):
+    return [article["title"] for article in response.get_json()["articles"]]
+
+
+def test_search_ranks_filters_and_pages(make_app):
+    app_module, (models, headers, ids) = make_app(_seed)
+
+    with app_module.app.test_client() as client:
+        ranked = client.get("/api/news/search?q=solar", headers=headers)
+        assert ranked.status_code == 200
+        # Title matches outrank summary-only matches.
+        assert sorted(_titles(ranked)[:2]) == ["Solar eclipse tonight", "Solar power record"]
+        assert _titles(ranked)[2] == "Markets rally"
+        assert _titles(client.get("/api/news/search?q=solar&sort=recent", headers=headers)) == [
+            "Solar power record", "Markets rally", "Solar eclipse tonight",
+        ]
+        assert _titles(client.get("/api/news/search?q=solar&category=Business", headers=headers)) == [
+            "Markets rally",
+        ]
+        assert _titles(client.get("/api/news/search?q=solar eclipse", headers=headers)) == [
+            "Solar eclipse tonight",
+        ]
+
+        paged, cursor = [], None
+        while True:
+            url = "/api/news/search?q=solar&limit=1" + (f"&cursor={cursor}" if cursor else "")
+            page = client.get(url, headers=headers).get_json()
+            paged += [article["title"] for article in page["articles"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert paged == _titles(ranked)
+
+        assert client.get('/api/news/search?q="AND(solar*', headers=headers).status_code == 200
+        assert client.get("/api/news/search?q=%20!!", headers=headers).status_code == 400
+        assert client.get("/api/news/search?q=solar&sort=best", headers=headers).status_code == 400
+
+    with app_module.app.app_context():
+        article = app_module.db.session.get(models.Article, ids["Football final"])
+        article.ai_summary = "Played under solar panels."
+        app_module.db.session.commit()
+
+    with app_module.app.test_client() as client:
+        assert "Football final" in _titles(client.get("/api/news/search?q=panels", headers=headers))
+        assert _titles(client.get("/api/news/search?q=winner", headers=headers)) == []
@@ -0,0 +1,130 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+import numpy as np
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    base = datetime.utcnow()
+    user = models.User(email="semantic@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    articles = []
+    for index, cluster_id in enumerate((1, 1, 2, 3)):
+        article = models.Article(
+            title=f"Article {index}",
+            source_url=f"https://example.com/{index}",
+            source_domain="example.com",
+            ai_summary="summary",
+            category="Tech",
+            cluster_id=cluster_id,
+            created_at=base - timedelta(minutes=index),
+        )
+        db.session.add(article)
+        articles.append(article)
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    ids = [a.id for a in articles]
+    return {"Authorization": f"Bearer {token}"}, ids
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_embeddings_are_reused_for_related_stories_and_semantic_search(make_app, monkeypatch):
+    app_module, (headers, ids) = make_app(_seed)
+    embeddings = importlib.import_module("services.embeddings")
+    semantic = importlib.import_module("services.semantic")
+    vector_index = importlib.import_module("services.vector_index")
+    models = importlib.import_module("models.models")
+    vectors = {
+        ids[0]: _unit(1, 0, 0),
+        ids[1]: _unit(1, 0.1, 0),
+        ids[2]: _unit(0.9, 0.2, 0),
+        ids[3]: _unit(0, 0, 1),
+    }
+    encoded = []
+
+    def fake_embed(texts):
+        encoded.extend(texts)
+        return np.vstack([vectors[int(text.split()[1].rstrip(".")) + ids[0]] for text in texts])
+
+    monkeypatch.setattr(embeddings, "embed_texts", fake_embed)
+    vector_index.reset_index()
+
+    with app_module.app.app_context():
+        articles = models.Article.query.order_by(models.Article.id).all()
+        embeddings.embeddings_for(articles[:2])
+        app_module.db.session.commit()
+        result = embeddings.embeddings_for(articles)
+        app_module.db.session.commit()
+        assert np.allclose(result[3], vectors[ids[3]])
+    assert encoded == ["Article 0. summary", "Article 1. summary", "Article 2. summary", "Article 3. summary"]
+
+    monkeypatch.setattr(semantic, "embed_texts", lambda texts: np.vstack([_unit(0, 0.1, 1)]))
+    with app_module.app.test_client() as client:
+        related = client.get("/api/news/story/1/related?limit=5", headers=headers)
+        assert related.status_code == 200
+        assert [story["cluster_id"] for story in related.get_json()["stories"]] == [2, 3]
+        assert client.get("/api/news/story/99/related", headers=headers).status_code == 404
+
+        found = client.get("/api/news/search/semantic?q=space&limit=2", headers=headers).get_json()
+        assert [article["article_id"] for article in found["articles"]] == [ids[3], ids[2]]
+
+
+def test_vector_index_top_k_excludes_and_replaces():
+    vector_index = importlib.import_module("services.vector_index")
+
+    index = vector_index.VectorIndex().extended([1, 2, 3], np.vstack([_unit(1, 0), _unit(0, 1), _unit(1, 1)]))
+    assert [aid for aid, _ in index.search(_unit(1, 0), 2)] == [1, 3]
+    assert [aid for aid, _ in index.search(_unit(1, 0), 5, exclude=[1])] == [3, 2]
+
+    index = index.extended([1], np.vstack([_unit(0, 1)]))
+    assert len(index) == 3
+    assert [aid for aid, _ in index.search(_unit(1, 0), 1)] == [3]
+
+
+def test_semantic_search_warms_up_in_the_background_and_answers_503_on_failure(make_app, monkeypatch):
+    import threading
+
+    app_module, (headers, ids) = make_app(_seed)
+    semantic = importlib.import_module("services.semantic")
+    release = threading.Event()
+    loaded = []
+
+    def slow_model():
+        release.wait(5)
+        loaded.append("model")
+
+    def broken_embed(texts):
+        raise OSError("model download failed")
+
+    monkeypatch.setattr(semantic, "get_model", slow_model)
+    monkeypatch.setattr(semantic, "get_index", lambda: loaded.append("index"))
+    monkeypatch.setattr(semantic, "embed_texts", broken_embed)
+
+    warm_up = semantic.start_warm_up(app_module.app)
+    with app_module.app.test_client() as client:
+        warming = client.get("/api/news/search/semantic?q=space", headers=headers)
+        assert warming.status_code == 503
+        assert warming.headers["Retry-After"] == "30"
+        assert client.get("/api/news/story/1/related", headers=headers).status_code == 503
+
+        release.set()
+        warm_up.join(5)
+        assert loaded == ["model", "index"]
+        assert not semantic.warming_up()
+
+        failed = client.get("/api/news/search/semantic?q=space", headers=headers)
+        assert failed.status_code == 503
+        assert failed.get_json() == {"message": "Semantic search is not available."}
+
+        monkeypatch.setattr(semantic, "load_embeddings", broken_embed)
+        related = client.get("/api/news/story/1/related", headers=headers)
+        assert related.status_code == 503
+        assert related.get_json() == {"message": "Semantic search is not available."}
@@ -0,0 +1,131 @@
+import importlib
+from datetime import datetime, timedelta
+
+
+def test_summary_batch_prefers_fresh_big_stories_and_backs_off_failures(make_app):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    Article = importlib.import_module("models.models").Article
+    summary_queue = importlib.import_module("services.summary_queue")
+
+    now = datetime(2024, 5, 1, 12, 0, 0)
+
+    def article(slug, title, hours_old, domain="example.com", **kwargs):
+        return Article(
+            title=title,
+            source_url=f"https://{domain}/{slug}",
+            source_domain=domain,
+            raw_content="content",
+            category="World",
+            created_at=now - timedelta(hours=hours_old),
+            **kwargs,
+        )
+
+    with app.app_context():
+        db.session.add_all([
+            article("stale", "Local bakery wins regional award", hours_old=48),
+            article("single", "Minor road closure announced downtown", hours_old=1),
+            article("big-1", "Earthquake strikes coastal region overnight", hours_old=2, domain="a.example"),
+            article("big-2", "Powerful earthquake strikes coastal region", hours_old=2, domain="b.example"),
+            article("big-3", "Earthquake strikes coastal region, officials say", hours_old=3, domain="c.example"),
+            article(
+                "failed",
+                "Parliament debates budget proposal",
+                hours_old=0,
+                summary_attempts=1,
+                next_summary_attempt_at=now + timedelta(minutes=30),
+            ),
+            article("exhausted", "Storm warning issued", hours_old=0, summary_attempts=5),
+        ])
+        db.session.commit()
+
+        batch = summary_queue.fetch_summary_batch(limit=4, now=now)
+        slugs = [a.source_url.rsplit("/", 1)[1] for a in batch]
+
+        assert slugs[:3] == ["big-1", "big-2", "big-3"]
+        assert slugs[3] == "single"
+        assert "failed" not in slugs and "exhausted" not in slugs
+
+        later = summary_queue.fetch_summary_batch(limit=10, now=now + timedelta(hours=1))
+        assert "failed" in [a.source_url.rsplit("/", 1)[1] for a in later]
+
+        lead = batch[0]
+        summary_queue.record_summary_failure(lead, "boom", now=now)
+        db.session.commit()
+        assert lead.summary_attempts == 1
+        assert lead.next_summary_attempt_at > now
+        assert lead not in summary_queue.fetch_summary_batch(limit=10, now=now)
+
+
+def test_add_missing_columns_upgrades_existing_article_table(make_app):
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    models = importlib.import_module("models.models")
+    sqlalchemy = importlib.import_module("sqlalchemy")
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(sqlalchemy.text("DROP INDEX IF EXISTS ix_article_pending_summary"))
+            for column in ("summary_attempts", "next_summary_attempt_at"):
+                connection.execute(sqlalchemy.text(f"ALTER TABLE article DROP COLUMN {column}"))
+
+        with db.engine.begin() as connection:
+            added = models.add_missing_columns(connection)
+        assert sorted(added) == ["article.next_summary_attempt_at", "article.summary_attempts"]
+        with db.engine.begin() as connection:
+            assert models.add_missing_columns(connection) == []
+
+        db.session.add(models.Article(title="Upgraded", source_url="https://example.com/upgraded"))
+        db.session.commit()
+        assert models.Article.query.one().summary_attempts == 0
+
+
+def test_summary_batch_commits_do_not_reload_each_article(make_app, monkeypatch):
+    from sqlalchemy import event
+
+    app_module, _ = make_app()
+    app = app_module.app
+    db = app_module.db
+    Article = importlib.import_module("models.models").Article
+    ai_engine = importlib.import_module("services.ai_engine")
+
+    calls = []
+
+    def fake_chat_completion(messages, **kwargs):
+        calls.append(messages)
+        if len(calls) == 2:
+            raise RuntimeError("bad response")
+        return "summary"
+
+    monkeypatch.setattr(ai_engine, "chat_completion", fake_chat_completion)
+    monkeypatch.setattr(ai_engine, "bump_generation", lambda: None)
+
+    with app.app_context():
+        db.session.add_all([
+            Article(title=f"Story {index}", source_url=f"https://example.com/{index}", raw_content=f"text {index}")
+            for index in range(5)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+    with app.app_context():
+        selects = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            ai_engine.process_unsummarized_news()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
+
+        # The candidate query and the batch's text load; no per-article reloads after commits.
+        assert len(selects) == 2
+        assert all(messages[1]["content"].startswith("text ") for messages in calls)
+        assert Article.query.filter(Article.ai_summary == "summary").count() == 4
+        failed = Article.query.filter(Article.ai_summary.is_(None)).one()
+        assert (failed.summary_attempts, failed.summary_error) == (1, "bad response")
@@ -0,0 +1,76 @@
+import importlib
+import sys
+from pathlib import Path
+
+
+def _load_token_budget():
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    return importlib.import_module("services.token_budget")
+
+
+def test_trim_to_budget_cuts_at_sentence_boundaries():
+    token_budget = _load_token_budget()
+    text = " ".join(f"Sentence number {i} reports a new development in the story." for i in range(50))
+
+    trimmed = token_budget.trim_to_budget(text, budget=60)
+
+    assert token_budget.count_tokens(trimmed) <= 60
+    assert trimmed.endswith(".")
+    assert trimmed.startswith("Sentence number 0")
+    assert text.startswith(trimmed)
+
+
+def test_trim_to_budget_drops_boilerplate_paragraphs_first():
+    token_budget = _load_token_budget()
+    article = "\n\n".join([
+        "Subscribe to our newsletter for the latest updates delivered daily to your inbox.",
+        "The central bank raised interest rates by a quarter point on Tuesday, citing inflation.",
+        "Share this",
+        "Analysts expect further increases later this year as wage growth remains strong.",
+        "All rights reserved. Copyright © 2024 Example News Corporation and its affiliates.",
+    ])
+
+    trimmed = token_budget.trim_to_budget(article, budget=50)
+
+    assert "newsletter" not in trimmed
+    assert "All rights reserved" not in trimmed
+    assert "central bank" in trimmed
+    assert "Analysts expect" in trimmed
+
+
+def test_text_within_budget_is_unchanged():
+    token_budget = _load_token_budget()
+    text = "Short article.\n\nSubscribe now."
+
+    assert token_budget.trim_to_budget(text, budget=500) == text
+
+
+def test_long_paragraphs_mentioning_boilerplate_words_are_kept():
+    token_budget = _load_token_budget()
+    subscribers = (
+        "The publisher said its newsletter subscribers grew by a third this year, driven by readers "
+        "who wanted a daily digest of local politics, school board meetings and transit news."
+    )
+    article = "\n\n".join([
+        subscribers,
+        "Sign up for our newsletter.",
+        "Unsubscribed readers cited cost as the main reason, according to a readership survey.",
+        " ".join(f"Sentence number {i} reports a new development in the story." for i in range(20)),
+    ])
+
+    paragraphs = token_budget.drop_low_information(token_budget.split_paragraphs(article))
+
+    assert subscribers in paragraphs
+    assert "Sign up for our newsletter." not in paragraphs
+    # "Unsubscribed" only contains a boilerplate word.
+    assert any(p.startswith("Unsubscribed readers") for p in paragraphs)
+
+
+def test_summary_budget_env_overrides_model_budgets(monkeypatch):
+    token_budget = _load_token_budget()
+
+    assert token_budget.input_budget("gpt-4o-mini") == token_budget.MODEL_INPUT_BUDGETS["gpt-4o-mini"]
+    monkeypatch.setattr(token_budget, "SUMMARY_INPUT_TOKEN_BUDGET", 700)
+    assert token_budget.input_budget("gpt-4o-mini") == 700
+    assert token_budget.input_budget("unknown-model") == 700
@@ -0,0 +1,79 @@
+import importlib
+from datetime import datetime, timedelta
+
+import jwt
+
+
+def _seed(app_module, models):
+    app = app_module.app
+    db = app_module.db
+    now = datetime.utcnow()
+    user = models.User(email="trending@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    # Story 1: one source, a minute old. Story 2: four sources, a few hours old.
+    # Story 3: outside the trending window.
+    specs = [(1, "solo.com", 1, "World")]
+    specs += [(2, f"outlet{i}.com", 180 + i, "World") for i in range(4)]
+    specs += [(3, "old.com", 72 * 60, "Tech")]
+    article_ids = {}
+    for index, (cluster_id, domain, minutes_old, category) in enumerate(specs):
+        article = models.Article(
+            title=f"Article {index}",
+            source_url=f"https://{domain}/{index}",
+            source_domain=domain,
+            ai_summary="summary",
+            category=category,
+            cluster_id=cluster_id,
+            created_at=now - timedelta(minutes=minutes_old),
+        )
+        db.session.add(article)
+        db.session.flush()
+        article_ids.setdefault(cluster_id, article.id)
+    db.session.commit()
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return models, {"Authorization": f"Bearer {token}"}, article_ids
+
+
+def test_trending_ranks_coverage_over_recency_and_counts_engagement(make_app, monkeypatch):
+    app_module, (models, headers, article_ids) = make_app(_seed)
+    trending = importlib.import_module("services.trending")
+    change_log = importlib.import_module("services.change_log")
+
+    with app_module.app.test_client() as client:
+        assert client.get("/api/news/trending", headers=headers).get_json()["stories"] == []
+        client.post("/api/news/save", json={"article_id": article_ids[2]}, headers=headers)
+        client.post("/api/news/read", json={"article_id": article_ids[1]}, headers=headers)
+        client.delete(f"/api/news/read/{article_ids[1]}", headers=headers)
+
+    with app_module.app.app_context():
+        # Entries still inside the settle window wait for a later run.
+        assert trending.apply_engagement_changes() == 0
+        app_module.db.session.commit()
+        monkeypatch.setattr(change_log, "CHANGE_LOG_SETTLE_SECONDS", 0)
+        trending.compute_trending_scores()
+        engagement = {
+            row.article_id: (row.read_count, row.save_count)
+            for row in models.ArticleEngagement.query.all()
+        }
+        assert engagement == {article_ids[1]: (0, 0), article_ids[2]: (0, 1)}
+        # A second run only reads change-log entries written since the first.
+        assert trending.apply_engagement_changes() == 0
+
+    with app_module.app.test_client() as client:
+        feed = client.get("/api/news/trending", headers=headers).get_json()
+        assert [story["cluster_id"] for story in feed["stories"]] == [2, 1]
+        assert feed["stories"][0]["source_count"] == 4
+        assert feed["stories"][0]["trending_score"] > feed["stories"][1]["trending_score"]
+
+        first = client.get("/api/news/trending?limit=1", headers=headers).get_json()
+        second = client.get(f"/api/news/trending?limit=1&cursor={first['next_cursor']}", headers=headers)
+        assert [story["cluster_id"] for story in second.get_json()["stories"]] == [1]
+        assert client.get("/api/news/trending?category=Tech", headers=headers).get_json()["stories"] == []
+
+
+def test_trending_score_decays_with_age():
+    trending = importlib.import_module("services.trending")
+
+    assert trending.trending_score(3, 0, 10, 1, age_hours=1) > trending.trending_score(3, 0, 10, 1, age_hours=12)
+    assert trending.trending_score(3, 2, 0, 0, age_hours=1) > trending.trending_score(3, 0, 0, 0, age_hours=1)
@@ -0,0 +1,64 @@
+"""Negotiated gzip/brotli compression of API responses."""
+
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only when brotli is missing
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/csv"}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = _choose_encoding()
+    if not encoding:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    # Each encoding is a different representation, so it needs its own strong
+    # ETag; utils.http_cache strips the suffix when matching If-None-Match.
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
+
+
+def init_compression(app) -> None:
+    app.after_request(compress_response)
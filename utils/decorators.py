@@ -1,7 +1,7 @@
 import jwt
 from functools import wraps
 from flask import request, jsonify, current_app, g
-from models.models import User, db
+from services.tokens import principal_from_claims
 
 def token_required(f):
     @wraps(f)
@@ -12,7 +12,8 @@ def token_required(f):
         try:
             # Remove "Bearer " prefix if present
             data = jwt.decode(token.replace("Bearer ", ""), current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            user = db.session.get(User, data.get("user_id"))
+            # A Principal (id, email, role, is_active), not a User row.
+            user = principal_from_claims(data)
             if not user or not user.is_active:
                 return jsonify({'message': 'User is inactive or missing'}), 401
             g.current_user = user
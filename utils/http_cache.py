@@ -0,0 +1,43 @@
+import hashlib
+from typing import Optional
+
+from flask import current_app, request
+
+# Compressing proxies (and our own compression) may append the encoding to a
+# strong ETag, e.g. "abc-gzip"; clients echo that back in If-None-Match.
+_ENCODING_SUFFIXES = ("-gzip", "-br", "-deflate", ";gzip", ";br", ";deflate")
+
+
+def make_etag(*parts) -> str:
+    payload = "|".join(str(part) for part in parts)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _strip_etag(value: str) -> str:
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    for suffix in _ENCODING_SUFFIXES:
+        if value.endswith(suffix):
+            return value[: -len(suffix)]
+    return value
+
+
+def etag_matches(etag: Optional[str]) -> bool:
+    """Return True when the request's If-None-Match names ``etag``."""
+    header = request.headers.get("If-None-Match")
+    if not etag or not header:
+        return False
+    candidates = [_strip_etag(value) for value in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def with_validators(response, etag: str, cache_control: str):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control: str):
+    return with_validators(current_app.response_class(status=304), etag, cache_control)
@@ -0,0 +1,61 @@
+"""Flask JSON provider backed by orjson, with datetimes serialized as ISO-8601.
+
+Route payloads can carry ``datetime`` values directly instead of calling
+``isoformat()`` per row. Without orjson the stdlib encoder is used and produces
+the same output.
+"""
+
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is missing
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    # Key order is insertion order; sorting every payload costs more than it is worth.
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = _orjson_option(kwargs)
+        if option is None:
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def _orjson_option(kwargs):
+    """Map ``dumps`` keyword arguments onto orjson options, or None if orjson can't honour them.
+
+    ``response()`` (and so ``jsonify``) always passes either compact ``separators``
+    or ``indent=2``; both have an orjson equivalent.
+    """
+    if orjson is None:
+        return None
+    kwargs = dict(kwargs)
+    indent = kwargs.pop("indent", None)
+    separators = kwargs.pop("separators", None)
+    if kwargs:
+        return None
+    option = orjson.OPT_NON_STR_KEYS
+    if indent is not None:
+        if indent != 2 or separators is not None:
+            return None
+        return option | orjson.OPT_INDENT_2
+    if separators not in (None, (",", ":")):
+        return None
+    return option
@@ -0,0 +1,88 @@
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Optional, Tuple, Union
+
+from sqlalchemy import tuple_
+
+# Rows are keyed by (created_at, id), or by (score, id) for ranked results.
+Position = Tuple[Union[datetime, float], int]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(kind: str, position: Position) -> str:
+    key, item_id = position
+    encoded_key = {"t": key.isoformat()} if isinstance(key, datetime) else {"s": float(key)}
+    payload = json.dumps({"k": kind, **encoded_key, "i": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], kind: str, scored: bool = False) -> Optional[Position]:
+    """Decode a cursor of ``kind``, keyed by a score if ``scored``, else by a datetime."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["k"] != kind:
+            raise InvalidCursor("Cursor does not belong to this endpoint.")
+        if scored:
+            key = float(payload["s"])
+            if not math.isfinite(key):
+                raise InvalidCursor("Invalid cursor.")
+        else:
+            key = datetime.fromisoformat(payload["t"])
+        return key, int(payload["i"])
+    except InvalidCursor:
+        raise
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+
+
+def parse_direction(value: Optional[str]) -> str:
+    direction = (value or "next").lower()
+    if direction not in ("next", "prev"):
+        raise InvalidCursor("direction must be 'next' or 'prev'.")
+    return direction
+
+
+def keyset_page(query, created_col, id_col, limit: int, position: Optional[Position], direction: str):
+    """Fetch one page ordered newest first on (created_col, id_col).
+
+    ``created_col`` may also be a score expression, for pages ordered best first.
+
+    ``position`` is the (created_at, id) of the row the cursor points at; "next"
+    returns older rows after it and "prev" returns newer rows before it (still
+    in newest-first order). Returns ``(rows, has_more)`` where ``has_more``
+    refers to the direction of travel.
+    """
+    key = tuple_(created_col, id_col)
+    if direction == "prev":
+        if position is not None:
+            query = query.filter(key > tuple_(*position))
+        rows = query.order_by(created_col.asc(), id_col.asc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        return list(reversed(rows[:limit])), has_more
+
+    if position is not None:
+        query = query.filter(key < tuple_(*position))
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    return rows[:limit], has_more
+
+
+def page_cursors(kind: str, first: Optional[Position], last: Optional[Position], has_more: bool,
+                 direction: str, had_cursor: bool):
+    """Return (next_cursor, prev_cursor) for a page whose edge rows are ``first``/``last``."""
+    if first is None or last is None:
+        return None, None
+    if direction == "prev":
+        return encode_cursor(kind, last), encode_cursor(kind, first) if has_more else None
+    return (
+        encode_cursor(kind, last) if has_more else None,
+        encode_cursor(kind, first) if had_cursor else None,
+    )
@@ -0,0 +1,68 @@
+"""bcrypt hashing off the request thread, with bounded concurrency.
+
+Hashes run on a small pool of OS threads (eventlet's tpool under the eventlet
+worker, where a blocking hash would otherwise stall every green thread). At
+most ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE`` hashes are in flight per
+process; beyond that ``PasswordHashingBusy`` is raised so callers answer 503
+instead of queueing without bound. ``BCRYPT_ROUNDS`` sets the cost for new
+hashes; hashes made with another cost report ``needs_rehash``.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+class PasswordHashingBusy(RuntimeError):
+    pass
+
+
+@lru_cache
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+
+def _eventlet_tpool():
+    try:
+        from eventlet import patcher, tpool
+    except ImportError:
+        return None
+    return tpool if patcher.is_monkey_patched("thread") else None
+
+
+def _run(func, *args):
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Too many password operations in progress.")
+    try:
+        tpool = _eventlet_tpool()
+        if tpool is not None:
+            return tpool.execute(func, *args)
+        return _executor().submit(func, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return _run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return _run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    # bcrypt hashes look like "$2b$<cost>$<salt+hash>".
+    try:
+        return int(password_hash.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
@@ -0,0 +1,68 @@
+"""Sliding-window rate limiting (Redis sorted sets, in-process fallback).
+
+Every attempt is recorded with its timestamp, including rejected ones, so a
+client that keeps flooding stays limited until it slows down. Only the newest
+``limit + 1`` attempts are kept, which is all the window check needs.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+import redis
+from flask import current_app
+
+from utils.redis_client import get_redis_client
+
+LOGGER = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY = "ratelimit:{scope}:{subject}"
+LOCAL_MAX_KEYS = 50_000
+
+_local_lock = threading.Lock()
+
+
+def _hit_redis(redis_client, key: str, limit: int, window_seconds: int, now: float) -> Optional[int]:
+    pipe = redis_client.pipeline()
+    pipe.zremrangebyscore(key, 0, now - window_seconds)
+    pipe.zadd(key, {f"{now}:{uuid.uuid4().hex[:8]}": now})
+    pipe.zremrangebyrank(key, 0, -(limit + 2))
+    pipe.zcard(key)
+    pipe.zrange(key, 0, 0, withscores=True)
+    pipe.expire(key, window_seconds)
+    _, _, _, count, oldest, _ = pipe.execute()
+    if count <= limit:
+        return None
+    return max(1, int(oldest[0][1] + window_seconds - now) + 1) if oldest else window_seconds
+
+
+def _hit_local(key: str, limit: int, window_seconds: int, now: float) -> Optional[int]:
+    with _local_lock:
+        # Kept per app, like the other in-process fallbacks.
+        windows = current_app.extensions.setdefault("rate_limit_windows", {})
+        if len(windows) > LOCAL_MAX_KEYS:
+            for stale in [k for k, v in windows.items() if not v or v[-1] <= now - window_seconds]:
+                del windows[stale]
+        attempts = windows.setdefault(key, deque(maxlen=limit + 1))
+        while attempts and attempts[0] <= now - window_seconds:
+            attempts.popleft()
+        attempts.append(now)
+        if len(attempts) <= limit:
+            return None
+        return max(1, int(attempts[0] + window_seconds - now) + 1)
+
+
+def hit(scope: str, subject: str, limit: int, window_seconds: int) -> Optional[int]:
+    """Record an attempt; return seconds to wait if ``limit`` per window is exceeded, else None."""
+    key = RATE_LIMIT_KEY.format(scope=scope, subject=subject)
+    now = time.time()
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            return _hit_redis(redis_client, key, limit, window_seconds, now)
+        except redis.RedisError:
+            LOGGER.warning("Rate limiter unavailable; limiting per process.", exc_info=True)
+    return _hit_local(key, limit, window_seconds, now)
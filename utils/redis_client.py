@@ -1,4 +1,5 @@
 import os
+import time
 from functools import lru_cache
 
 import redis
@@ -10,3 +11,13 @@ def get_redis_client():
     if not redis_url:
         return None
     return redis.Redis.from_url(redis_url, decode_responses=True)
+
+
+def read_counter(redis_client, key: str) -> int:
+    value = redis_client.get(key)
+    if value is None:
+        # Seed missing counters from the clock so a flushed Redis never hands
+        # out a version that was already used.
+        redis_client.set(key, str(int(time.time() * 1000)), nx=True)
+        value = redis_client.get(key)
+    return int(value)